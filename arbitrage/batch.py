@@ -0,0 +1,193 @@
+import numpy as np
+
+from path.store import PathStore
+from utils._types import Pools
+
+
+def screen_paths(pools: Pools, paths: list[tuple[str, ...]]) -> list[tuple[str, ...]]:
+    """Screen ``paths`` for the whole batch at once in `float64` and keep only
+    paths that can be profitable. Survivors still have to be confirmed
+    with exact math.
+
+    Args:
+        pools (Pools): Pools.
+        paths (list[tuple[str, ...]]): Paths.
+
+    Returns:
+        list[tuple[str, ...]]: Potentially profitable paths.
+    """
+    if not paths:
+        return paths
+
+    reserves, fees, pool_idxs, is_0_ins, lengths = gather(pools, paths)
+    keep = screen(reserves, fees, pool_idxs, is_0_ins, lengths)
+
+    return [path for path, to_keep in zip(paths, keep.tolist()) if to_keep]
+
+
+def screen_path_ids(
+    pools: Pools, path_store: PathStore, path_ids: np.ndarray
+) -> np.ndarray:
+    """Screen ``path_ids`` with precompiled path descriptors. Reserves are
+    looked up once per pool instead of once per hop.
+
+    Args:
+        pools (Pools): Pools.
+        path_store (PathStore): Paths.
+        path_ids (np.ndarray): Path ids.
+
+    Returns:
+        np.ndarray: Potentially profitable path ids.
+    """
+    if not len(path_ids):
+        return path_ids
+
+    hop_pools = path_store.hop_pools[path_ids]
+
+    # reindexing used pools
+    pool_ids, pool_idxs = np.unique(hop_pools, return_inverse=True)
+    pool_idxs = pool_idxs.reshape(hop_pools.shape)
+
+    reserves = np.zeros((len(pool_ids), 2), dtype=np.float64)
+    fees = np.zeros(len(pool_ids), dtype=np.float64)
+
+    for i, pool_id in enumerate(pool_ids.tolist()):
+        if pool_id < 0:
+            continue
+
+        pool = pools[path_store.pools[pool_id]]
+        reserve0, reserve1 = [reserve for reserve, _ in zip(pool.values(), range(2))]
+        reserves[i] = float(reserve0), float(reserve1)
+        fees[i] = float(pool["fee_numerator"])
+
+    keep = screen(
+        reserves,
+        fees,
+        pool_idxs,
+        path_store.hop_is_0_ins[path_ids].astype(np.intp),
+        path_store.lengths[path_ids].astype(np.intp) * 2 + 1,
+    )
+
+    return path_ids[keep]
+
+
+def screen(
+    reserves: np.ndarray,
+    fees: np.ndarray,
+    pool_idxs: np.ndarray,
+    is_0_ins: np.ndarray,
+    lengths: np.ndarray,
+) -> np.ndarray:
+    """Get mask of paths that can be profitable.
+
+    Args:
+        reserves (np.ndarray): Reserves (`pools x 2`).
+        fees (np.ndarray): Fee numerators (`pools`).
+        pool_idxs (np.ndarray): Pool indexes (`paths x hops`).
+        is_0_ins (np.ndarray): Is token0 in flags (`paths x hops`).
+        lengths (np.ndarray): Path lengths (`paths`).
+
+    Returns:
+        np.ndarray: Mask of potentially profitable paths.
+    """
+    keep = np.zeros(len(lengths), dtype=np.bool_)
+
+    # paths with same length are calculated together
+    for length in np.unique(lengths):
+        group = np.flatnonzero(lengths == length)
+        idxs = pool_idxs[group, : length // 2]
+        dirs = is_0_ins[group, : length // 2]
+
+        reserves_in = reserves[idxs, 1 - dirs]
+        reserves_out = reserves[idxs, dirs]
+        _, _, profits = estimate_profits(reserves_in, reserves_out, fees[idxs])
+
+        keep[group] = profits > 0
+
+    return keep
+
+
+def gather(
+    pools: Pools, paths: list[tuple[str, ...]]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Gather reserves and fee numerators of all pools in ``paths`` to arrays
+    indexed by pool index and index paths by pool index and direction.
+
+    Args:
+        pools (Pools): Pools.
+        paths (list[tuple[str, ...]]): Paths.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            Reserves (`pools x 2`), fee numerators (`pools`), pool indexes
+            (`paths x hops`), is token0 in flags (`paths x hops`) and
+            path lengths (`paths`).
+    """
+    pool_to_idx: dict[str, int] = {}  # type: ignore
+    reserves: list[tuple[float, float]] = []  # type: ignore
+    fees: list[float] = []  # type: ignore
+
+    max_hops = max(len(path) for path in paths) // 2
+    pool_idxs = np.zeros((len(paths), max_hops), dtype=np.intp)
+    is_0_ins = np.zeros((len(paths), max_hops), dtype=np.intp)
+    lengths = np.fromiter((len(path) for path in paths), np.intp, len(paths))
+
+    for i, path in enumerate(paths):
+        for hop, j in enumerate(range(1, len(path), 2)):
+            pool_address = path[j]
+            pool = pools[pool_address]
+            token0 = next(iter(pool))
+
+            try:
+                pool_idxs[i, hop] = pool_to_idx[pool_address]
+            except KeyError:
+                pool_idxs[i, hop] = pool_to_idx[pool_address] = len(reserves)
+                reserve0, reserve1 = [
+                    reserve for reserve, _ in zip(pool.values(), range(2))
+                ]
+                reserves.append((float(reserve0), float(reserve1)))
+                fees.append(float(pool["fee_numerator"]))
+
+            is_0_ins[i, hop] = path[j - 1] == token0
+
+    return (
+        np.array(reserves, dtype=np.float64),
+        np.array(fees, dtype=np.float64),
+        pool_idxs,
+        is_0_ins,
+        lengths,
+    )
+
+
+def estimate_profits(
+    reserves_in: np.ndarray, reserves_out: np.ndarray, fees: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Estimate virtual reserves, optimal amount in and bruto profit for paths
+    with same length.
+
+    Args:
+        reserves_in (np.ndarray): Reserves in (`paths x hops`).
+        reserves_out (np.ndarray): Reserves out (`paths x hops`).
+        fees (np.ndarray): Fee numerators (`paths x hops`).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Virtual reserves in, optimal
+            amounts in and bruto profits. Profit is `0` for nonprofitable paths.
+    """
+    # getting virtual reserves
+    virtual_in = reserves_in[:, 0]
+    virtual_out = reserves_out[:, 0]
+
+    for hop in range(1, reserves_in.shape[1]):
+        denominator = 1e4 * reserves_in[:, hop] + fees[:, hop] * virtual_out
+        virtual_in = 1e4 * virtual_in * reserves_in[:, hop] / denominator
+        virtual_out = fees[:, hop] * virtual_out * reserves_out[:, hop] / denominator
+
+    # maximum of `g * x * out / (in + g * x) - x`
+    g = fees[:, 0] / 1e4
+    sqrt_in, sqrt_out = np.sqrt(virtual_in), np.sqrt(g * virtual_out)
+
+    amounts_in = np.maximum(sqrt_in * (sqrt_out - sqrt_in) / g, 0.0)
+    profits = np.where(sqrt_out > sqrt_in, (sqrt_out - sqrt_in) ** 2 / g, 0.0)
+
+    return virtual_in, amounts_in, profits
@@ -0,0 +1,75 @@
+from decimal import Decimal
+from math import inf, log, sqrt
+
+from utils._types import EdgeWeights, Pools
+
+
+def update_edge_weights(edge_weights: EdgeWeights, pools: Pools) -> None:
+    """Update log edge weights for changed ``pools``.
+
+    Weight of pool direction is `log(reserve_out * fee / reserve_in)`.
+
+    Args:
+        edge_weights (EdgeWeights): Edge weights.
+        pools (Pools): Changed pools.
+    """
+    for pool_address, pool in pools.items():
+        (token0, reserve0), (token1, reserve1) = [
+            item for item, _ in zip(pool.items(), range(2))
+        ]
+
+        if reserve0 <= 0 or reserve1 <= 0:
+            edge_weights[pool_address] = {token0: -inf, token1: -inf}
+            continue
+
+        log_fee = log(float(pool["fee_numerator"]) / 10_000)
+        log_ratio = log(reserve1) - log(reserve0)
+
+        edge_weights[pool_address] = {
+            token0: log_fee + log_ratio,
+            token1: log_fee - log_ratio,
+        }
+
+
+def get_path_weight(edge_weights: EdgeWeights, path: tuple[str, ...]) -> float:
+    """Sum edge weights of ``path``. Path can be profitable only if
+    weight is positive.
+
+    Args:
+        edge_weights (EdgeWeights): Edge weights.
+        path (tuple[str, ...]): Path.
+
+    Returns:
+        float: Path weight.
+    """
+    weight = 0.0
+    for i in range(1, len(path), 2):
+        weight += edge_weights[path[i]][path[i - 1]]
+
+    return weight
+
+
+def max_bruto_profit(
+    reserve_in: int | Decimal, reserve_out: int | Decimal, fee_numerator: int | Decimal
+) -> float:
+    """Closed form maximum bruto profit for virtual reserves.
+
+    Example::
+        >>> max_bruto_profit(1_000, 1_100, 10_000)
+        2.3804761428476174
+
+    Args:
+        reserve_in (int | Decimal): Virtual reserve in.
+        reserve_out (int | Decimal): Virtual reserve out.
+        fee_numerator (int | Decimal): Fee numerator of first pool.
+
+    Returns:
+        float: Maximum bruto profit.
+    """
+    g = float(fee_numerator) / 10_000
+    sqrt_in, sqrt_out = sqrt(reserve_in), sqrt(g * float(reserve_out))
+
+    if sqrt_out <= sqrt_in:
+        return 0.0
+
+    return (sqrt_out - sqrt_in) ** 2 / g
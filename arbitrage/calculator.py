@@ -2,18 +2,28 @@ from datetime import timedelta
 from decimal import Decimal, InvalidOperation, getcontext
 from math import ceil
 from multiprocessing.pool import Pool as ProcessPool
-from time import perf_counter
+from time import perf_counter, time
+from typing import Callable, Iterator
+
+import numpy as np
 
 from utils import CONFIG, MIN_GAS_LIMITS, Logger
-from utils._types import GasParams, Pools
+from utils._types import EdgeWeights, GasParams, Pools
 from utils.datastructures import Arbitrage
 
+from . import batch, bounds, exact
 from .exceptions import BigNumberError
+from .gas_table import GasTable, get_gas_table
 
 getcontext().prec = 40
 
+D0 = Decimal(0)
 D10_000 = Decimal(10_000)
 
+MAX_HALVINGS = 8
+DEADLINE_CHECK = 256
+"""Number of paths calculated between deadline checks."""
+
 
 log = Logger(__name__)
 
@@ -26,6 +36,9 @@ def search_for_arbitrages(
     mid_gas_price: Decimal,
     max_gas_price: Decimal,
     weth_prices: dict[str, Decimal],
+    edge_weights: EdgeWeights | None = None,
+    screened: bool = False,
+    deadline: float | None = None,
     # process_pool: ProcessPool,
 ) -> list[Arbitrage]:
     """Check if there are arbitrage oportunities for ``paths``.
@@ -38,6 +51,12 @@ def search_for_arbitrages(
         mid_gas_price (Decimal): Medium gas price.
         max_gas_price (Decimal): Maximum gas price.
         weth_prices (dict[str, Decimal]): Token to price mapping.
+        edge_weights (EdgeWeights | None, optional): Log edge weights for
+            rejecting nonprofitable paths. Defaults to None.
+        screened (bool, optional): If ``paths`` are already screened.
+            Defaults to False.
+        deadline (float | None, optional): Unix time after which remaining
+            paths are skipped. Defaults to None.
         process_pool (ProcessPool): Process pool.
 
     Returns:
@@ -59,6 +78,15 @@ def search_for_arbitrages(
     #         f"with {len(_paths[0]):,} paths in {timedelta(seconds=perf_counter() - start)}."
     #     )
 
+    # screening whole batch before exact calculations
+    if CONFIG["calculator"]["screen"] and not screened and paths:
+        start, len_before = perf_counter(), len(paths)
+        paths = batch.screen_paths(pools, paths)
+        log.debug(
+            f"Screened {len_before:,} paths to {len(paths):,}"
+            f" in {timedelta(seconds=perf_counter() - start)}."
+        )
+
     # calculate and get profitable paths
     start = perf_counter()
     # eth_price = prices.eth_price * Decimal(CONFIG["price"]["correction"])
@@ -72,6 +100,8 @@ def search_for_arbitrages(
         mid_gas_price,
         max_gas_price,
         weth_prices,
+        edge_weights,
+        deadline,
     )
 
     #########################
@@ -151,9 +181,11 @@ def calculate_profitability(
     mid_gas_price: Decimal,
     max_gas_price: Decimal,
     weth_prices: dict[str, Decimal],
+    edge_weights: EdgeWeights | None = None,
+    deadline: float | None = None,
 ) -> list[Arbitrage]:
     """Make calculations on ``paths`` and filter out only potentially
-    profitable paths.
+    profitable paths. Paths are calculated in order until ``deadline``.
 
     Args:
         pools (Pools): Pools.
@@ -163,6 +195,10 @@ def calculate_profitability(
         mid_gas_price (Decimal): Medium gas price.
         max_gas_price (Decimal): Maximum gas price.
         weth_prices (dict[str, Decimal]): Price of ETH.
+        edge_weights (EdgeWeights | None, optional): Log edge weights for
+            rejecting nonprofitable paths. Defaults to None.
+        deadline (float | None, optional): Unix time after which remaining
+            paths are skipped. Defaults to None.
 
     Raises:
         InvalidOperation: If `Decimal` encountered error.
@@ -170,89 +206,110 @@ def calculate_profitability(
     Returns:
         list[Arbitrage]: Potentially profitable arbitrages.
     """
-    low_multiplier = Decimal(CONFIG["price"]["low"]["ratio"])
-    mid_multiplier = Decimal(CONFIG["price"]["mid"]["ratio"])
-    high_multipler = Decimal(CONFIG["price"]["high"]["ratio"])
-    min_profit = Decimal(CONFIG["transaction"]["min_profit"])
-    burn_enabled = CONFIG["burner"]["enabled"]
-    burn_cost = Decimal(36_930) * Decimal(CONFIG["burner"]["gas_price"])
+    gas_table = get_gas_table(min_gas_price, low_gas_price, mid_gas_price, weth_prices)
 
-    potential_arbs = []
+    return [
+        create_arbitrage(
+            paths[i], amount_in, bruto_profit, gas_price, gas_table, max_gas_price
+        )
+        for i, amount_in, bruto_profit, gas_price in find_candidates(
+            pools,
+            paths,
+            min_gas_price,
+            low_gas_price,
+            mid_gas_price,
+            max_gas_price,
+            weth_prices,
+            edge_weights,
+            deadline,
+        )
+    ]
 
-    for path in paths:
-        try:
-            # getting virtual reserves
-            reserve_in, reserve_out = get_virtual_reserves(pools, path)
 
-            if reserve_in >= reserve_out or reserve_in <= 0 or reserve_out <= 0:
-                continue
+def find_candidates(
+    pools: Pools,
+    paths: list[tuple[str, ...]],
+    min_gas_price: Decimal,
+    low_gas_price: Decimal,
+    mid_gas_price: Decimal,
+    max_gas_price: Decimal,
+    weth_prices: dict[str, Decimal],
+    edge_weights: EdgeWeights | None = None,
+    deadline: float | None = None,
+    warm_starts: np.ndarray | None = None,
+) -> Iterator[tuple[int, Decimal, Decimal, Decimal]]:
+    """Make calculations on ``paths`` and yield only potentially profitable
+    paths without creating `Arbitrage`. Paths are calculated in order until
+    ``deadline``.
 
-            # getting optimal amount in
-            fee_numerator = pools[path[1]]["fee_numerator"]
-            amount_in = optimal_amount_in(reserve_in, reserve_out, fee_numerator)
-            if amount_in <= 0:
-                continue
+    Args:
+        pools (Pools): Pools.
+        paths (list[tuple[str, ...]]): Paths.
+        min_gas_price (Decimal): Minimum gas price.
+        low_gas_price (Decimal): Low gas price.
+        mid_gas_price (Decimal): Medium gas price.
+        max_gas_price (Decimal): Maximum gas price.
+        weth_prices (dict[str, Decimal]): Price of ETH.
+        edge_weights (EdgeWeights | None, optional): Log edge weights for
+            rejecting nonprofitable paths. Defaults to None.
+        deadline (float | None, optional): Unix time after which remaining
+            paths are skipped. Defaults to None.
+        warm_starts (np.ndarray | None, optional): Ratios of last optimal
+            amount in and closed form amount in of ``paths``, updated in
+            place. Defaults to None.
+
+    Yields:
+        tuple[int, Decimal, Decimal, Decimal]: Index of path in ``paths``,
+            amount in, bruto profit and optimal gas price.
+    """
+    min_profit = Decimal(CONFIG["transaction"]["min_profit"])
+    get_profit = BRUTO_PROFIT_BACKENDS[CONFIG["calculator"]["backend"]]
+    gas_table = get_gas_table(min_gas_price, low_gas_price, mid_gas_price, weth_prices)
 
-            # getting amount out and bruto profit
-            try:
-                amount_out = get_path_amount_out(amount_in, pools, path)
-            except BigNumberError:
-                amount_in //= Decimal(1.2)
-                amount_out = get_path_amount_out(amount_in, pools, path)
+    prefixes: dict = {}  # type: ignore
+    ratios = [1.0] * len(paths) if warm_starts is None else warm_starts.tolist()
 
-            bruto_profit = amount_out - amount_in
-            if bruto_profit <= 0:
+    for i, path in enumerate(paths):
+        if deadline is not None and not i % DEADLINE_CHECK and time() > deadline:
+            log.debug(f"Deadline reached with {len(paths) - i:,} paths left.")
+            break
+
+        try:
+            # rejecting paths with product of rates lower than 1
+            if edge_weights and bounds.get_path_weight(edge_weights, path) <= 0:
                 continue
 
-            ########
-            # TEST #
-            opt_amount_in, opt_profit, i = tweak_amount_in(
-                amount_in, bruto_profit, path, pools
-            )
+            # getting burners values and gas price thresholds
+            gas_entry = gas_table.entry(path[0], MIN_GAS_LIMITS[len(path)])
 
-            if i:
-                # profit_diff = (opt_profit / bruto_profit) - Decimal(1)
-                # log.info(f"{i / 100:.2%} amount in. Profit: {profit_diff:.2%}")
-                amount_in = opt_amount_in
-                bruto_profit = opt_profit
+            amount_in, bruto_profit, ratio = get_profit(
+                pools, path, gas_entry.min_bruto_profit, prefixes, ratios[i]
+            )
+            if warm_starts is not None and ratio != ratios[i]:
+                warm_starts[i] = ratio
+            if bruto_profit <= 0:
+                continue
 
-            ########
+            amount_in, bruto_profit = Decimal(amount_in), Decimal(bruto_profit)
 
-            # getting gas limit and wei price
-            gas_limit: Decimal = MIN_GAS_LIMITS[len(path)]
             wei_price = weth_prices[path[0]]
-
-            # getting burners count and gas usage after burning
-            if burn_enabled:
-                burners_count, gas_usage = get_burners_values(gas_limit)
-            else:
-                burners_count, gas_usage = 0, gas_limit
-
-            burners_cost = round(burners_count * burn_cost * wei_price, 0)
+            gas_usage = gas_entry.gas_usage
+            burners_cost = gas_entry.burners_cost
 
             if bruto_profit - burners_cost <= 0:
                 continue
 
             # getting optimal price and checking if it's above minimum gas price
-            optimal_gas_price = calc_optimal_gas_price(
-                bruto_profit - burners_cost, gas_usage, wei_price, low_multiplier
+            optimal_gas_price = gas_table.optimal_gas_price(
+                gas_entry, bruto_profit - burners_cost
             )
             if optimal_gas_price < min_gas_price:
                 continue
-            if optimal_gas_price > low_gas_price:
-                optimal_gas_price = calc_optimal_gas_price(
-                    bruto_profit - burners_cost, gas_usage, wei_price, mid_multiplier
-                )
-            if optimal_gas_price > mid_gas_price:
-                optimal_gas_price = calc_optimal_gas_price(
-                    bruto_profit - burners_cost, gas_usage, wei_price, high_multipler
-                )
 
             # getting gas price
             gas_price = min(optimal_gas_price, max_gas_price)
 
             gas_cost = calc_gas_cost(gas_price, gas_usage, wei_price)
-            tx_cost = amount_in + gas_cost + burners_cost
 
             # calculating profitability
             neto_profit = bruto_profit - gas_cost - burners_cost
@@ -266,56 +323,283 @@ def calculate_profitability(
         except (InvalidOperation, BigNumberError):
             continue
 
-        potential_arbs.append(
-            Arbitrage(
-                path,
-                amount_in,
-                tx_cost,
-                bruto_profit,
-                neto_profit,
-                wei_profit,
-                optimal_gas_price,
-                burners_cost,
-                burners_count,
-            )
-        )
+        yield i, amount_in, bruto_profit, optimal_gas_price
 
-    return potential_arbs
 
+def create_arbitrage(
+    path: tuple[str, ...],
+    amount_in: Decimal,
+    bruto_profit: Decimal,
+    optimal_gas_price: Decimal,
+    gas_table: GasTable,
+    max_gas_price: Decimal,
+) -> Arbitrage:
+    """Create `Arbitrage` of path found by `find_candidates`.
+
+    Args:
+        path (tuple[str, ...]): Path.
+        amount_in (Decimal): Amount in.
+        bruto_profit (Decimal): Bruto profit.
+        optimal_gas_price (Decimal): Optimal gas price.
+        gas_table (GasTable): Gas table with prices used when searching.
+        max_gas_price (Decimal): Maximum gas price.
+
+    Returns:
+        Arbitrage: Arbitrage datastructure.
+    """
+    gas_entry = gas_table.entry(path[0], MIN_GAS_LIMITS[len(path)])
+    wei_price = gas_table.weth_prices[path[0]]
+    burners_cost = gas_entry.burners_cost
+
+    gas_cost = calc_gas_cost(
+        min(optimal_gas_price, max_gas_price), gas_entry.gas_usage, wei_price
+    )
+    neto_profit = bruto_profit - gas_cost - burners_cost
+
+    return Arbitrage(
+        path,
+        amount_in,
+        amount_in + gas_cost + burners_cost,
+        bruto_profit,
+        neto_profit,
+        neto_profit // wei_price,
+        optimal_gas_price,
+        burners_cost,
+        gas_entry.burners_count,
+    )
+
+
+def get_bruto_profit(
+    pools: Pools,
+    path: tuple[str, ...],
+    min_bruto_profit: float = 0.0,
+    prefixes: dict | None = None,
+    warm_start: float = 1.0,
+) -> tuple[Decimal, Decimal, float]:
+    """Get optimal amount in and bruto profit for ``path`` using `Decimal` math.
+
+    Args:
+        pools (Pools): Pools.
+        path (tuple[str, ...]): Path.
+        min_bruto_profit (float, optional): Skip path if maximum possible bruto
+            profit is not greater than ``min_bruto_profit``. Defaults to 0.
+        prefixes (dict | None, optional): Prefix trie for memoising virtual
+            reserves. Defaults to None.
+        warm_start (float, optional): Warm start of `optimize_amount_in`.
+            Defaults to 1.
+
+    Raises:
+        InvalidOperation: If `Decimal` encountered error.
+
+    Returns:
+        tuple[Decimal, Decimal, float]: Amount in, bruto profit and next warm
+            start. Bruto profit is `0` if path is not profitable.
+    """
+    # getting virtual reserves
+    reserve_in, reserve_out = get_virtual_reserves(pools, path, prefixes)
+
+    if reserve_in >= reserve_out or reserve_in <= 0 or reserve_out <= 0:
+        return D0, D0, warm_start
 
-def get_virtual_reserves(pools: Pools, path: list[str]) -> tuple[Decimal, Decimal]:
+    # rejecting if maximum bruto profit can't cover gas
+    fee_numerator = pools[path[1]]["fee_numerator"]
+    max_profit = bounds.max_bruto_profit(reserve_in, reserve_out, fee_numerator)
+    if max_profit <= min_bruto_profit:
+        return D0, D0, warm_start
+
+    # getting optimal amount in
+    amount_in = optimal_amount_in(reserve_in, reserve_out, fee_numerator)
+    if amount_in <= 0:
+        return D0, D0, warm_start
+
+    def simulate(amount_in: int) -> int:
+        return int(get_path_amount_out(Decimal(amount_in), pools, path))
+
+    amount_in, bruto_profit, warm_start = optimize_amount_in(
+        int(amount_in), simulate, warm_start
+    )
+    return Decimal(amount_in), Decimal(bruto_profit), warm_start
+
+
+def get_exact_bruto_profit(
+    pools: Pools,
+    path: tuple[str, ...],
+    min_bruto_profit: float = 0.0,
+    prefixes: dict | None = None,
+    warm_start: float = 1.0,
+) -> tuple[int, int, float]:
+    """Get optimal amount in and bruto profit for ``path`` using integer math.
+
+    Args:
+        pools (Pools): Pools with `int` reserves and fee numerators.
+        path (tuple[str, ...]): Path.
+        min_bruto_profit (float, optional): Skip path if maximum possible bruto
+            profit is not greater than ``min_bruto_profit``. Defaults to 0.
+        prefixes (dict | None, optional): Prefix trie for memoising virtual
+            reserves. Defaults to None.
+        warm_start (float, optional): Warm start of `optimize_amount_in`.
+            Defaults to 1.
+
+    Returns:
+        tuple[int, int, float]: Amount in, bruto profit and next warm start.
+            Bruto profit is `0` if path is not profitable.
+    """
+    # getting virtual reserves
+    reserve_in, reserve_out = exact.get_virtual_reserves(pools, path, prefixes)
+
+    if reserve_in >= reserve_out or reserve_in <= 0 or reserve_out <= 0:
+        return 0, 0, warm_start
+
+    # rejecting if maximum bruto profit can't cover gas
+    fee_numerator = pools[path[1]]["fee_numerator"]
+    max_profit = bounds.max_bruto_profit(reserve_in, reserve_out, fee_numerator)
+    if max_profit <= min_bruto_profit:
+        return 0, 0, warm_start
+
+    # getting optimal amount in
+    amount_in = exact.optimal_amount_in(reserve_in, reserve_out, fee_numerator)
+    if amount_in <= 0:
+        return 0, 0, warm_start
+
+    def simulate(amount_in: int) -> int:
+        return exact.get_path_amount_out(amount_in, pools, path)
+
+    return optimize_amount_in(amount_in, simulate, warm_start)
+
+
+def optimize_amount_in(
+    amount_in0: int, simulate: Callable[[int], int], warm_start: float = 1.0
+) -> tuple[int, int, float]:
+    """Refine closed form ``amount_in0`` with bounded Newton step on exact
+    amount out. Uses 4 simulations.
+
+    Starting amount is ``amount_in0`` corrected by ``warm_start``, ratio of
+    previous optimum of path and its closed form amount in. If amount is too
+    big it is halved until it is in reserves range.
+
+    Args:
+        amount_in0 (int): Closed form optimal amount in.
+        simulate (Callable[[int], int]): Function that returns path amount out
+            for amount in.
+        warm_start (float, optional): Ratio of previous optimal amount in and
+            closed form amount in. Defaults to 1.
+
+    Returns:
+        tuple[int, int, float]: Best amount in, best profit and warm start for
+            next block. Profit is `0` if path is not profitable.
+    """
+
+    def get_profit(amount_in: int) -> int | None:
+        try:
+            return simulate(amount_in) - amount_in
+        except BigNumberError:
+            return None
+
+    # starting from previous optimum
+    amount_in = max(round(amount_in0 * warm_start), 1)
+    profit = get_profit(amount_in)
+
+    # getting into reserves range
+    halvings = 0
+    while profit is None:
+        if halvings == MAX_HALVINGS:
+            return 0, 0, warm_start
+        amount_in //= 2
+        halvings += 1
+        profit = get_profit(amount_in)
+
+    best_amount_in, best_profit = amount_in, profit
+
+    # derivatives from exact amounts out
+    step = max(amount_in // 64, 1)
+    profit_low = get_profit(amount_in - step) if amount_in > step else None
+    profit_high = get_profit(amount_in + step)
+
+    for _amount_in, _profit in (
+        (amount_in - step, profit_low),
+        (amount_in + step, profit_high),
+    ):
+        if _profit is not None and _profit > best_profit:
+            best_amount_in, best_profit = _amount_in, _profit
+
+    # newton step bounded to 8 steps from start
+    if profit_low is not None and profit_high is not None:
+        curvature = profit_high - 2 * profit + profit_low
+
+        if curvature < 0:
+            newton_step = step * (profit_high - profit_low) // (-2 * curvature)
+            newton_step = min(max(newton_step, -8 * step), 8 * step)
+
+            newton_amount_in = amount_in + newton_step
+            newton_profit = get_profit(newton_amount_in)
+
+            if newton_profit is not None and newton_profit > best_profit:
+                best_amount_in, best_profit = newton_amount_in, newton_profit
+
+    if best_profit <= 0:
+        return 0, 0, 1.0
+
+    return best_amount_in, best_profit, best_amount_in / amount_in0
+
+
+def get_virtual_reserves(
+    pools: Pools, path: list[str], prefixes: dict | None = None
+) -> tuple[Decimal, Decimal]:
     """Calculate virtual reserves for given ``path``.
 
+    If ``prefixes`` trie is provided, virtual reserves of every prefix of
+    ``path`` are memoised in it and reused by other paths with the same
+    prefix. Trie is valid only until reserves change.
+
     Args:
         pools (Pools): Pools datastructure.
         path (list[str]): `token`, `pool`, `token`... list
+        prefixes (dict | None, optional): Prefix trie. Defaults to None.
 
     Returns:
         tuple[Decimal, Decimal]: Virtual reserve in, virtual reserve out.
     """
-    pool = pools[path[1]]
+    node = None if prefixes is None else prefixes.setdefault(path[0], {})
+    last_pool_idx = len(path) - 2
 
     # called virtual becaouse of reusable variable
-    virtual_in = pool[path[0]]  # reserve_in_a
-    virtual_out = pool[path[2]]  # reserve_out_a
+    virtual_in = virtual_out = D0
+
+    for i in range(1, len(path), 2):
+        # reusing memoised prefix
+        if node is not None:
+            try:
+                virtual_in, virtual_out, node = node[path[i]]
+                continue
+            except KeyError:
+                pass
 
-    for i in range(3, len(path), 2):
         pool = pools[path[i]]
 
-        fee_numerator = pool["fee_numerator"]
+        if i == 1:
+            virtual_in = pool[path[0]]  # reserve_in_a
+            virtual_out = pool[path[2]]  # reserve_out_a
+        else:
+            fee_numerator = pool["fee_numerator"]
 
-        reserve_in_a = virtual_in
-        reserve_out_a = virtual_out
+            reserve_in_a = virtual_in
+            reserve_out_a = virtual_out
 
-        reserve_in_b = pool[path[i - 1]]
-        reserve_out_b = pool[path[i + 1]]
+            reserve_in_b = pool[path[i - 1]]
+            reserve_out_b = pool[path[i + 1]]
 
-        virtual_in = (D10_000 * reserve_in_a * reserve_in_b) / (
-            D10_000 * reserve_in_b + fee_numerator * reserve_out_a
-        )
-        virtual_out = (fee_numerator * reserve_out_a * reserve_out_b) / (
-            D10_000 * reserve_in_b + fee_numerator * reserve_out_a
-        )
+            virtual_in = (D10_000 * reserve_in_a * reserve_in_b) / (
+                D10_000 * reserve_in_b + fee_numerator * reserve_out_a
+            )
+            virtual_out = (fee_numerator * reserve_out_a * reserve_out_b) / (
+                D10_000 * reserve_in_b + fee_numerator * reserve_out_a
+            )
+
+        # memoising prefix
+        if node is not None and i != last_pool_idx:
+            child: dict = {}  # type: ignore
+            node[path[i]] = (virtual_in, virtual_out, child)
+            node = child
 
     return round(virtual_in, 0), round(virtual_out, 0)
 
@@ -372,29 +656,6 @@ def get_path_amount_out(amount_in: Decimal, pools: Pools, path: list[str]) -> De
     return amount_out
 
 
-def tweak_amount_in(
-    amount_in0: Decimal, profit0: Decimal, path: tuple[str, ...], pools: Pools
-) -> tuple[Decimal, Decimal, int]:
-    best_amount_in = amount_in0
-    best_profit = profit0
-    best_i = 0
-
-    for i in range(1, 30):
-        amount_in = round(amount_in0 * Decimal(i / 100 + 1), 0)
-        amount_out = get_path_amount_out(amount_in, pools, path)
-        profit = amount_out - amount_in
-
-        if profit > best_profit:
-            best_amount_in = amount_in
-            best_profit = profit
-            best_i = i
-
-        elif profit < best_profit:
-            break
-
-    return best_amount_in, best_profit, best_i
-
-
 def calc_gas_cost(gas_price: Decimal, gas_limit: Decimal, price: Decimal) -> Decimal:
     """Calculate cost of the transaction execution given the WEI ``price`` of the token.
 
@@ -474,36 +735,14 @@ def calc_optimal_gas_price(
     return round((bruto_profit * profit_multiplier) / (gas_usage * wei_price), 0)
 
 
-def get_burners_values(gas_usage: Decimal) -> tuple[int, Decimal]:
-    """Get maximum number of burners to use based on ``gas_usage``
-    and ``gas_usage`` after burning gas reduction.
-
-    Note:
-        * Burn execution cost is `6,114` gas
-        * Burner address calldata cost is `320` gas
-        * Burn cost is `6,434` gas
-        * Selfdestruct refund is `24,000` gas
-        * Burn gas reduction is `17,566` gas
-
-    Args:
-        gas_usage (Decimal): Gas usage.
-
-    Returns:
-        tuple[int, Decimal]: Number of burners to use and gas usage.
-    """
-    gas_reduction, burn_cost = Decimal(17_566), Decimal(6_434)
-    total_gas = gas_usage
-    count = 0
-
-    while True:
-        total_gas += burn_cost
-        new_gas_usage = max(gas_usage - gas_reduction, total_gas // 2)
-
-        # checking if gas reduction is greater than previous
-        if new_gas_usage >= gas_usage:
-            break
-
-        gas_usage = new_gas_usage
-        count += 1
-
-    return count, round(gas_usage * Decimal(1.2), 0)
+BRUTO_PROFIT_BACKENDS: dict[
+    str,
+    Callable[
+        [Pools, tuple[str, ...], float, dict | None, float],
+        tuple[int | Decimal, int | Decimal, float],
+    ],
+] = {
+    "decimal": get_bruto_profit,
+    "int": get_exact_bruto_profit,
+}
+"""Mapping of `calculator.backend` config value to bruto profit function."""
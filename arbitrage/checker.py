@@ -4,7 +4,7 @@ from typing import Sequence
 
 from eth_typing import ChecksumAddress
 
-from blockchain import Web3, get_weth_price
+from blockchain import Web3, get_weth_price, get_weth_prices
 from utils import CONFIG, Logger, measure_time, str_num
 from utils._types import (
     BatchCheckerArgs,
@@ -16,8 +16,9 @@ from utils._types import (
 from utils.datastructures import Arbitrage
 
 from .arguments import create_all_batch_args
-from .calculator import calc_gas_cost, calc_optimal_gas_price, get_burners_values
+from .calculator import calc_gas_cost
 from .exceptions import ArbitrageError, BatchDecodeError
+from .gas_table import bucket_gas, get_gas_table
 
 log = Logger(__name__)
 
@@ -173,12 +174,10 @@ def handle_successful(
 ) -> list[tuple[Arbitrage, Decimal, Decimal]]:
     recalculated_arbs = []
 
-    low_multiplier = Decimal(CONFIG["price"]["low"]["ratio"])
-    mid_multiplier = Decimal(CONFIG["price"]["mid"]["ratio"])
-    high_multipler = Decimal(CONFIG["price"]["high"]["ratio"])
     min_profit = Decimal(CONFIG["transaction"]["min_profit"])
-    burn_enabled = CONFIG["burner"]["enabled"]
-    burn_cost = Decimal(36_930) * Decimal(CONFIG["burner"]["gas_price"])
+    gas_table = get_gas_table(
+        min_gas_price, low_gas_price, mid_gas_price, get_weth_prices()
+    )
 
     for arb, batch_result in successful:
         # removing from pre blacklist
@@ -193,38 +192,24 @@ def handle_successful(
             continue
 
         # getting gas cost and estimated gas usage
-        gas_est = Decimal(batch_result[2] + 23_640)
         wei_price = get_weth_price(arb.token_in)
 
-        # getting burners count and gas usage after burning
-        if burn_enabled:
-            burners_count, gas_usage = get_burners_values(gas_est)
-        else:
-            burners_count, gas_usage = 0, gas_est
-
-        burners_cost = round(burners_count * burn_cost * wei_price, 0)
+        # getting burners count, gas usage after burning and gas price thresholds
+        gas_entry = gas_table.entry(arb.token_in, bucket_gas(batch_result[2] + 23_640))
+        burners_count = gas_entry.burners_count
+        gas_usage = gas_entry.gas_usage
+        burners_cost = gas_entry.burners_cost
 
         if bruto_profit - burners_cost <= 0:
             continue
 
         # getting optimal gas price
-        optimal_gas_price = calc_optimal_gas_price(
-            bruto_profit - burners_cost, gas_usage, wei_price, low_multiplier
+        optimal_gas_price = gas_table.optimal_gas_price(
+            gas_entry, bruto_profit - burners_cost
         )
-
-        # regulating optimal price not to be higher than configured maximum
         if optimal_gas_price < min_gas_price:
             continue
 
-        if optimal_gas_price > low_gas_price:
-            optimal_gas_price = calc_optimal_gas_price(
-                bruto_profit - burners_cost, gas_usage, wei_price, mid_multiplier
-            )
-        if optimal_gas_price > mid_gas_price:
-            optimal_gas_price = calc_optimal_gas_price(
-                bruto_profit - burners_cost, gas_usage, wei_price, high_multipler
-            )
-
         # FIX BY IGNORING ALL ARBS WITH POOLS WITH HIGH GAS PRICE
         # SKIPPING TX WHERE GAS PRICE IS ABOVE MAXIMUM
         # if optimal_gas_price > max_gas_price:
@@ -0,0 +1,133 @@
+from math import isqrt
+
+from utils._types import Pools
+
+from .exceptions import BigNumberError
+
+MAX_UINT112 = 2**112 - 1
+
+
+def get_virtual_reserves(
+    pools: Pools, path: tuple[str, ...], prefixes: dict | None = None
+) -> tuple[int, int]:
+    """Calculate virtual reserves for given ``path``.
+
+    If ``prefixes`` trie is provided, virtual reserves of every prefix of
+    ``path`` are memoised in it and reused by other paths with the same
+    prefix. Trie is valid only until reserves change.
+
+    Note:
+        Every fold is floored, so result can be lower by few wei than
+        result of `calculator.get_virtual_reserves`.
+
+    Args:
+        pools (Pools): Pools datastructure with `int` reserves and fee
+            numerators.
+        path (tuple[str, ...]): `token`, `pool`, `token`... tuple
+        prefixes (dict | None, optional): Prefix trie. Defaults to None.
+
+    Returns:
+        tuple[int, int]: Virtual reserve in, virtual reserve out.
+    """
+    node = None if prefixes is None else prefixes.setdefault(path[0], {})
+    last_pool_idx = len(path) - 2
+    virtual_in = virtual_out = 0
+
+    for i in range(1, len(path), 2):
+        # reusing memoised prefix
+        if node is not None:
+            try:
+                virtual_in, virtual_out, node = node[path[i]]
+                continue
+            except KeyError:
+                pass
+
+        pool = pools[path[i]]
+
+        if i == 1:
+            virtual_in = pool[path[0]]
+            virtual_out = pool[path[2]]
+        else:
+            fee_numerator = pool["fee_numerator"]
+            reserve_in_b = pool[path[i - 1]]
+            reserve_out_b = pool[path[i + 1]]
+
+            denominator = 10_000 * reserve_in_b + fee_numerator * virtual_out
+            virtual_in = 10_000 * virtual_in * reserve_in_b // denominator
+            virtual_out = fee_numerator * virtual_out * reserve_out_b // denominator
+
+        # memoising prefix
+        if node is not None and i != last_pool_idx:
+            child: dict = {}  # type: ignore
+            node[path[i]] = (virtual_in, virtual_out, child)
+            node = child
+
+    return virtual_in, virtual_out
+
+
+def optimal_amount_in(reserve_in: int, reserve_out: int, fee_numerator: int) -> int:
+    """Calculate optimal amount in for given reserves.
+
+    Args:
+        reserve_in (int): Reserve in.
+        reserve_out (int): Reserve out.
+        fee_numerator (int): Fee numerator.
+
+    Returns:
+        int: Optimal amount in.
+    """
+    return (
+        isqrt(reserve_in * reserve_out * fee_numerator * 10_000) - reserve_in * 10_000
+    ) // fee_numerator
+
+
+def get_amount_out(
+    amount_in: int, reserve_in: int, reserve_out: int, fee_numerator: int
+) -> int:
+    """Get amount out. Same rounding as `UniswapV2Library.getAmountOut`.
+
+    Args:
+        amount_in (int): Amount in.
+        reserve_in (int): Reserve for token in.
+        reserve_out (int): Reserve for token out.
+        fee_numerator (int): Fee numerator.
+
+    Returns:
+        int: Amount out.
+    """
+    amount_in_with_fee = amount_in * fee_numerator
+    return (
+        amount_in_with_fee * reserve_out // (reserve_in * 10_000 + amount_in_with_fee)
+    )
+
+
+def get_path_amount_out(amount_in: int, pools: Pools, path: tuple[str, ...]) -> int:
+    """Given ``amount_in`` get amount out for path.
+
+    Args:
+        amount_in (int): Amount of token in.
+        pools (Pools): Pools with `int` reserves and fee numerators.
+        path (tuple[str, ...]): Path.
+
+    Raises:
+        BigNumberError: If amount is larger than reserves.
+
+    Returns:
+        int: Amount of token out.
+    """
+    for i in range(1, len(path), 2):
+        pool = pools[path[i]]
+        reserve_in = pool[path[i - 1]]
+        reserve_out = pool[path[i + 1]]
+
+        if amount_in > reserve_in or amount_in > MAX_UINT112:
+            raise BigNumberError()
+
+        amount_in_with_fee = amount_in * pool["fee_numerator"]
+        amount_in = (
+            amount_in_with_fee
+            * reserve_out
+            // (reserve_in * 10_000 + amount_in_with_fee)
+        )
+
+    return amount_in
@@ -0,0 +1,263 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from utils import CONFIG, MIN_GAS_LIMITS
+
+D0 = Decimal(0)
+D05 = Decimal("0.5")
+
+BURN_COST = Decimal(36_930) * Decimal(CONFIG["burner"]["gas_price"])
+"""Cost of creating one burner."""
+
+GAS_BUCKET = 1_000
+"""Gas estimates are rounded up to multiple of `GAS_BUCKET`."""
+
+
+@dataclass(slots=True)
+class GasEntry:
+    """Burners values and gas price thresholds for token and gas limit."""
+
+    burners_count: int
+    gas_usage: Decimal
+    burners_cost: Decimal
+    gas_divisor: Decimal
+    min_net_profit: Decimal
+    low_net_profit: Decimal
+    mid_net_profit: Decimal
+    min_bruto_profit: float
+
+
+class GasTable:
+    """Per process lookup table of burners values and gas price thresholds
+    for every token and gas limit in `MIN_GAS_LIMITS`. Entries for other
+    gas limits are added when requested.
+
+    Net profit is bruto profit reduced by burners cost. Thresholds are net
+    profits at which optimal gas price changes tier, so optimal gas price
+    is calculated only once.
+
+    Args:
+        min_gas_price (Decimal): Minimum gas price.
+        low_gas_price (Decimal): Low gas price.
+        mid_gas_price (Decimal): Medium gas price.
+        weth_prices (dict[str, Decimal]): Token to price mapping.
+
+    Attributes:
+        gas_prices (tuple[Decimal, Decimal, Decimal]): Minimum, low and
+            medium gas price.
+        weth_prices (dict[str, Decimal]): Token to price mapping.
+        ratios (tuple[Decimal, Decimal, Decimal]): Low, medium and high
+            profit multipliers.
+        entries (dict[tuple[str, Decimal], GasEntry]): Token and gas limit
+            to entry mapping.
+    """
+
+    __slots__ = ("gas_prices", "weth_prices", "ratios", "entries")
+
+    def __init__(
+        self,
+        min_gas_price: Decimal,
+        low_gas_price: Decimal,
+        mid_gas_price: Decimal,
+        weth_prices: dict[str, Decimal],
+    ) -> None:
+        self.gas_prices = (min_gas_price, low_gas_price, mid_gas_price)
+        self.weth_prices = dict(weth_prices)
+        self.ratios = (
+            Decimal(CONFIG["price"]["low"]["ratio"]),
+            Decimal(CONFIG["price"]["mid"]["ratio"]),
+            Decimal(CONFIG["price"]["high"]["ratio"]),
+        )
+        self.entries: dict[tuple[str, Decimal], GasEntry] = {}  # type: ignore
+
+        for token in self.weth_prices:
+            for gas_limit in MIN_GAS_LIMITS:
+                if gas_limit is not None:
+                    self.entry(token, gas_limit)
+
+    def entry(self, token: str, gas_limit: Decimal) -> GasEntry:
+        """Get entry for ``token`` and ``gas_limit``.
+
+        Args:
+            token (str): Token address.
+            gas_limit (Decimal): Gas limit.
+
+        Raises:
+            KeyError: If there is no price for ``token``.
+
+        Returns:
+            GasEntry: Burners values and gas price thresholds.
+        """
+        try:
+            return self.entries[token, gas_limit]
+        except KeyError:
+            pass
+
+        min_gas_price, low_gas_price, mid_gas_price = self.gas_prices
+        low_ratio, mid_ratio, _ = self.ratios
+        wei_price = self.weth_prices[token]
+
+        burners_count, gas_usage = BURNERS_VALUES[gas_limit]
+        burners_cost = round(burners_count * BURN_COST * wei_price, 0)
+        gas_divisor = gas_usage * wei_price
+
+        # net profits at which rounded optimal gas price crosses gas prices
+        min_net_profit = (min_gas_price - D05) * gas_divisor / low_ratio
+
+        entry = GasEntry(
+            burners_count,
+            gas_usage,
+            burners_cost,
+            gas_divisor,
+            min_net_profit,
+            (low_gas_price + D05) * gas_divisor / low_ratio,
+            (mid_gas_price + D05) * gas_divisor / mid_ratio,
+            float(burners_cost + min_net_profit),
+        )
+        self.entries[token, gas_limit] = entry
+
+        return entry
+
+    def optimal_gas_price(self, entry: GasEntry, net_profit: Decimal) -> Decimal:
+        """Get optimal gas price with profit multiplier of the gas price tier.
+        Same result as `calculator.calc_optimal_gas_price` with tier ratio.
+
+        Args:
+            entry (GasEntry): Entry for token and gas limit.
+            net_profit (Decimal): Bruto profit reduced by burners cost.
+
+        Returns:
+            Decimal: Optimal gas price. `0` if it's lower than minimum gas price.
+        """
+        if net_profit < entry.min_net_profit:
+            return D0
+
+        low_ratio, mid_ratio, high_ratio = self.ratios
+
+        if net_profit <= entry.low_net_profit:
+            ratio = low_ratio
+        elif net_profit <= entry.mid_net_profit:
+            ratio = mid_ratio
+        else:
+            ratio = high_ratio
+
+        return round(net_profit * ratio / entry.gas_divisor, 0)
+
+    def is_current(
+        self,
+        min_gas_price: Decimal,
+        low_gas_price: Decimal,
+        mid_gas_price: Decimal,
+        weth_prices: dict[str, Decimal],
+    ) -> bool:
+        """Check if table was built with provided prices."""
+        return (
+            self.gas_prices == (min_gas_price, low_gas_price, mid_gas_price)
+            and self.weth_prices == weth_prices
+        )
+
+
+class BurnersValues(dict[Decimal, tuple[int, Decimal]]):
+    """Gas limit to burners count and gas usage after burning mapping.
+    Missing gas limits are calculated on first access.
+    """
+
+    def __missing__(self, gas_limit: Decimal) -> tuple[int, Decimal]:
+        if CONFIG["burner"]["enabled"]:
+            values = get_burners_values(gas_limit)
+        else:
+            values = 0, gas_limit
+
+        self[gas_limit] = values
+        return values
+
+
+def get_gas_table(
+    min_gas_price: Decimal,
+    low_gas_price: Decimal,
+    mid_gas_price: Decimal,
+    weth_prices: dict[str, Decimal],
+) -> GasTable:
+    """Get gas table for provided prices. Table is rebuilt only when
+    prices change.
+
+    Args:
+        min_gas_price (Decimal): Minimum gas price.
+        low_gas_price (Decimal): Low gas price.
+        mid_gas_price (Decimal): Medium gas price.
+        weth_prices (dict[str, Decimal]): Token to price mapping.
+
+    Returns:
+        GasTable: Gas table.
+    """
+    global GAS_TABLE
+
+    if GAS_TABLE is None or not GAS_TABLE.is_current(
+        min_gas_price, low_gas_price, mid_gas_price, weth_prices
+    ):
+        GAS_TABLE = GasTable(min_gas_price, low_gas_price, mid_gas_price, weth_prices)
+
+    return GAS_TABLE
+
+
+def bucket_gas(gas_estimate: int) -> Decimal:
+    """Round ``gas_estimate`` up to multiple of `GAS_BUCKET`.
+
+    Example::
+        >>> bucket_gas(183_209)
+        Decimal('184000')
+
+    Args:
+        gas_estimate (int): Gas estimate.
+
+    Returns:
+        Decimal: Bucketed gas estimate.
+    """
+    return Decimal(-(-gas_estimate // GAS_BUCKET) * GAS_BUCKET)
+
+
+def get_burners_values(gas_usage: Decimal) -> tuple[int, Decimal]:
+    """Get maximum number of burners to use based on ``gas_usage``
+    and ``gas_usage`` after burning gas reduction.
+
+    Note:
+        * Burn execution cost is `6,114` gas
+        * Burner address calldata cost is `320` gas
+        * Burn cost is `6,434` gas
+        * Selfdestruct refund is `24,000` gas
+        * Burn gas reduction is `17,566` gas
+
+    Args:
+        gas_usage (Decimal): Gas usage.
+
+    Returns:
+        tuple[int, Decimal]: Number of burners to use and gas usage.
+    """
+    gas_reduction, burn_cost = Decimal(17_566), Decimal(6_434)
+    total_gas = gas_usage
+    count = 0
+
+    while True:
+        total_gas += burn_cost
+        new_gas_usage = max(gas_usage - gas_reduction, total_gas // 2)
+
+        # checking if gas reduction is greater than previous
+        if new_gas_usage >= gas_usage:
+            break
+
+        gas_usage = new_gas_usage
+        count += 1
+
+    return count, round(gas_usage * Decimal(1.2), 0)
+
+
+BURNERS_VALUES = BurnersValues()
+"""Gas limit to burners count and gas usage after burning mapping.
+Built at config load for every gas limit in `MIN_GAS_LIMITS`.
+"""
+
+for gas_limit in MIN_GAS_LIMITS:
+    if gas_limit is not None:
+        BURNERS_VALUES[gas_limit]
+
+GAS_TABLE: GasTable | None = None
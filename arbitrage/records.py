@@ -0,0 +1,107 @@
+from decimal import Decimal
+from typing import Iterable
+
+import numpy as np
+
+from path.store import PathStore
+from utils.datastructures import Arbitrage
+
+from .calculator import create_arbitrage
+from .gas_table import get_gas_table
+
+MASK_64 = 2**64 - 1
+
+RECORD = np.dtype(
+    [
+        ("path_id", np.int32),
+        ("gas_price", np.uint64),
+        ("amount_in", np.uint64, 2),
+        ("bruto_profit", np.uint64, 2),
+    ]
+)
+"""Packed candidate: path id, optimal gas price, amount in and bruto profit.
+Amount in and bruto profit are `uint128` stored as low and high `uint64`,
+optimal gas price is clamped to `uint64`."""
+
+
+def pack_records(
+    path_ids: np.ndarray,
+    candidates: Iterable[tuple[int, Decimal, Decimal, Decimal]],
+) -> bytes:
+    """Pack candidates found by `calculator.find_candidates` to fixed width
+    records.
+
+    Args:
+        path_ids (np.ndarray): Path ids of searched paths.
+        candidates (Iterable[tuple[int, Decimal, Decimal, Decimal]]): Index
+            of path, amount in, bruto profit and optimal gas price.
+
+    Returns:
+        bytes: Records buffer.
+    """
+    rows = []
+    for i, amount_in, bruto_profit, gas_price in candidates:
+        amount_in, bruto_profit = int(amount_in), int(bruto_profit)
+        rows.append(
+            (
+                path_ids[i],
+                # optimal gas price isn't capped, it only orders arbitrages
+                min(int(gas_price), MASK_64),
+                (amount_in & MASK_64, amount_in >> 64),
+                (bruto_profit & MASK_64, bruto_profit >> 64),
+            )
+        )
+
+    return np.array(rows, dtype=RECORD).tobytes()
+
+
+def unpack_records(
+    buffer: bytes,
+    path_store: PathStore,
+    min_gas_price: Decimal,
+    low_gas_price: Decimal,
+    mid_gas_price: Decimal,
+    max_gas_price: Decimal,
+    weth_prices: dict[str, Decimal],
+) -> tuple[list[Arbitrage], np.ndarray]:
+    """Create arbitrages from records buffer with gas prices used when
+    searching.
+
+    Args:
+        buffer (bytes): Records buffer.
+        path_store (PathStore): Paths.
+        min_gas_price (Decimal): Minimum gas price.
+        low_gas_price (Decimal): Low gas price.
+        mid_gas_price (Decimal): Medium gas price.
+        max_gas_price (Decimal): Maximum gas price.
+        weth_prices (dict[str, Decimal]): Token to price mapping.
+
+    Returns:
+        tuple[list[Arbitrage], np.ndarray]: Arbitrages and their path ids.
+    """
+    records = np.frombuffer(buffer, dtype=RECORD)
+    if not len(records):
+        return [], records["path_id"]
+
+    gas_table = get_gas_table(min_gas_price, low_gas_price, mid_gas_price, weth_prices)
+    paths = path_store.get_paths(records["path_id"])
+
+    arbs = []
+    for path, gas_price, (low_in, high_in), (low_profit, high_profit) in zip(
+        paths,
+        records["gas_price"].tolist(),
+        records["amount_in"].tolist(),
+        records["bruto_profit"].tolist(),
+    ):
+        arbs.append(
+            create_arbitrage(
+                path,
+                Decimal(low_in | high_in << 64),
+                Decimal(low_profit | high_profit << 64),
+                Decimal(gas_price),
+                gas_table,
+                max_gas_price,
+            )
+        )
+
+    return arbs, records["path_id"]
@@ -1,7 +1,10 @@
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
+from threading import Lock
 
 from eth_abi import decode as decodeABI
 from eth_utils import to_checksum_address
+from requests.exceptions import RequestException
 from rich.progress import track
 
 from utils import CONFIG, Logger
@@ -13,6 +16,11 @@ from .ww3 import Web3
 
 log = Logger(__name__)
 
+# created on first call, when nodes are known
+_executor: ThreadPoolExecutor | None = None
+_node_slots: Queue[int] = Queue()
+_lock = Lock()
+
 
 def encode(
     contract: Contract,
@@ -78,12 +86,23 @@ def decode(encoded_results: bytes, result_types: list[str]) -> list:
     return decoded_results
 
 
-def call(call_parameters: list[tuple[str, str]], retries: int = 0) -> list[bytes]:
-    """Call `Multicall2.aggregate` function to get multiple calls in one request.
+def call(
+    call_parameters: list[tuple[str, str]],
+    retries: int = 0,
+    block_identifier: int | str | None = None,
+) -> list[bytes]:
+    """Call `Multicall2.tryAggregate` function to get multiple calls in one
+    request. Chunks of calls are requested concurrently from all nodes with
+    at most `CONFIG['multicall']['concurrency']` requests to same node and
+    respecting node poll intervals. Every chunk is read at same block, so
+    results are consistent.
 
     Args:
         call_parameters (list[tuple[str, str]]): Parameters for `aggregate` function.
         retries (int): Number of retried call.
+        block_identifier (int | str | None, optional): Block number of all
+            chunks. If not provided, latest block of next node is used when
+            there is more than one chunk. Defaults to None.
 
     Raises:
         BlockchainError: If ``retries`` reaches maximum retries.
@@ -102,133 +121,117 @@ def call(call_parameters: list[tuple[str, str]], retries: int = 0) -> list[bytes
     if retries:
         log.info(f"'{__name__}.call' retry: {retries}")
 
-    # getting chunk size
-    chunks_num, remainder = divmod(len(call_parameters), max_size)
-    if remainder != 0:
-        chunks_num += 1
-
     # spliting params
-    splitted_params, first_idx, last_idx = [], 0, max_size
-    for _ in range(chunks_num):
-        splitted_params.append(call_parameters[first_idx:last_idx])
-        first_idx = last_idx
-        last_idx += max_size
-
-    # if len(splitted_params) == 1 or len(w3.nodes) == 1:
-    #     chunked_results, retry_params, retry_idxs = _call_one(splitted_params, w3)
-
-    # else:
-    #     chunked_results, retry_params, retry_idxs = _call_many(splitted_params, w3)
-    chunked_results, retry_params, retry_idxs = _call_one(splitted_params, w3)
+    splitted_params = [
+        call_parameters[i : i + max_size]
+        for i in range(0, len(call_parameters), max_size)
+    ]
+
+    # chunks from different nodes could read different blocks
+    if block_identifier is None:
+        block_identifier = "latest"
+        if len(splitted_params) > 1:
+            block_identifier = w3.block_number
+
+    chunked_results = _call_chunks(splitted_params, w3, block_identifier)
+
+    # retrying only failed calls at same block
+    retry_params, retry_idxs = [], []
+    for i0, results in enumerate(chunked_results):
+        for i1, (success, res) in enumerate(results):
+            if not success or not res:
+                retry_params.append(splitted_params[i0][i1])
+                retry_idxs.append((i0, i1))
 
-    # retrying
     if retry_idxs:
-        retried_results = call(retry_params, retries + 1)
+        retried_results = call(retry_params, retries + 1, block_identifier)
         for (i0, i1), res in zip(retry_idxs, retried_results, strict=True):
-            chunked_results[i0][i1] = res
+            chunked_results[i0][i1] = (True, res)
 
     # flattening results
-    results = []
-    for chunk_result in chunked_results:
-        results.extend(chunk_result)
+    return [res for results in chunked_results for _, res in results]
+
+
+def _get_node_slots(w3: Web3) -> Queue[int]:
+    """Create queue with index of every node as many times as there can be
+    concurrent requests to it. Nodes are in order of `Web3.nodes`: sync
+    node, main node and other nodes."""
+    concurrency = CONFIG["multicall"]["concurrency"]
+    limits = [concurrency["sync"], concurrency["main"]]
+    limits += [concurrency["other"]] * (len(w3.nodes) - 2)
+
+    # nodes are interleaved, so single chunk is requested from first node
+    slots: Queue[int] = Queue()
+    for i in range(max(limits)):
+        for node_idx, limit in enumerate(limits):
+            if i < limit:
+                slots.put(node_idx)
+
+    return slots
 
-    return results
 
+def _get_executor(w3: Web3) -> tuple[ThreadPoolExecutor, Queue[int]]:
+    """Get thread pool with thread for every node slot and node slots."""
+    global _executor, _node_slots
 
-def _call_one(
-    splitted_params: list[list[tuple[str, str]]], w3: Web3
-) -> tuple[
-    list[list[tuple[bool, bytes]]], list[tuple[str, str]], list[tuple[int, int]]
-]:
-    call_results, retry_params, retry_idxs = [], [], []
+    with _lock:
+        if _executor is None:
+            _node_slots = _get_node_slots(w3)
+            _executor = ThreadPoolExecutor(_node_slots.qsize(), "Multicall")
 
-    for params in track(
-        splitted_params,
+        return _executor, _node_slots
+
+
+def _poll_node(w3: Web3, node_idx: int) -> None:
+    """Respect poll interval of sync and main node, same as their accessors."""
+    if node_idx == 0:
+        w3.sync_poll()
+    elif node_idx == 1:
+        w3.local_poll()
+
+
+def _call_chunk(
+    params: list[tuple[str, str]], w3: Web3, block_identifier: int | str
+) -> list[tuple[bool, bytes]]:
+    """Call chunk using free node slot, failed chunk fails all its calls."""
+    _, node_slots = _get_executor(w3)
+    node_idx = node_slots.get()
+    try:
+        _poll_node(w3, node_idx)
+        return (
+            w3.multicalls[node_idx]
+            .functions.tryAggregate(False, params)
+            .call(block_identifier=block_identifier)
+        )
+    except (ValueError, RequestException) as error:
+        log.error(error)
+        return [(False, b"")] * len(params)
+    finally:
+        node_slots.put(node_idx)
+
+
+def _call_chunks(
+    splitted_params: list[list[tuple[str, str]]],
+    w3: Web3,
+    block_identifier: int | str,
+) -> list[list[tuple[bool, bytes]]]:
+    executor, _ = _get_executor(w3)
+    futures = {
+        executor.submit(_call_chunk, params, w3, block_identifier): i
+        for i, params in enumerate(splitted_params)
+    }
+
+    chunked_results: list[list[tuple[bool, bytes]]] = [[]] * len(futures)
+    for future in track(
+        as_completed(futures),
         description="Downloading data using Multicall",
+        total=len(futures),
         transient=True,
+        disable=len(futures) == 1,
     ):
-        try:
-            call_results.append(
-                w3.multicall.functions.tryAggregate(False, params).call()
-            )
-
-        except ValueError as error:
-            log.error(error)
-            call_results.append([(False, b"")] * len(params))
-
-    chunked_results = []
-    # validating results
-    for i0, results in track(
-        enumerate(call_results),
-        description="Validating results",
-        total=len(call_results),
-        transient=True,
-    ):
-        results_chunk = []
-        for i1, (success, res) in enumerate(results):
-            if not success or not res:
-                retry_params.append(splitted_params[i0][i1])
-                retry_idxs.append((i0, i1))
+        chunked_results[futures[future]] = list(future.result())
 
-            results_chunk.append(res)
-
-        chunked_results.append(results_chunk)
-
-    return chunked_results, retry_params, retry_idxs
-
-
-def _call_many(
-    splitted_params: list[list[tuple[str, str]]], w3: Web3
-) -> tuple[
-    list[list[tuple[bool, bytes]]], list[tuple[str, str]], list[tuple[int, int]]
-]:
-    with ThreadPoolExecutor() as executor:
-        # submitting for execution
-        futures: list[Future] = []  # type: ignore
-
-        # for params in splitted_params:
-        for params in track(
-            splitted_params,
-            description="Downloading data using Multicall",
-            transient=True,
-        ):
-            future = executor.submit(
-                w3.multicall.functions.tryAggregate(False, params).call
-            )
-            futures.append(future)
-
-        # getting chunked results
-        chunked_results, retry_params, retry_idxs = [], [], []
-        # for i0, future in enumerate(futures):
-        for i0, future in track(
-            enumerate(futures),
-            description="Unpacking Multicall results",
-            total=len(futures),
-            transient=True,
-        ):
-            try:
-                future_result = future.result()
-            except ValueError as error:
-                log.error(error)
-                future_result = [(False, b"") for _ in range(len(splitted_params[i0]))]
-
-            chunk_result = []
-            for i1, (success, res) in enumerate(future_result):
-                # validating results
-                if not success or not res:
-                    # logging
-                    address, encoded_call = splitted_params[i0][i1]
-                    # log.error(f"contract({address}) call({encoded_call}) returned 0 bytes")
-
-                    # adding for retry
-                    retry_params.append((address, encoded_call))
-                    retry_idxs.append((i0, i1))
-
-                chunk_result.append(res)
-
-            chunked_results.append(chunk_result)
-
-    return chunked_results, retry_params, retry_idxs
+    return chunked_results
 
 
 def try_aggregate(
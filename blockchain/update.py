@@ -12,11 +12,13 @@ from .ww3 import Web3
 log = Logger(__name__)
 
 
-def update_pools(pools: Pools) -> None:
+def update_pools(pools: Pools, block_identifier: int | None = None) -> None:
     """Update reserves and fee numerators for provided ``pools``.
 
     Args:
         pools (Pools): Pools datastructure.
+        block_identifier (int | None, optional): Block number to read pools
+            at. Defaults to None.
     """
     if not pools:
         log.debug("No pools to updated.")
@@ -29,7 +31,9 @@ def update_pools(pools: Pools) -> None:
 
     log.debug("Downloading reserves and fees.")
     start = perf_counter()
-    encoded_updates = multicall.call(multicall_params)
+    encoded_updates = multicall.call(
+        multicall_params, block_identifier=block_identifier
+    )
     log.debug(f"Download completed in {timedelta(seconds=perf_counter()-start)}.")
 
     log.debug(f"Applying downloaded reserves and fees to pools.")
@@ -0,0 +1,190 @@
+import os
+from decimal import Decimal
+from time import perf_counter
+
+import numpy as np
+
+import path
+import persistance
+from processes import ProcessManager
+from utils import CONFIG, Logger, measure_time
+from utils._types import Calibration
+
+from . import processes
+from .dispatch import Dispatcher
+
+log = Logger(__name__)
+
+
+def calibrate(
+    process_pool: ProcessManager,
+    network: str,
+    path_store: path.PathStore,
+    gas_prices: tuple[Decimal, Decimal, Decimal, Decimal],
+    weth_prices: dict[str, Decimal],
+) -> Calibration:
+    """Replay search of sample of paths with shared pools using different
+    number of workers and chunk sizes and pick fastest configuration. Fewer
+    workers are preferred when they are within tolerance of fastest.
+
+    Note:
+        Number of workers is limited by ``process_pool``, so it should have
+        as many processes as can be used.
+
+    Args:
+        process_pool (ProcessManager): Process pool with shared pools and paths.
+        network (str): Network name.
+        path_store (path.PathStore): Paths.
+        gas_prices (tuple[Decimal, Decimal, Decimal, Decimal]): Minimum, low,
+            medium and maximum gas price.
+        weth_prices (dict[str, Decimal]): Token to price mapping.
+
+    Returns:
+        Calibration: Calibration.
+    """
+    conf = CONFIG["multiprocessing"]["calibration"]
+    log_str = measure_time("Calibrated {} in {}.")
+
+    path_ids = np.flatnonzero(path_store.alive).astype(np.int32)
+    if len(path_ids) > conf["sample"]:
+        rng = np.random.default_rng(0)
+        path_ids = np.sort(rng.choice(path_ids, conf["sample"], replace=False))
+
+    # nothing is written to reserves table while calibrating
+    search_args = (
+        processes.TABLES[network].version,
+        gas_prices,
+        weth_prices,
+        network,
+        None,
+    )
+
+    # elapsed and busy times of used workers of every run
+    runs: dict[tuple[int, int], list[tuple[float, list[float]]]] = {}  # type: ignore
+    for workers in _worker_counts(process_pool.count):
+        for chunk_size in conf["chunk_sizes"]:
+            run = runs[workers, chunk_size] = []
+            for _ in range(conf["repeats"]):
+                process_pool.pop_busy_times()
+                start = perf_counter()
+                processes._search_parallel(
+                    process_pool,
+                    workers,
+                    chunk_size,
+                    search_args,
+                    path_ids,
+                    path_store.warm_starts[path_ids],
+                )
+                elapsed = perf_counter() - start
+                run.append((elapsed, process_pool.pop_busy_times()[:workers]))
+
+            log.debug(
+                f"Searched {len(path_ids):,} paths with {workers} workers in "
+                f"chunks of {chunk_size} in {min(elapsed for elapsed, _ in run):.3f}s."
+            )
+
+    timings = [
+        (workers, chunk_size, min(elapsed for elapsed, _ in run))
+        for (workers, chunk_size), run in runs.items()
+    ]
+
+    # fewest workers, then biggest chunks within tolerance of fastest
+    fastest = min(seconds for *_, seconds in timings)
+    workers, chunk_size, _ = min(
+        (
+            timing
+            for timing in timings
+            if timing[2] <= fastest * (1 + conf["tolerance"])
+        ),
+        key=lambda timing: (timing[0], -timing[1]),
+    )
+
+    # costs of picked configuration are measured same as after real search
+    dispatcher = Dispatcher(workers, chunk_size)
+    for elapsed, busy_times in runs[workers, chunk_size]:
+        dispatcher.record_parallel(len(path_ids), elapsed, busy_times)
+
+    calibration: Calibration = {
+        "key": _calibration_key(process_pool.count),
+        "path_count": len(path_store),
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "path_cost": dispatcher.path_cost,
+        "worker_cost": dispatcher.worker_cost,
+        "timings": timings,
+    }
+    log.info(log_str(dispatcher))
+    return calibration
+
+
+def get_saved_calibration(
+    path_count: int, max_workers: int | None = None
+) -> Calibration | None:
+    """Get saved calibration if it was calibrated on same machine and config
+    and with similar number of paths.
+
+    Args:
+        path_count (int): Number of paths.
+        max_workers (int | None, optional): Maximum number of workers.
+            Defaults to `CONFIG['multiprocessing']['workers']`.
+
+    Returns:
+        Calibration | None: Calibration or `None` if it has to be calibrated.
+    """
+    # config can be changed after import
+    if max_workers is None:
+        max_workers = CONFIG["multiprocessing"]["workers"]
+
+    calibration = persistance.load_calibration()
+    if calibration is None or calibration["key"] != _calibration_key(max_workers):
+        return None
+
+    ratio = path_count / max(calibration["path_count"], 1)
+    max_ratio = CONFIG["multiprocessing"]["calibration"]["max_path_ratio"]
+    if not 1 / max_ratio <= ratio <= max_ratio:
+        return None
+
+    return calibration
+
+
+def apply_calibration(
+    network: str, calibration: Calibration, process_pool: ProcessManager
+) -> None:
+    """Search with calibrated number of workers, chunk size and costs.
+
+    Args:
+        network (str): Network name.
+        calibration (Calibration): Calibration.
+        process_pool (ProcessManager): Process pool used for searching.
+    """
+    processes.DISPATCHERS[network] = Dispatcher(
+        min(calibration["workers"], process_pool.count),
+        calibration["chunk_size"],
+        calibration["path_cost"],
+        calibration["worker_cost"],
+    )
+    log.info(
+        f"Using {calibration['workers']} workers and chunks of "
+        f"{calibration['chunk_size']} paths."
+    )
+
+
+def _worker_counts(max_workers: int) -> list[int]:
+    """Powers of two and ``max_workers``."""
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+
+    return counts + [max_workers]
+
+
+def _calibration_key(max_workers: int) -> dict[str, int]:
+    """Calibration depends on machine, searched path length and number of
+    workers it was choosing from."""
+    return {
+        "cpus": os.cpu_count() or 1,
+        "max_workers": max_workers,
+        "length": CONFIG["paths"]["length"],
+    }
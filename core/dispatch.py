@@ -0,0 +1,115 @@
+from math import sqrt
+
+from utils import CONFIG
+
+
+class Dispatcher:
+    """Choose where candidate paths of a block are searched. Work is
+    estimated from number of paths: small blocks are searched in main
+    process, bigger ones by as many workers as pays off.
+
+    Searching with ``k`` workers is estimated as ``work / k + k * worker_cost``,
+    so using more workers pays off only while dispatch overhead is smaller
+    than saved work. Costs are updated after every search with exponential
+    moving average, so crossover points calibrate themselves.
+
+    Args:
+        workers (int | None, optional): Number of worker processes. Defaults
+            to `CONFIG['multiprocessing']['workers']`.
+        chunk_size (int | None, optional): Number of paths in chunk claimed by
+            idle worker. Defaults to `CONFIG['multiprocessing']['chunk_size']`.
+        path_cost (float | None, optional): Initial seconds of searching one
+            path. Defaults to `path_cost` of dispatch config.
+        worker_cost (float | None, optional): Initial seconds of dispatch
+            overhead per worker. Defaults to `worker_cost` of dispatch config.
+        smoothing (float | None, optional): Weight of last measurement.
+            Defaults to `smoothing` of dispatch config.
+
+    Attributes:
+        workers (int): Number of worker processes.
+        chunk_size (int): Number of paths in chunk claimed by idle worker.
+        path_cost (float): Seconds of searching one path.
+        worker_cost (float): Seconds of dispatch overhead per worker.
+        smoothing (float): Weight of last measurement.
+    """
+
+    __slots__ = ("workers", "chunk_size", "path_cost", "worker_cost", "smoothing")
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        path_cost: float | None = None,
+        worker_cost: float | None = None,
+        smoothing: float | None = None,
+    ) -> None:
+        # config can be changed after import
+        conf = CONFIG["multiprocessing"]
+        dispatch = conf["dispatch"]
+
+        self.workers = conf["workers"] if workers is None else workers
+        self.chunk_size = conf["chunk_size"] if chunk_size is None else chunk_size
+        self.path_cost = dispatch["path_cost"] if path_cost is None else path_cost
+        self.worker_cost = (
+            dispatch["worker_cost"] if worker_cost is None else worker_cost
+        )
+        self.smoothing = dispatch["smoothing"] if smoothing is None else smoothing
+
+    def plan(self, path_count: int) -> int:
+        """Get number of workers for searching ``path_count`` paths.
+
+        Args:
+            path_count (int): Number of candidate paths.
+
+        Returns:
+            int: Number of workers, `0` if paths are searched in main process.
+        """
+        work = path_count * self.path_cost
+
+        # minimum of work / k + k * worker_cost
+        workers = round(sqrt(work / self.worker_cost)) if self.worker_cost else 0
+        workers = min(max(workers, 2), self.workers)
+
+        if work <= work / workers + workers * self.worker_cost:
+            return 0
+
+        return workers
+
+    def record_inline(self, path_count: int, elapsed: float) -> None:
+        """Update path cost with search in main process.
+
+        Args:
+            path_count (int): Number of searched paths.
+            elapsed (float): Seconds of searching.
+        """
+        if path_count:
+            self.path_cost = self._smooth(self.path_cost, elapsed / path_count)
+
+    def record_parallel(
+        self, path_count: int, elapsed: float, busy_times: list[float]
+    ) -> None:
+        """Update path and worker cost with search in worker processes.
+
+        Args:
+            path_count (int): Number of searched paths.
+            elapsed (float): Seconds of searching, including dispatch.
+            busy_times (list[float]): Busy time of used workers.
+        """
+        if not path_count or not busy_times:
+            return
+
+        self.path_cost = self._smooth(self.path_cost, sum(busy_times) / path_count)
+
+        # time not spent by slowest worker is overhead
+        overhead = max(elapsed - max(busy_times), 0) / len(busy_times)
+        self.worker_cost = self._smooth(self.worker_cost, overhead)
+
+    def _smooth(self, value: float, measured: float) -> float:
+        return value + self.smoothing * (measured - value)
+
+    def __repr__(self) -> str:
+        return (
+            f"Dispatcher(workers={self.workers}, chunk_size={self.chunk_size}, "
+            f"path_cost={self.path_cost:.2e}s, "
+            f"worker_cost={self.worker_cost:.2e}s)"
+        )
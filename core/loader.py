@@ -1,14 +1,19 @@
-from multiprocessing.pool import Pool as ProcessPool
+import json
+from hashlib import sha256
 from typing import Optional
 
 import blockchain
 import path
 import persistance
-from utils import CONFIG, Logger, measure_time
+from processes import ProcessManager
+from utils import CONFIG, Logger, PoolTable, measure_time
 from utils._types import BurnersData, Pools
 
 log = Logger(__name__)
 
+PATHS_VERSION = 2
+"""Version of path building. Saved paths of other versions are rebuilt."""
+
 
 def load_data() -> (
     tuple[
@@ -20,7 +25,8 @@ def load_data() -> (
         list[BurnersData],
     ]
 ):
-    """Load data from storage or download if storage is empty.
+    """Load data from storage or download if storage is empty. Pools are
+    returned as `PoolTable`.
 
     Returns:
         tuple[
@@ -59,7 +65,7 @@ def load_data() -> (
         log.info(log_str(len(pools)))
 
     return (
-        pools,
+        PoolTable(pools),
         pool_numbers,
         last_block_number,
         blacklist_paths,
@@ -146,29 +152,151 @@ def update_and_filter_pools(pools: Pools, pool_numbers: dict[str, int]) -> Pools
 
 
 def build_paths(
-    pools: Pools, blacklist_paths: set[str], process_pool: ProcessPool
-) -> dict[str, tuple[tuple[str, ...], ...]]:
+    pools: Pools, blacklist_paths: set[str], process_pool: "ProcessManager | None"
+) -> tuple[dict[str, dict[str, list[str]]], path.PathStore]:
     """Build paths.
 
     Args:
         pools (Pools): Pools
         blacklist_paths (set[str]): Blacklisted paths.
-        process_pool (ProcessPool): Porcess Pool.
+        process_pool (ProcessManager | None): Porcess Pool. Temporary one
+            is created if `None` and paths aren't in storage.
 
     Returns:
-        dict[str, tuple[tuple[str, ...], ...]]: Pool address to paths.
+        tuple[dict[str, dict[str, list[str]]], path.PathStore]: Graph and
+            paths. Paths are empty if they are searched as cycles.
     """
     log_str = measure_time("Finished building graph in {}.")
     graph = path.build_graph(pools)
     log.debug(log_str())
 
-    pool_to_paths = path.build_paths(
-        graph,
-        CONFIG["paths"]["tokens"],
-        CONFIG["paths"]["length"],
-        blacklist_paths,
-        process_pool,
-        set(CONFIG["paths"]["ignored"]),
+    # workers search cycles from their own graph
+    if CONFIG["paths"]["mode"] == "cycles":
+        return graph, path.PathStore(pools)
+
+    if CONFIG["paths"]["persist"]:
+        log_str = measure_time("Loaded {:,} paths from storage in {}.")
+        path_store = persistance.load_path_index(
+            get_paths_key(pools, blacklist_paths)
+        )
+        if path_store is not None:
+            log.info(log_str(len(path_store)))
+            return graph, path_store
+
+    # workers aren't forked yet
+    build_pool = process_pool or ProcessManager(no_singleton=True)
+    try:
+        path_store = path.build_paths(
+            pools,
+            graph,
+            CONFIG["paths"]["tokens"],
+            CONFIG["paths"]["length"],
+            blacklist_paths,
+            build_pool,
+            set(CONFIG["paths"]["ignored"]),
+        )
+    finally:
+        if process_pool is None:
+            build_pool.kill()
+    save_paths(pools, path_store, blacklist_paths)
+
+    return graph, path_store
+
+
+def get_paths_key(pools: Pools, blacklist_paths: set[tuple[str, ...]]) -> str:
+    """Get hash of everything that built paths depend on: pools, paths
+    config and blacklisted paths.
+
+    Args:
+        pools (Pools): Pools.
+        blacklist_paths (set[tuple[str, ...]]): Blacklisted paths.
+
+    Returns:
+        str: Hex digest.
+    """
+    paths_config = {
+        "version": PATHS_VERSION,
+        "length": CONFIG["paths"]["length"],
+        "tokens": CONFIG["paths"]["tokens"],
+        "ignored": sorted(CONFIG["paths"]["ignored"]),
+        "weths": sorted(CONFIG["weths"]),
+    }
+
+    hash = sha256(json.dumps(paths_config, sort_keys=True).encode())
+    for address in sorted(pools):
+        hash.update(address.encode())
+    for blacklist_path in sorted(blacklist_paths):
+        hash.update("-".join(blacklist_path).encode())
+
+    return hash.hexdigest()
+
+
+def save_paths(
+    pools: Pools, path_store: path.PathStore, blacklist_paths: set[tuple[str, ...]]
+) -> None:
+    """Save ``path_store`` to storage if paths are persisted.
+
+    Args:
+        pools (Pools): Pools.
+        path_store (path.PathStore): Paths.
+        blacklist_paths (set[tuple[str, ...]]): Blacklisted paths.
+    """
+    if not CONFIG["paths"]["persist"] or CONFIG["paths"]["mode"] == "cycles":
+        return
+
+    log_str = measure_time("Saved {:,} paths in {}.")
+    persistance.save_path_index(get_paths_key(pools, blacklist_paths), path_store)
+    log.debug(log_str(len(path_store)))
+
+
+def update_paths(
+    pools: Pools,
+    graph: dict[str, dict[str, list[str]]],
+    path_store: path.PathStore,
+    added_pools: Pools,
+    removed_pools: Pools,
+    blacklist_paths: set[tuple[str, ...]],
+) -> list[tuple[str, ...]]:
+    """Update ``graph`` and ``path_store`` with added and removed pools.
+    Only paths that go through ``added_pools`` are built.
+
+    Note:
+        Dead paths are dropped, so workers have to update their copy of
+        ``path_store`` with `processes.update_paths` to keep same path ids.
+
+    Args:
+        pools (Pools): Pools.
+        graph (dict[str, dict[str, list[str]]]): Graph.
+        path_store (path.PathStore): Paths.
+        added_pools (Pools): Added pools.
+        removed_pools (Pools): Removed pools.
+        blacklist_paths (set[tuple[str, ...]]): Blacklisted paths.
+
+    Returns:
+        list[tuple[str, ...]]: New paths.
+    """
+    path.remove_from_graph(graph, removed_pools)
+    path.add_to_graph(graph, added_pools)
+    removed_count = path_store.remove_pools(removed_pools)
+
+    new_paths = []
+    if CONFIG["paths"]["mode"] != "cycles" and added_pools:
+        new_paths = path.build_new_paths(
+            graph,
+            CONFIG["paths"]["tokens"],
+            CONFIG["paths"]["length"],
+            blacklist_paths,
+            set(CONFIG["paths"]["ignored"]),
+            added_pools,
+        )
+        path_store.add_paths(pools, new_paths)
+    path_store.compact()
+
+    save_paths(pools, path_store, blacklist_paths)
+
+    log.info(
+        f"Added {len(added_pools):,} pools with {len(new_paths):,} paths and removed "
+        f"{len(removed_pools):,} pools with {removed_count:,} paths."
     )
 
-    return pool_to_paths
+    return new_paths
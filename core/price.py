@@ -1,6 +1,7 @@
 from copy import deepcopy
 from decimal import Decimal
 from threading import Lock, Thread
+from time import sleep
 from typing import Optional
 
 import persistance
@@ -159,6 +160,24 @@ class PricePollInterval:
                 self._max_gas_price,
             )
 
+    def wait_gas_prices(self) -> tuple[Decimal, Decimal, Decimal, Decimal]:
+        """Wait for first poll and get gas prices.
+
+        Raises:
+            PricePollNotRunning: If polling isn't running.
+
+        Returns:
+            tuple[Decimal, Decimal, Decimal, Decimal]: Minumum, low, medium and
+                maximum gas prices.
+        """
+        while True:
+            try:
+                return self.gas_prices
+            except PricePollNotRunning:
+                if not self.is_running:
+                    raise
+                sleep(0.1)
+
     def __get_gas_params(self):
         """Poll ETH and gas price on predefined interval.
         Intended to be ran at seperate thread.
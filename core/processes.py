@@ -1,73 +1,96 @@
-import sys
-from array import array
-from copy import copy
-from ctypes import c_ulonglong
+import gc
 from decimal import Decimal
-from math import ceil
-from multiprocessing import Manager
-from multiprocessing.managers import SyncManager, ValueProxy
-from multiprocessing.pool import Pool
+from multiprocessing import resource_tracker
 from multiprocessing.process import current_process
-from multiprocessing.synchronize import Lock
-from random import randrange
 from threading import current_thread
+from time import perf_counter, time
+
+import numpy as np
 
 import arbitrage
 import path
+from arbitrage.batch import screen_path_ids
+from arbitrage.bounds import update_edge_weights
+from arbitrage.calculator import find_candidates
+from arbitrage.records import pack_records, unpack_records
 from path.blacklist import remove_from_paths
-from utils import CONFIG, Logger, measure_time, str_obj
-from utils._types import Pools
+from processes import ProcessManager
+from utils import CONFIG, Logger, PoolTable, measure_time
+from utils._types import EdgeWeights, Pools
 from utils.datastructures import Arbitrage
 
+from .dispatch import Dispatcher
+from .reserves import ReservesTable
+
 ID: int = 0
 POOLS: dict[str, Pools] = {}
-PATHS: dict[str, dict[str, tuple[tuple[str, ...], ...]]] = {}
-LOCK: Lock
+PATHS: dict[str, path.PathStore] = {}
+WEIGHTS: dict[str, EdgeWeights] = {}
+GRAPHS: dict[str, dict[str, dict[str, list[str]]]] = {}
+TABLES: dict[str, ReservesTable] = {}
+VERSIONS: dict[str, int] = {}
+SEARCH_ARGS: dict[str, tuple] = {}
+CYCLES: dict[str, list[tuple[str, ...]]] = {}
+DISPATCHERS: dict[str, Dispatcher] = {}
 
 
 log = Logger(__name__)
 
 
-def init_process(counter: ValueProxy, lock: Lock) -> None:
-    with lock:
-        global LOCK, ID
-        LOCK = lock
+def init_process(num: int) -> None:
+    global ID
 
-        class NoTraceback:
-            def write(*args):
-                pass
+    class NoTraceback:
+        def write(*args):
+            pass
 
-        # sys.stderr = NoTraceback()
+    # sys.stderr = NoTraceback()
 
-        num = counter.value
-        ID = num
+    ID = num
 
-        current_process().name = f"Worker-{num}"
-        current_thread().name = f"MainThread"
+    # tables inherited from main process are unlinked only by main process
+    for table in TABLES.values():
+        table.owner = False
 
-        counter.value += 1
+    current_process().name = f"Worker-{num}"
+    current_thread().name = f"MainThread"
 
-        log.debug(f"[default b]{current_process().name}[/] initiated.")
+    log.debug(f"[default b]{current_process().name}[/] initiated.")
 
 
-def _share_pools(network: str, pools: Pools, finish_arr: array) -> None:
-    global POOLS
+def _share_pools(network: str, pools: Pools, table: ReservesTable) -> None:
     try:
         del POOLS[network]
     except KeyError:
         pass
+    # calculations read reserves on every hop, so workers use dictionaries
+    pools = _to_int_pools(pools)
     POOLS[network] = pools
+    _set_table(network, table)
+    VERSIONS[network] = table.version
+    WEIGHTS[network] = {}
+    update_edge_weights(WEIGHTS[network], pools)
+    if CONFIG["paths"]["mode"] == "cycles":
+        GRAPHS[network] = path.build_graph(pools)
     log.debug(f"Pools shared for {network}.")
 
-    finish_arr[ID - 1] = 1
-    while not all(finish_arr):
-        continue
 
+def _to_int_pools(pools: Pools) -> Pools:
+    """Copy ``pools`` with `int` reserves and fee numerators, same as
+    reserves table reads them, so exact calculator doesn't convert them."""
+    if isinstance(pools, PoolTable):
+        return pools.to_pools()
 
-def _share_paths(
-    network: str, paths: dict[str, tuple[tuple[str, ...], ...]], finish_arr: array
-) -> None:
-    global PATHS
+    return {
+        address: {
+            key: value if isinstance(value, str) else int(value)
+            for key, value in pool.items()
+        }
+        for address, pool in pools.items()
+    }
+
+
+def _share_paths(network: str, paths: path.PathStore) -> None:
     try:
         del PATHS[network]
     except KeyError:
@@ -75,76 +98,141 @@ def _share_paths(
     PATHS[network] = paths
     log.debug(f"Paths shered for {network}.")
 
-    finish_arr[ID - 1] = 1
-    while not all(finish_arr):
-        continue
+
+def _inline_search() -> bool:
+    """Small blocks can be searched in main process, so it keeps its own
+    copy of worker state."""
+    return (
+        CONFIG["multiprocessing"]["dispatch"]["adaptive"]
+        and CONFIG["paths"]["mode"] != "cycles"
+    )
 
 
 def share_paths(
-    process_manager: SyncManager,
-    process_pool: Pool,
-    network: str,
-    paths: dict[str, tuple[tuple[str, ...], ...]],
+    process_pool: ProcessManager, network: str, paths: path.PathStore
 ) -> None:
     log_str = measure_time("{:,} paths exported to workers in {}.")
-
-    workers = CONFIG["multiprocessing"]["workers"]
-    finish_arr = process_manager.Array("i", [0] * workers)
-    for _ in process_pool.starmap(
-        _share_paths,
-        [(network, paths, finish_arr) for _ in range(workers)],
-    ):
-        pass
-    # PATHS[network] = paths
-    log.info(log_str(sum([len(_paths) for _paths in paths.values()])))
+    process_pool.broadcast(_share_paths, network, paths)
+    if _inline_search():
+        _share_paths(network, paths)
+    log.info(log_str(len(paths)))
 
 
-def share_pools(
-    process_manager: SyncManager, process_pool: Pool, network: str, pools: Pools
-) -> None:
+def share_pools(process_pool: ProcessManager, network: str, pools: Pools) -> None:
     log_str = measure_time("{:,} pools exported to workers in {}.")
 
-    workers = CONFIG["multiprocessing"]["workers"]
-    finish_arr = process_manager.Array("i", [0] * workers)
-    for _ in process_pool.starmap(
-        _share_pools,
-        [(network, pools, finish_arr) for _ in range(workers)],
-    ):
+    try:
+        TABLES.pop(network).close()
+    except KeyError:
         pass
-    # POOLS[network] = pools
+    table = TABLES[network] = ReservesTable(pools)
+
+    process_pool.broadcast(_share_pools, network, pools, table)
+    if _inline_search():
+        _share_pools(network, pools, table)
     log.info(log_str(len(pools)))
 
 
-def _update_pools(new_pools: Pools, network: str, finished_arr: array) -> int:
+def _update_paths(
+    network: str,
+    added_pools: Pools,
+    removed_pools: list[str],
+    new_paths: list[tuple[str, ...]],
+    table: ReservesTable,
+) -> None:
+    _update_pools(network, added_pools, removed_pools, table)
+
+    # same steps as `loader.update_paths`, so path ids stay same as in main
+    paths = PATHS[network]
+    paths.remove_pools(removed_pools)
+    paths.add_paths(POOLS[network], new_paths)
+    paths.compact()
+
+
+def _update_pools(
+    network: str, added_pools: Pools, removed_pools: list[str], table: ReservesTable
+) -> None:
+    _set_table(network, table)
+    pools = POOLS[network]
+    removed = {address: pools.pop(address) for address in removed_pools}
+    added_pools = _to_int_pools(added_pools)
+    pools.update(added_pools)
+
+    for address in removed_pools:
+        del WEIGHTS[network][address]
+    update_edge_weights(WEIGHTS[network], added_pools)
+
     try:
-        POOLS[network].update(new_pools)
+        graph = GRAPHS[network]
     except KeyError:
-        POOLS[network] = new_pools
+        pass
+    else:
+        path.remove_from_graph(graph, removed)
+        path.add_to_graph(graph, added_pools)
+
 
-    finished_arr[ID - 1] = 1
-    while not all(finished_arr):
-        continue
+def update_paths(
+    process_pool: ProcessManager,
+    network: str,
+    added_pools: Pools,
+    removed_pools: list[str],
+    new_paths: list[tuple[str, ...]],
+) -> None:
+    log_str = measure_time("{:,} new paths exported to workers in {}.")
 
-    return ID
+    # rows of removed pools are reused by added pools
+    table = TABLES[network]
+    table.remove_pools(removed_pools)
+    table.add_pools(added_pools)
 
+    process_pool.broadcast(
+        _update_paths, network, added_pools, removed_pools, new_paths, table
+    )
+    # paths of main process are already updated by loader
+    if _inline_search():
+        _update_pools(network, added_pools, removed_pools, table)
+    log.info(log_str(len(new_paths)))
 
-def update_pools(
-    process_manager: SyncManager, process_pool: Pool, new_pools: Pools, network: str
-) -> None:
-    workers = CONFIG["multiprocessing"]["workers"]
-    finished_arr = process_manager.Array("i", [0] * workers)
 
-    ids = {id: False for id in range(1, workers + 1)}
+def write_reserves(network: str, pools: Pools) -> int:
+    """Write reserves of changed ``pools`` to shared reserves table, which
+    workers read before searching.
 
-    for id in process_pool.starmap(
-        _update_pools, [(new_pools, network, finished_arr) for _ in range(workers)]
-    ):
-        if ids[id]:
-            log.error("ID {id} already updated pools.")
-        ids[id] = True
+    Args:
+        network (str): Network name.
+        pools (Pools): Changed pools.
 
-    if not all(ids.values()):
-        log.error(f"Not all workers updated: {str_obj(ids, True)}")
+    Returns:
+        int: Table version, that workers have to read.
+    """
+    return TABLES[network].write(pools)
+
+
+def close_reserves() -> None:
+    """Close and unlink shared reserves tables."""
+    for network in list(TABLES):
+        TABLES.pop(network).close()
+
+
+def _set_table(network: str, table: ReservesTable) -> None:
+    old_table = TABLES.pop(network, None)
+    if old_table is not None and old_table is not table:
+        old_table.close()
+    TABLES[network] = table
+
+
+def _read_reserves(network: str, version: int) -> Pools:
+    """Update pools of worker with reserves written after last read."""
+    table = TABLES[network]
+
+    # reserves are written before search is sent to workers
+    if table.version < version:
+        raise RuntimeError(
+            f"Reserves table version {table.version} is older than {version}."
+        )
+
+    changed_pools, VERSIONS[network] = table.read(POOLS[network], VERSIONS[network])
+    return changed_pools
 
 
 def get_updated_pools(network: str, changed_pools: Pools) -> Pools:
@@ -152,142 +240,328 @@ def get_updated_pools(network: str, changed_pools: Pools) -> Pools:
     return POOLS[network]
 
 
-def create_process_pool() -> tuple[SyncManager, Pool]:
-    manager: SyncManager = Manager()
-    counter = manager.Value("i", 1)
-    lock = manager.Lock()
+def create_process_pool(workers: int | None = None) -> ProcessManager:
+    # config can be changed after import
+    if workers is None:
+        workers = CONFIG["multiprocessing"]["workers"]
 
-    process_pool = manager.Pool(
-        CONFIG["multiprocessing"]["workers"], init_process, [counter, lock]
-    )
+    # forked processes inherit resource tracker of main process, so shared
+    # memory attached in workers isn't unlinked when they exit
+    resource_tracker.ensure_running()
 
-    with lock:
-        return manager, process_pool
+    return ProcessManager(workers, init_process)
+
+
+def fork_process_pool(
+    network: str,
+    pools: Pools,
+    path_store: path.PathStore,
+    workers: int | None = None,
+) -> ProcessManager:
+    """Fork worker processes after pools and paths are loaded, so workers
+    inherit them copy-on-write instead of unpickling their own copies. Only
+    reserves table is shared explicitly.
+
+    Args:
+        network (str): Network name.
+        pools (Pools): Pools datastructure.
+        path_store (path.PathStore): Paths.
+        workers (int | None, optional): Number of worker processes. Defaults
+            to `CONFIG['multiprocessing']['workers']`.
+
+    Returns:
+        ProcessManager: Process pool.
+    """
+    log_str = measure_time("Workers forked with {:,} pools and {:,} paths in {}.")
+
+    _share_pools(network, pools, ReservesTable(pools))
+    _share_paths(network, path_store)
+
+    # loaded objects are moved to permanent generation, so garbage collector
+    # in workers doesn't write to their pages
+    gc.freeze()
+    try:
+        process_pool = create_process_pool(workers)
+    finally:
+        gc.unfreeze()
+
+    # main process keeps only reserves table, unless it searches too
+    if not _inline_search():
+        for state in (POOLS, PATHS, WEIGHTS, GRAPHS, VERSIONS):
+            state.pop(network, None)
+
+    log.info(log_str(len(pools), len(path_store)))
+    return process_pool
 
 
 def search_arbs(
-    manager: SyncManager,
     changed_pools: Pools,
+    version: int,
     min_gas_price: Decimal,
     low_gas_price: Decimal,
     mid_gas_price: Decimal,
     max_gas_price: Decimal,
     weth_prices: dict[str, Decimal],
-    process_pool: Pool,
+    process_pool: ProcessManager,
     network: str,
+    path_store: path.PathStore,
+    passed_paths: list[tuple[str, ...]],
+    deadline: float | None,
 ) -> list[Arbitrage]:
-    workers = CONFIG["multiprocessing"]["workers"]
-
-    lock = manager.Lock()
-    last_idx = manager.Value(c_ulonglong, 0)
-
-    ids = {id: False for id in range(1, workers + 1)}
-    arbs = []
-
-    for arbs_chunk, id in process_pool.starmap(
-        _search_arbs,
-        [
-            (
-                changed_pools,
-                min_gas_price,
-                low_gas_price,
-                mid_gas_price,
-                max_gas_price,
-                weth_prices,
-                network,
-                lock,
-                last_idx,
+    if CONFIG["paths"]["mode"] == "cycles":
+        arbs = _search_cycles(
+            version,
+            (min_gas_price, low_gas_price, mid_gas_price, max_gas_price),
+            weth_prices,
+            process_pool,
+            network,
+            deadline,
+        )
+        arbs.sort(reverse=True)
+        return arbs
+
+    passed_path_ids = [
+        path_id
+        for path_id in map(path_store.find_path_id, passed_paths)
+        if path_id is not None
+    ]
+    if passed_path_ids:
+        path_store.record(np.array(passed_path_ids, dtype=np.int32), passed=True)
+
+    # hot tier first, so its chunks are claimed before deadline
+    path_ids = path_store.order_by_history(path_store.get_path_ids(changed_pools))
+    search_args = (
+        version,
+        (min_gas_price, low_gas_price, mid_gas_price, max_gas_price),
+        weth_prices,
+        network,
+        deadline,
+    )
+
+    if network not in DISPATCHERS:
+        DISPATCHERS[network] = Dispatcher(process_pool.count)
+    dispatcher = DISPATCHERS[network]
+    workers = dispatcher.plan(len(path_ids)) if _inline_search() else dispatcher.workers
+
+    # warm starts are kept by main process and sent with chunks
+    warm_starts = path_store.warm_starts[path_ids]
+
+    start = perf_counter()
+    if workers:
+        results = _search_parallel(
+            process_pool,
+            workers,
+            dispatcher.chunk_size,
+            search_args,
+            path_ids,
+            warm_starts,
+        )
+        busy_times = process_pool.pop_busy_times()[:workers]
+        dispatcher.record_parallel(len(path_ids), perf_counter() - start, busy_times)
+        log.debug(
+            f"Searched {len(path_ids):,} paths with {workers} workers, busy time "
+            f"min {min(busy_times):.3f}s, max {max(busy_times):.3f}s: "
+            + ", ".join(
+                f"{worker_id}: {busy:.3f}s"
+                for worker_id, busy in enumerate(busy_times, 1)
             )
-            for _ in range(workers)
-        ],
-    ):
-        if ids[id]:
-            log.error(f"ID {id} already used.")
-        ids[id] = True
-        arbs.extend(arbs_chunk)
+        )
+    else:
+        # dispatch would cost more than searching, workers catch up on
+        # skipped reserves when they are used next
+        _prepare_search(*search_args)
+        results = [_search_chunk((network, path_ids, warm_starts))]
+        dispatcher.record_inline(len(path_ids), perf_counter() - start)
+        log.debug(f"Searched {len(path_ids):,} paths in main process.")
+
+    for _, searched_ids, searched_warm_starts in results:
+        path_store.warm_starts[searched_ids] = searched_warm_starts
+
+    # candidates are packed records, so arbitrages are created only here
+    arbs, candidate_ids = unpack_records(
+        b"".join(records for records, *_ in results),
+        path_store,
+        min_gas_price,
+        low_gas_price,
+        mid_gas_price,
+        max_gas_price,
+        weth_prices,
+    )
+    path_store.record(candidate_ids)
+
+    arbs.sort(reverse=True)
+    return arbs
+
 
-    if not all(ids.values()):
-        log.error(f"Not all ids: {str_obj(ids, True)}")
+def _search_parallel(
+    process_pool: ProcessManager,
+    workers: int,
+    chunk_size: int,
+    search_args: tuple,
+    path_ids: np.ndarray,
+    warm_starts: np.ndarray,
+) -> list[tuple[bytes, np.ndarray, np.ndarray]]:
+    """Search ``path_ids`` in chunks of ``chunk_size`` with first ``workers``
+    processes. Chunks are sent with their ``warm_starts`` and searched path
+    ids are returned with updated warm starts."""
+    network = search_args[3]
+    process_pool.pop_busy_times()
+
+    # workers read reserves and keep arguments of search for all chunks
+    process_pool.scatter(_prepare_search, [search_args] * workers)
+
+    chunks = (
+        (
+            network,
+            path_ids[start : start + chunk_size],
+            warm_starts[start : start + chunk_size],
+        )
+        for start in range(0, len(path_ids), chunk_size)
+    )
+
+    # idle worker gets next chunk as soon as it returns previous one
+    return list(process_pool.imap_unordered(_search_chunk, chunks, processes=workers))
+
+
+def _search_cycles(
+    version: int,
+    gas_prices: tuple[Decimal, Decimal, Decimal, Decimal],
+    weth_prices: dict[str, Decimal],
+    process_pool: ProcessManager,
+    network: str,
+    deadline: float | None,
+) -> list[Arbitrage]:
+    """Seed tokens are sharded across workers, so every worker finds and
+    searches only its own cycles."""
+    process_pool.pop_busy_times()
+
+    search_args = (version, gas_prices, weth_prices, network, deadline)
+    results = process_pool.scatter(
+        _search_cycle_shard,
+        [(search_args, (i, process_pool.count)) for i in range(process_pool.count)],
+        ordered=False,
+    )
+
+    # same cycle can be found from seeds of different shards
+    arbs = list(
+        {arb.path: arb for arbs_shard in results for arb in arbs_shard}.values()
+    )
+
+    busy_times = process_pool.pop_busy_times()
+    log.debug(
+        f"Searched {process_pool.count} shards of cycles, worker busy time "
+        f"min {min(busy_times):.3f}s, max {max(busy_times):.3f}s: "
+        + ", ".join(
+            f"{worker_id}: {busy:.3f}s" for worker_id, busy in enumerate(busy_times, 1)
+        )
+    )
 
     return arbs
 
 
-def _search_arbs(
-    changed_pools: Pools,
-    min_gas_price: Decimal,
-    low_gas_price: Decimal,
-    mid_gas_price: Decimal,
-    max_gas_price: Decimal,
+def _prepare_search(
+    version: int,
+    gas_prices: tuple[Decimal, Decimal, Decimal, Decimal],
     weth_prices: dict[str, Decimal],
     network: str,
-    lock: Lock,
-    last_idx: ValueProxy,
-) -> tuple[list[Arbitrage], int]:
+    deadline: float | None,
+    shard: tuple[int, int] = (0, 1),
+) -> int:
     try:
-        POOLS[network].update(changed_pools)
+        changed_pools = _read_reserves(network, version)
+        update_edge_weights(WEIGHTS[network], changed_pools)
+        SEARCH_ARGS[network] = (*gas_prices, weth_prices, deadline)
+
+        if CONFIG["paths"]["mode"] != "cycles":
+            return 0
+
+        CYCLES[network] = path.find_cycles(
+            GRAPHS[network],
+            WEIGHTS[network],
+            changed_pools,
+            set(CONFIG["paths"]["tokens"]),
+            CONFIG["paths"]["length"],
+            set(CONFIG["paths"]["ignored"]),
+            shard,
+        )
+        return len(CYCLES[network])
+    except BaseException as error:
+        log.exception(error)
+        raise error from None
+
 
-        unique_paths = path.get_unique_paths(changed_pools, PATHS[network])
+def _search_cycle_shard(search_args: tuple, shard: tuple[int, int]) -> list[Arbitrage]:
+    """Find cycles from seed tokens of ``shard`` and search them."""
+    cycle_count = _prepare_search(*search_args, shard)
+    return _search_chunk((search_args[3], (0, cycle_count), None))
 
-        workers_count = CONFIG["multiprocessing"]["workers"]
 
-        chunk_size = ceil(len(unique_paths) / workers_count)
+def _search_chunk(
+    args: tuple[str, tuple[int, int] | np.ndarray, np.ndarray | None],
+) -> list[Arbitrage] | tuple[bytes, np.ndarray, np.ndarray]:
+    """Search chunk of cycles or path ids with their warm starts. Candidates
+    of path ids are returned as packed records with searched path ids and
+    their updated warm starts."""
+    try:
+        network, chunk, warm_starts = args
+        *gas_prices, weth_prices, deadline = SEARCH_ARGS[network]
 
-        # determin which chunk to use
-        with lock:
-            start_idx = copy(last_idx.value)
-            end_idx = start_idx + chunk_size
-            last_idx.value = end_idx
+        if isinstance(chunk, tuple):
+            # rest of chunks are skipped
+            if deadline is not None and time() > deadline:
+                return []
 
-        return (
-            arbitrage.search_for_arbitrages(
+            return arbitrage.search_for_arbitrages(
                 POOLS[network],
-                unique_paths[start_idx:end_idx],
-                min_gas_price,
-                low_gas_price,
-                mid_gas_price,
-                max_gas_price,
+                CYCLES[network][chunk[0] : chunk[1]],
+                *gas_prices,
                 weth_prices,
-            ),
-            ID,
+                WEIGHTS[network],
+                deadline=deadline,
+            )
+
+        if deadline is not None and time() > deadline:
+            return b"", chunk, warm_starts
+
+        # screening with path descriptors before decoding paths
+        path_ids = chunk
+        if CONFIG["calculator"]["screen"]:
+            path_ids = screen_path_ids(POOLS[network], PATHS[network], path_ids)
+            warm_starts = warm_starts[np.isin(chunk, path_ids, assume_unique=True)]
+
+        candidates = find_candidates(
+            POOLS[network],
+            PATHS[network].get_paths(path_ids),
+            *gas_prices,
+            weth_prices,
+            WEIGHTS[network],
+            deadline,
+            warm_starts,
         )
+        return pack_records(path_ids, candidates), path_ids, warm_starts
     except BaseException as error:
         log.exception(error)
         raise error from None
 
 
 def remove_blacklisted(
-    process_manager: SyncManager,
-    process_pool: Pool,
-    pool_to_paths: dict[str, tuple[tuple[str, ...], ...]],
+    process_pool: ProcessManager,
+    path_store: path.PathStore,
     to_remove: set[tuple[str, ...]],
     network: str,
 ) -> None:
-    workers = CONFIG["multiprocessing"]["workers"]
-    finished_arr = process_manager.Array("i", [0] * workers)
+    # workers have copy of the store, so they can remove by id
+    path_ids = remove_from_paths(path_store, to_remove)
+    if not path_ids:
+        return
 
-    tasks = [
-        process_pool.apply_async(
-            _remove_blacklisted, [to_remove, network, finished_arr]
-        )
-        for _ in range(workers)
-    ]
-
-    remove_from_paths(pool_to_paths, to_remove)
-
-    for task in tasks:
-        task.wait()
+    process_pool.broadcast(_remove_blacklisted, path_ids, network)
 
 
-def _remove_blacklisted(
-    to_remove: set[tuple[str, ...]], network: str, finished_arr: array
-) -> None:
+def _remove_blacklisted(path_ids: list[int], network: str) -> None:
     try:
         paths = PATHS[network]
     except KeyError:
         pass
     else:
-        remove_from_paths(paths, to_remove)
-
-    finished_arr[ID - 1] = 1
-    while not all(finished_arr):
-        continue
+        paths.remove_path_ids(path_ids)
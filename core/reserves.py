@@ -0,0 +1,277 @@
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter
+from typing import Any, Iterable
+
+import numpy as np
+
+from utils._types import Pools
+
+MASK_64 = 2**64 - 1
+
+# header: sequence number (odd while writing) and version of last write
+_HEADER = 2
+# row: reserve0 low, reserve0 high, reserve1 low, reserve1 high, fee numerator
+_ROW = 5
+# seconds reader retries while table is being written
+READ_TIMEOUT = 1.0
+
+
+class ReservesTable:
+    """Reserves and fee numerators of pools in shared memory indexed by pool
+    row. Main process writes changed pools and workers read them in place.
+
+    Every write increments table version and stamps written rows with it,
+    so reader gets pools changed since version it read last. Writes are
+    guarded by sequence number (seqlock): it's odd while writing and reader
+    retries if it changed during read.
+
+    Rows of removed pools are kept in free list and reused by added pools,
+    so table grows only when there are more pools than rows.
+
+    Note:
+        Reserves are `uint112`, so they are stored as low and high `uint64`.
+
+    Args:
+        pools (Pools): Pools datastructure.
+        capacity (int | None, optional): Number of rows. Defaults to twice
+            number of ``pools``.
+
+    Attributes:
+        header (np.ndarray): Sequence number and version.
+        versions (np.ndarray): Version of last write of row (`capacity`).
+        values (np.ndarray): Reserves and fee numerators (`capacity x 5`).
+        shm (SharedMemory): Shared memory block.
+        owner (bool): If table was created in this process.
+        addresses (list[str | None]): Row to pool address, `None` if row is
+            free.
+        rows (dict[str, int]): Pool address to row.
+        free (list[int]): Free rows of removed pools.
+        capacity (int): Number of rows.
+    """
+
+    # arrays are before shared memory block, so they are released first
+    __slots__ = (
+        "header",
+        "versions",
+        "values",
+        "shm",
+        "owner",
+        "addresses",
+        "rows",
+        "free",
+        "capacity",
+    )
+
+    def __init__(self, pools: Pools, capacity: int | None = None) -> None:
+        self.capacity = capacity or max(len(pools) * 2, 1)
+        self.shm = SharedMemory(create=True, size=self._size(self.capacity))
+        self.owner = True
+        self._map()
+        self.header[:] = 0
+
+        self.addresses: list[str | None] = []  # type: ignore
+        self.rows: dict[str, int] = {}  # type: ignore
+        self.free: list[int] = []  # type: ignore
+        self.add_pools(pools)
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "name": self.shm.name,
+            "capacity": self.capacity,
+            "addresses": self.addresses,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # workers share resource tracker with main process, so attaching
+        # doesn't make it unlink shared memory when they exit
+        self.shm = SharedMemory(state["name"])
+        self.owner = False
+        self.capacity = state["capacity"]
+        self.addresses = state["addresses"]
+        self.rows = {
+            address: row
+            for row, address in enumerate(self.addresses)
+            if address is not None
+        }
+        # only main process adds pools
+        self.free = []
+        self._map()
+
+    @staticmethod
+    def _size(capacity: int) -> int:
+        return (_HEADER + capacity + capacity * _ROW) * 8
+
+    def _map(self) -> None:
+        """Map arrays to shared memory block."""
+        buffer = self.shm.buf
+        self.header = np.ndarray((_HEADER,), np.uint64, buffer)
+        self.versions = np.ndarray((self.capacity,), np.uint64, buffer, _HEADER * 8)
+        self.values = np.ndarray(
+            (self.capacity, _ROW), np.uint64, buffer, (_HEADER + self.capacity) * 8
+        )
+
+    @property
+    def version(self) -> int:
+        return int(self.header[1])
+
+    def add_pools(self, pools: Pools) -> bool:
+        """Add rows for new ``pools`` and write them. Free rows are reused
+        first and shared memory block is replaced with twice bigger one if
+        there is not enough rows.
+
+        Args:
+            pools (Pools): Pools datastructure.
+
+        Returns:
+            bool: If shared memory block was replaced.
+        """
+        new_addresses = [address for address in pools if address not in self.rows]
+        row_count = len(self.addresses) + max(len(new_addresses) - len(self.free), 0)
+        resized = row_count > self.capacity
+
+        if resized:
+            capacity = max(self.capacity * 2, row_count)
+            old_shm, old_header = self.shm, self.header.copy()
+            old_versions, old_values = self.versions.copy(), self.values.copy()
+
+            self.capacity = capacity
+            self.shm = SharedMemory(create=True, size=self._size(capacity))
+            self._map()
+            self.header[:] = old_header
+            self.versions[: len(old_versions)] = old_versions
+            self.versions[len(old_versions) :] = 0
+            self.values[: len(old_values)] = old_values
+
+            old_shm.close()
+            old_shm.unlink()
+
+        for address in new_addresses:
+            if self.free:
+                row = self.free.pop()
+                self.addresses[row] = address
+            else:
+                row = len(self.addresses)
+                self.addresses.append(address)
+            self.rows[address] = row
+
+        self.write(pools)
+
+        return resized
+
+    def remove_pools(self, addresses: Iterable[str]) -> int:
+        """Free rows of removed pools, so they can be reused by added pools.
+        Reader skips freed rows, since their pools were removed from it too.
+
+        Args:
+            addresses (Iterable[str]): Addresses of removed pools.
+
+        Returns:
+            int: Number of freed rows.
+        """
+        freed = 0
+        for address in addresses:
+            row = self.rows.pop(address, None)
+            if row is None:
+                continue
+
+            self.addresses[row] = None
+            self.free.append(row)
+            freed += 1
+
+        return freed
+
+    def write(self, pools: Pools) -> int:
+        """Write reserves and fee numerators of ``pools``.
+
+        Args:
+            pools (Pools): Changed pools, they have to be added first.
+
+        Returns:
+            int: Version of write.
+        """
+        rows = []
+        values = []
+        for address, pool in pools.items():
+            (_, reserve0), (_, reserve1) = [
+                item for item, _ in zip(pool.items(), range(2))
+            ]
+            reserve0, reserve1 = int(reserve0), int(reserve1)
+
+            rows.append(self.rows[address])
+            values.append(
+                (
+                    reserve0 & MASK_64,
+                    reserve0 >> 64,
+                    reserve1 & MASK_64,
+                    reserve1 >> 64,
+                    int(pool["fee_numerator"]),
+                )
+            )
+
+        version = self.version + 1
+
+        self.header[0] += 1
+        if rows:
+            self.values[rows] = np.array(values, dtype=np.uint64)
+            self.versions[rows] = version
+        self.header[1] = version
+        self.header[0] += 1
+
+        return version
+
+    def read(
+        self, pools: Pools, since: int, timeout: float = READ_TIMEOUT
+    ) -> tuple[Pools, int]:
+        """Update ``pools`` in place with rows written after version ``since``.
+        Reserves and fee numerators are read as `int`.
+
+        Args:
+            pools (Pools): Pools datastructure of reader.
+            since (int): Last read version.
+            timeout (float, optional): Seconds to retry while table is being
+                written. Defaults to `READ_TIMEOUT`.
+
+        Raises:
+            TimeoutError: If table was being written for ``timeout`` seconds.
+
+        Returns:
+            tuple[Pools, int]: Changed pools and read version.
+        """
+        deadline = perf_counter() + timeout
+        while True:
+            sequence = int(self.header[0])
+            if not sequence & 1:
+                version = int(self.header[1])
+                rows = np.flatnonzero(self.versions[: len(self.addresses)] > since)
+                values = self.values[rows]
+
+                if int(self.header[0]) == sequence:
+                    break
+
+            if perf_counter() > deadline:
+                raise TimeoutError(f"Reserves table was written for {timeout}s.")
+
+        changed_pools = {}
+        for row, (low0, high0, low1, high1, fee) in zip(rows.tolist(), values.tolist()):
+            address = self.addresses[row]
+            try:
+                pool = pools[address]
+            except KeyError:
+                # removed pool or its freed row
+                continue
+
+            token0, token1 = [token for token, _ in zip(pool.keys(), range(2))]
+            pool[token0] = low0 | high0 << 64
+            pool[token1] = low1 | high1 << 64
+            pool["fee_numerator"] = fee
+            changed_pools[address] = pool
+
+        return changed_pools, version
+
+    def close(self) -> None:
+        """Close shared memory block and unlink it if it's owned."""
+        # arrays have to be released before closing shared memory
+        del self.header, self.versions, self.values
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -1,8 +1,6 @@
 import multiprocessing
 from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from multiprocessing.managers import SyncManager
-from multiprocessing.pool import Pool as ProcessPool
 from time import perf_counter, sleep, time
 
 from requests.exceptions import ConnectionError
@@ -11,7 +9,16 @@ from rich.errors import LiveError
 import arbitrage
 import blockchain
 import persistance
-from core import PricePollInterval, loader, logger, processes, sync, whitelist
+from core import (
+    PricePollInterval,
+    calibration,
+    loader,
+    logger,
+    processes,
+    sync,
+    whitelist,
+)
+from processes import ProcessManager
 from utils import (
     CONFIG,
     BlockTime,
@@ -25,14 +32,13 @@ from utils import (
 log = Logger(__name__)
 last_wait: float
 wait = CONFIG["restart"]["wait"]
+process_pool: "ProcessManager | None" = None
 
 
-def main(process_mngr: SyncManager, process_pool: ProcessPool):
-    global wait, last_wait
+def main():
+    global wait, last_wait, process_pool
 
     try:
-        thread_executor = ThreadPoolExecutor(thread_name_prefix="Thread")
-
         network = CONFIG["blockchain"]["name"]
 
         w3 = blockchain.Web3(new_singleton=True)
@@ -62,14 +68,64 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
         # blockchain.create_burners(burners, w3.account)
         # persistance.save_burners(burners)
 
-        price.start()
-
         if not CONFIG["download_pools"]:
             poll_pools()
-            processes.share_pools(process_mngr, process_pool, network, pools)
-            pool_to_paths = loader.build_paths(pools, blacklist_paths, process_pool)
-            processes.share_paths(process_mngr, process_pool, network, pool_to_paths)
+            if process_pool is None:
+                # workers inherit loaded pools and paths
+                graph, path_store = loader.build_paths(pools, blacklist_paths, None)
+                saved_calibration = calibration.get_saved_calibration(len(path_store))
+
+                # only calibrated number of workers is needed
+                workers = CONFIG["multiprocessing"]["workers"]
+                if saved_calibration:
+                    workers = saved_calibration["workers"]
+
+                # forked before any thread of main is started, threads are not
+                # copied into workers and their held locks can't deadlock them
+                process_pool = processes.fork_process_pool(
+                    network, pools, path_store, workers
+                )
+                price.start()
+            else:
+                price.start()
+                processes.share_pools(process_pool, network, pools)
+                graph, path_store = loader.build_paths(
+                    pools, blacklist_paths, process_pool
+                )
+                processes.share_paths(process_pool, network, path_store)
+                saved_calibration = calibration.get_saved_calibration(len(path_store))
+
+            if saved_calibration:
+                calibration.apply_calibration(network, saved_calibration, process_pool)
+            elif (
+                CONFIG["multiprocessing"]["calibration"]["at_startup"]
+                and CONFIG["paths"]["mode"] != "cycles"
+                # calibrating needs all workers it can choose from
+                and process_pool.count == CONFIG["multiprocessing"]["workers"]
+            ):
+                # worker count and chunk size are calibrated before first block
+                new_calibration = calibration.calibrate(
+                    process_pool,
+                    network,
+                    path_store,
+                    price.wait_gas_prices(),
+                    blockchain.get_weth_prices(),
+                )
+                persistance.save_calibration(new_calibration)
+                calibration.apply_calibration(network, new_calibration, process_pool)
             uptime.start()
+        else:
+            graph = None
+            if process_pool is None:
+                process_pool = processes.create_process_pool()
+            price.start()
+
+        thread_executor = ThreadPoolExecutor(thread_name_prefix="Thread")
+
+        # paths that passed checker in previous block
+        passed_paths: list[tuple[str, ...]] = []  # type: ignore
+        # blacklisted paths are removed from store, which is saved on timer
+        paths_changed = False
 
         # main loop
         while True:
@@ -77,6 +133,7 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
 
             # getting new pools
             if poll_pools():
+                previous_pools = pools.copy()
                 new_pools, pool_numbers = loader.get_new_pools(pool_numbers)
 
                 if new_pools:
@@ -89,19 +146,54 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
 
                 log_str = measure_time("Finished filtering pools in {}.")
                 blockchain.filter_pools(pools, pool_numbers)
+                pools.compact()
                 log.debug(log_str())
 
-                # sharing pools with workers
-                processes.share_pools(process_mngr, process_pool, network, pools)
+                if CONFIG["paths"]["incremental"] and graph is not None:
+                    # updating only paths of added and removed pools
+                    added_pools = {
+                        address: pool
+                        for address, pool in pools.items()
+                        if address not in previous_pools
+                    }
+                    removed_pools = {
+                        address: pool
+                        for address, pool in previous_pools.items()
+                        if address not in pools
+                    }
+
+                    log_str = measure_time("Finished updating paths in {}.")
+                    new_paths = loader.update_paths(
+                        pools,
+                        graph,
+                        path_store,
+                        added_pools,
+                        removed_pools,
+                        blacklist_paths,
+                    )
+                    log.debug(log_str())
 
-                log_str = measure_time("Finished building paths in {}.")
-                pool_to_paths = loader.build_paths(pools, blacklist_paths, process_pool)
-                log.debug(log_str())
+                    # sharing differences with workers
+                    processes.update_paths(
+                        process_pool,
+                        network,
+                        added_pools,
+                        list(removed_pools),
+                        new_paths,
+                    )
 
-                # sharing paths with workers
-                processes.share_paths(
-                    process_mngr, process_pool, network, pool_to_paths
-                )
+                else:
+                    # sharing pools with workers
+                    processes.share_pools(process_pool, network, pools)
+
+                    log_str = measure_time("Finished building paths in {}.")
+                    graph, path_store = loader.build_paths(
+                        pools, blacklist_paths, process_pool
+                    )
+                    log.debug(log_str())
+
+                    # sharing paths with workers
+                    processes.share_paths(process_pool, network, path_store)
 
                 persistance.save_pools(pools)
                 persistance.save_pool_numbers(pool_numbers)
@@ -119,10 +211,8 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
             if len(updated_changed_pools) != len(changed_pools):
                 # if all pools are updated
                 log_str = measure_time("All pools updated in {}.")
-                blockchain.update_pools(changed_pools)
-                processes.update_pools(
-                    process_mngr, process_pool, changed_pools, network
-                )
+                blockchain.update_pools(changed_pools, last_block)
+                processes.write_reserves(network, changed_pools)
                 persistance.save_pools(pools)
                 persistance.save_last_block(last_block)
                 save_pools()
@@ -154,18 +244,16 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
 
             # updating pools
             start = perf_counter()
-            blockchain.update_pools(to_update)
+            # reading reserves at block of applied Sync events
+            blockchain.update_pools(to_update, last_block)
             update_log = (
                 f"Finished updating pools in {timedelta(seconds=perf_counter()-start)}."
             )
             log.debug(update_log)
             end_log += update_log + "\n"
 
-            log_str = measure_time("New pools exported to workers in {}.")
-            processes.update_pools(process_mngr, process_pool, to_update, network)
-            export_log = log_str()
-            log.debug(log_str())
-            end_log += export_log + "\n"
+            # workers read changed reserves from shared memory
+            version = processes.write_reserves(network, to_update)
 
             # check if in sync
             # if last_block < sync_block:
@@ -187,10 +275,19 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
             ) = price.gas_prices
             weth_prices = blockchain.get_weth_prices()
 
+            # converting remaining block time to unix time for workers
+            deadline = None
+            if CONFIG["multiprocessing"]["deadline"]:
+                deadline = (
+                    time()
+                    + CONFIG["multiprocessing"]["deadline"]
+                    - (perf_counter() - block_start)
+                )
+
             start = perf_counter()
             raw_arbitrages = processes.search_arbs(
-                process_mngr,
                 changed_pools,
+                version,
                 min_gas_price,
                 low_gas_price,
                 mid_gas_price,
@@ -198,7 +295,17 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
                 weth_prices,
                 process_pool,
                 network,
+                path_store,
+                passed_paths,
+                deadline,
             )
+            passed_paths = []
+            # searched cycles are not filtered by blacklist in workers
+            if CONFIG["paths"]["mode"] == "cycles":
+                raw_arbitrages = [
+                    arb for arb in raw_arbitrages if arb.path not in blacklist_paths
+                ]
+
             arbitrage_s = "arbitrage" if len(raw_arbitrages) == 1 else "arbitrages"
             arb_log = f"Calculated {len(raw_arbitrages):,} potential {arbitrage_s} in {timedelta(seconds=perf_counter()-start)}."
             log.debug(arb_log)
@@ -238,6 +345,7 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
                     max_gas_price,
                     to_blacklist,
                 )
+                passed_paths = [arb.path for arb in potential_arbs]
                 check_log = f"Checked {len(raw_arbitrages):,} potential {arbitrage_s} in {timedelta(seconds=perf_counter()-start)}."
                 log.debug(check_log)
                 end_log += check_log + "\n"
@@ -301,9 +409,10 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
                         "Removed blacklisted paths in workers in {}."
                     )
                     processes.remove_blacklisted(
-                        process_mngr, process_pool, pool_to_paths, to_blacklist, network
+                        process_pool, path_store, to_blacklist, network
                     )
                     log.debug(log_str())
+                    paths_changed = True
 
                 # exit if executed
                 # if potential_arbs:
@@ -315,6 +424,9 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
             if save_pools():
                 persistance.save_pools(pools)
                 persistance.save_last_block(last_block)
+                if paths_changed:
+                    loader.save_paths(pools, path_store, blacklist_paths)
+                    paths_changed = False
 
     except (KeyboardInterrupt, SystemExit) as error:
         raise error
@@ -359,13 +471,21 @@ def main(process_mngr: SyncManager, process_pool: ProcessPool):
         sleep(wait)
 
     finally:
-        thread_executor.shutdown(True, cancel_futures=True)
+        try:
+            thread_executor.shutdown(True, cancel_futures=True)
+        except UnboundLocalError:
+            pass
         uptime.stop()
         try:
             if price.is_running:
                 price.kill()
         except UnboundLocalError:
             pass
+        try:
+            if paths_changed:
+                loader.save_paths(pools, path_store, blacklist_paths)
+        except UnboundLocalError:
+            pass
         # sync.kill()
 
 
@@ -378,20 +498,19 @@ if __name__ == "__main__":
     #     target=whitelist.main, args=[lock], name="Whitelister", daemon=True
     # ).start()
 
-    process_mngr, process_pool = processes.create_process_pool()
+    if not CONFIG["multiprocessing"]["fork_after_load"]:
+        process_pool = processes.create_process_pool()
 
     log.info("[i][b u]ARBITRAGE BOT[/] started.")
     try:
         while True:
-            main(process_mngr, process_pool)
+            main()
     except (KeyboardInterrupt, SystemExit):
         print()
     except BaseException as error:
         log.critical(error, exc_info=True)
     finally:
-        process_pool.close()
-        process_pool.join()
-        process_pool.terminate()
-        process_mngr.shutdown()
-        process_mngr.join()
+        processes.close_reserves()
+        if process_pool is not None:
+            process_pool.kill()
         log.info("[i][b u]ARBITRAGE BOT[/] stopped.")
@@ -1,3 +1,4 @@
-from .builder import build_paths
-from .graph import build_graph
-from .unique import get_unique_paths
+from .builder import build_new_paths, build_paths
+from .cycles import find_cycles
+from .graph import add_to_graph, build_graph, remove_from_graph
+from .store import PathStore
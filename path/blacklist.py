@@ -1,23 +1,18 @@
-def remove_from_paths(
-    pool_to_paths: dict[str, tuple[tuple[str, ...], ...]],
-    to_blacklist: set[tuple[str, ...]],
-) -> None:
-    updated_pool_to_paths = {}
-
-    # going through each pool withi its paths
-    for pool_address, paths in pool_to_paths.items():
+from .store import PathStore
 
-        to_remove = set()
 
-        for path in paths:
-            if path in to_blacklist:
-                # adding to_removed to be later removed from paths
-                to_remove.add(path)
+def remove_from_paths(
+    path_store: PathStore,
+    to_blacklist: set[tuple[str, ...]],
+) -> list[int]:
+    """Remove blacklisted paths from ``path_store``.
 
-        if to_remove:
-            updated_pool_to_paths[pool_address] = tuple(
-                set(paths).difference(to_remove)
-            )
+    Args:
+        path_store (PathStore): Paths.
+        to_blacklist (set[tuple[str, ...]]): Paths to remove.
 
-    # updating paths
-    pool_to_paths.update(updated_pool_to_paths)
+    Returns:
+        list[int]: Ids of removed paths. Same ids can be removed from
+            copies of ``path_store`` with `PathStore.remove_path_ids`.
+    """
+    return path_store.remove_paths(to_blacklist)
@@ -1,21 +1,26 @@
 from datetime import timedelta
-from multiprocessing.pool import AsyncResult
-from multiprocessing.pool import Pool as ProcessPool
+from itertools import chain
 from time import perf_counter
 
-from utils import CONFIG, Logger
+from processes import ProcessManager, get_state
+
+from utils import CONFIG, Logger, measure_time
+from utils._types import Pools
+
+from .store import PathStore
 
 log = Logger(__name__)
 
 
 def build_paths(
+    pools: Pools,
     graph: dict[str, dict[str, list[str]]],
     tokens: list[str],
     length: int,
     blacklist_paths: set[tuple[str, ...]],
-    process_pool: ProcessPool,
+    process_pool: ProcessManager,
     ignore_tokens: set[str],
-) -> dict[str, tuple[tuple[str, ...], ...]]:
+) -> PathStore:
     """Build all possible paths with maximum provided ``length`` that
     start and end with given ``tokens``.
 
@@ -25,46 +30,226 @@ def build_paths(
 
 
     Args:
+        pools (Pools): Pools datastructure.
         graph (dict[str, dict[str, list[str]]]): Graph datastructure.
         tokens (list[str]): List of token addresses.
         length (int): Maximum length.
         blacklist_paths (set[tuple[str, ...]]): Blacklisted paths.
-        process_pool (ProcessPool): Process pool.
+        process_pool (ProcessManager): Process pool.
         ignore_tokens (set[str]): Tokens to ignore.
 
     Returns:
-        dict[str, tuple[tuple[str, ...], ...]]: Mapping of pool address to
-            paths
+        PathStore: Paths.
     """
+    log_str = measure_time("Created {:,} paths in {:,} shards in {}.")
+
     # normalizing length value
     compare_length = length * 2 - 1
 
-    # pool_to_paths: dict[str, list[int]] = {}  # type: ignore
-    pool_to_paths: dict[str, list[tuple[str, ...]]] = {}  # type: ignore
-
-    tasks = []
+    # sharding by start token and first hop, paths with only one pool are
+    # finished right away
+    one_pool_paths: list[tuple[str, ...]] = []  # type: ignore
+    shards = []
     for token in tokens:
-        final_tokens = set(CONFIG["weths"]) if token in CONFIG["weths"] else {token}
+        final_tokens = _get_final_tokens(token)
 
-        tasks.append(
-            process_pool.apply_async(
-                find_paths,
-                [
+        if compare_length == 1:
+            one_pool_paths.extend(
+                find_paths(
                     graph,
                     token,
                     final_tokens,
                     compare_length,
                     blacklist_paths,
                     ignore_tokens,
-                ],
+                )
             )
+            continue
+
+        first_hops = _find_neighbors(
+            graph,
+            token,
+            final_tokens,
+            [token],
+            one_pool_paths,
+            blacklist_paths,
+            ignore_tokens,
+        )
+        for i in range(0, len(first_hops), 2):
+            shards.append((token, first_hops[i], first_hops[i + 1]))
+
+    # biggest subtrees first, so workers don't wait for last big shard
+    shards.sort(key=lambda shard: _estimate_shard(graph, shard[2]), reverse=True)
+    chunksize = max(1, len(shards) // (process_pool.count * 4))
+
+    # graph and blacklist are pickled once, shards carry only first hop
+    final_tokens_by_token = {token: _get_final_tokens(token) for token in tokens}
+    process_pool.register_state(
+        "build_paths",
+        (graph, final_tokens_by_token, compare_length, blacklist_paths, ignore_tokens),
+    )
+    try:
+        results = process_pool.imap_unordered(find_shard_paths, shards, chunksize)
+
+        # paths of finished shards are encoded while other shards are searched
+        path_store = PathStore(
+            pools,
+            chain(one_pool_paths, (path for paths in results for path in paths)),
+        )
+    finally:
+        process_pool.register_state("build_paths", None)
+
+    log.debug(log_str(len(path_store), len(shards)))
+
+    return path_store
+
+
+def _get_final_tokens(token: str) -> set[str]:
+    """Paths starting with weth can end with any weth."""
+    return set(CONFIG["weths"]) if token in CONFIG["weths"] else {token}
+
+
+def _estimate_shard(graph: dict[str, dict[str, list[str]]], token: str) -> int:
+    """Estimate size of shard by number of pools of its first token."""
+    return sum(len(pools) for pools in graph[token].values())
+
+
+def build_new_paths(
+    graph: dict[str, dict[str, list[str]]],
+    tokens: list[str],
+    length: int,
+    blacklist_paths: set[tuple[str, ...]],
+    ignore_tokens: set[str],
+    new_pools: Pools,
+) -> list[tuple[str, ...]]:
+    """Build paths with maximum ``length`` that start with given ``tokens``
+    and go through at least one of ``new_pools``. Same paths as in
+    `build_paths`, but only branches that can still reach new pool are
+    followed.
+
+    Args:
+        graph (dict[str, dict[str, list[str]]]): Graph datastructure
+            (with new pools).
+        tokens (list[str]): List of token addresses.
+        length (int): Maximum length.
+        blacklist_paths (set[tuple[str, ...]]): Blacklisted paths.
+        ignore_tokens (set[str]): Tokens to ignore.
+        new_pools (Pools): New pools.
+
+    Returns:
+        list[tuple[str, ...]]: List of paths.
+    """
+    log_str = measure_time("Created {:,} paths through {:,} new pools in {}.")
+
+    # hops from token to nearest token of new pool
+    distances: dict[str, int] = {}  # type: ignore
+    frontier = []
+    for pool in new_pools.values():
+        for token, _ in zip(pool.keys(), range(2)):
+            if token not in distances:
+                distances[token] = 0
+                frontier.append(token)
+
+    for distance in range(1, length):
+        next_frontier = []
+        for token in frontier:
+            for neighbor_token in graph.get(token, {}):
+                if neighbor_token not in distances:
+                    distances[neighbor_token] = distance
+                    next_frontier.append(neighbor_token)
+        frontier = next_frontier
+
+    final_paths: list[tuple[str, ...]] = []  # type: ignore
+    for token in tokens:
+        if token not in distances:
+            continue
+
+        final_tokens = _get_final_tokens(token)
+        _extend_new_path(
+            graph,
+            [token],
+            False,
+            final_tokens,
+            length,
+            blacklist_paths,
+            ignore_tokens,
+            new_pools,
+            distances,
+            final_paths,
         )
 
-    for task in tasks:
-        map_paths(pool_to_paths, task.get())
+    log.debug(log_str(len(final_paths), len(new_pools)))
+
+    return final_paths
+
+
+def _extend_new_path(
+    graph: dict[str, dict[str, list[str]]],
+    current_path: list[str],
+    has_new_pool: bool,
+    final_tokens: set[str],
+    length: int,
+    blacklist_paths: set[tuple[str, ...]],
+    ignore_tokens: set[str],
+    new_pools: Pools,
+    distances: dict[str, int],
+    final_paths: list[tuple[str, ...]],
+) -> None:
+    """Extend ``current_path`` by one pool like `find_paths` and add finished
+    paths with new pool to ``final_paths``.
+
+    Args:
+        graph (dict[str, dict[str, list[str]]]): Graph datastructure.
+        current_path (list[str]): Current created path.
+        has_new_pool (bool): If ``current_path`` contains new pool.
+        final_tokens (set[str]): End tokens.
+        length (int): Maximum length.
+        blacklist_paths (set[tuple[str, ...]]): Blacklisted paths.
+        ignore_tokens (set[str]): Tokens to ignore.
+        new_pools (Pools): New pools.
+        distances (dict[str, int]): Hops from token to nearest token of
+            new pool.
+        final_paths (list[tuple[str, ...]]): List of finished paths.
+    """
+    hops = len(current_path) // 2 + 1
+    is_last = hops == length
+
+    for neighbor_token, pools in graph[current_path[-1]].items():
+        is_final = neighbor_token in final_tokens
+
+        # only final tokens are added as last and ignored tokens are skipped
+        if is_last and not is_final or not is_last and neighbor_token in ignore_tokens:
+            continue
+
+        for pool in pools:
+            if pool in current_path:
+                continue
+
+            with_new_pool = has_new_pool or pool in new_pools
 
-    tuplize_paths(pool_to_paths)
-    return pool_to_paths  # type: ignore
+            if is_final:
+                final_path = tuple(current_path + [pool, neighbor_token])
+                if with_new_pool and final_path not in blacklist_paths:
+                    final_paths.append(final_path)
+                continue
+
+            # pruning branches that can't reach new pool anymore
+            if not with_new_pool:
+                if hops + distances.get(neighbor_token, length) + 1 > length:
+                    continue
+
+            _extend_new_path(
+                graph,
+                current_path + [pool, neighbor_token],
+                with_new_pool,
+                final_tokens,
+                length,
+                blacklist_paths,
+                ignore_tokens,
+                new_pools,
+                distances,
+                final_paths,
+            )
 
 
 def find_paths(
@@ -92,8 +277,80 @@ def find_paths(
     log.debug(f"Creating paths from {start_token} to {final_tokens}.")
     start_time = perf_counter()
 
-    stack: list[list[str]] = [[start_token]]  # type: ignore
-    current_path: list[str] = []  # type: ignore
+    final_paths = _search_paths(
+        graph,
+        [],
+        [[start_token]],
+        final_tokens,
+        compare_length,
+        blacklist_paths,
+        ignore_tokens,
+    )
+
+    log.debug(
+        f"Created {len(final_paths):,} paths from {start_token} to "
+        f"{final_tokens} in {timedelta(seconds=perf_counter() - start_time)}."
+    )
+
+    return final_paths
+
+
+def find_shard_paths(args: tuple[str, str, str]) -> list[tuple[str, ...]]:
+    """Find paths starting at start token and its first pool and token.
+    Same paths as paths of `find_paths` with that first hop. Graph, final
+    tokens, compare length, blacklisted paths and tokens to ignore are worker
+    state registered by `build_paths`.
+
+    Args:
+        args (tuple[str, str, str]): Start token, first pool and first token.
+
+    Returns:
+        list[tuple[str, ...]]: List of paths.
+    """
+    start_token, first_pool, first_token = args
+    (
+        graph,
+        final_tokens_by_token,
+        compare_length,
+        blacklist_paths,
+        ignore_tokens,
+    ) = get_state("build_paths")
+
+    return _search_paths(
+        graph,
+        [start_token],
+        [[], [first_pool, first_token]],
+        final_tokens_by_token[start_token],
+        compare_length,
+        blacklist_paths,
+        ignore_tokens,
+    )
+
+
+def _search_paths(
+    graph: dict[str, dict[str, list[str]]],
+    current_path: list[str],
+    stack: list[list[str]],
+    final_tokens: set[str],
+    compare_length: int,
+    blacklist_paths: set[tuple[str, ...]],
+    ignore_tokens: set[str],
+) -> list[tuple[str, ...]]:
+    """Depth first search of paths from ``current_path`` and ``stack``.
+
+    Args:
+        graph (dict[str, dict[str, list[str]]]): Graph datastructure.
+        current_path (list[str]): Current created path.
+        stack (list[list[str]]): Stack of pool and token substacks.
+        final_tokens (set[str]): Final tokens.
+        compare_length (int): Length of paths where it no longer adds to stack
+            and tries to finalize path.
+        blacklist_paths (set[tuple[str, ...]]): Blacklisted paths.
+        ignore_tokens (set[str]): Tokens to ignore.
+
+    Returns:
+        list[tuple[str, ...]]: List of paths.
+    """
     final_paths: list[tuple[str, ...]] = []  # type: ignore
 
     while True:
@@ -140,11 +397,6 @@ def find_paths(
             )
         )
 
-    log.debug(
-        f"Created {len(final_paths):,} paths from {start_token} to "
-        f"{final_tokens} in {timedelta(seconds=perf_counter() - start_time)}."
-    )
-
     return final_paths
 
 
@@ -247,26 +499,3 @@ def _find_neighbors(
             stack2.append(neighbor_token)
 
     return stack2
-
-
-def map_paths(
-    pool_to_paths: dict[str, list[tuple[str, ...]]], paths: list[tuple[str, ...]]
-) -> None:
-    """Map paths to pools that they path through.
-
-    Args:
-        pool_to_paths (dict[str, list[int]]): Mapping of pool address to path index.
-        paths (list[list[str]]): List of path datastructure.
-        start_idx (int): Index at which to start mapping.
-    """
-    for path in paths:
-        for i in range(1, len(path), 2):
-            try:
-                pool_to_paths[path[i]].append(path)
-            except KeyError:
-                pool_to_paths[path[i]] = [path]
-
-
-def tuplize_paths(pool_to_paths: dict[str, list[tuple[str, ...]]]):
-    for address, paths in pool_to_paths.items():
-        pool_to_paths[address] = tuple(paths)  # type: ignore
@@ -0,0 +1,154 @@
+from math import inf
+
+from utils._types import EdgeWeights, Pools
+
+
+def find_cycles(
+    graph: dict[str, dict[str, list[str]]],
+    edge_weights: EdgeWeights,
+    changed_pools: Pools,
+    start_tokens: set[str],
+    length: int,
+    ignore_tokens: set[str],
+    shard: tuple[int, int] = (0, 1),
+) -> list[tuple[str, ...]]:
+    """Find profitable cycles with maximum ``length`` that go through tokens
+    of ``changed_pools``. Cycles are rotated to start and end with one of
+    ``start_tokens``.
+
+    Note:
+        Search is bounded Bellman-Ford on log edge weights, so only the
+        best walk to every token per hop is kept. It finds the most
+        profitable cycles, not all of them.
+
+    Args:
+        graph (dict[str, dict[str, list[str]]]): Graph datastructure.
+        edge_weights (EdgeWeights): Edge weights.
+        changed_pools (Pools): Changed pools.
+        start_tokens (set[str]): Tokens that paths can start with.
+        length (int): Maximum number of pools in cycle.
+        ignore_tokens (set[str]): Tokens to ignore.
+        shard (tuple[int, int], optional): Index of shard and number of
+            shards. Only every n-th seed token starting at index is searched,
+            so cycles found from other shards can repeat. Defaults to (0, 1).
+
+    Returns:
+        list[tuple[str, ...]]: List of paths.
+    """
+    cycles_s: set[tuple[str, ...]] = set()  # type: ignore
+    cycles: list[tuple[str, ...]] = []  # type: ignore
+
+    # seeding with tokens of changed pools
+    seeds: dict[str, None] = {}  # type: ignore
+    for pool in changed_pools.values():
+        for token, _ in zip(pool.keys(), range(2)):
+            if token not in ignore_tokens:
+                seeds[token] = None
+
+    index, count = shard
+    for seed in sorted(seeds)[index::count]:
+        for cycle in _search_seed(graph, edge_weights, seed, length, ignore_tokens):
+            path = _rotate_cycle(cycle, start_tokens)
+
+            if path is not None and path not in cycles_s:
+                cycles_s.add(path)
+                cycles.append(path)
+
+    return cycles
+
+
+def _search_seed(
+    graph: dict[str, dict[str, list[str]]],
+    edge_weights: EdgeWeights,
+    seed: str,
+    length: int,
+    ignore_tokens: set[str],
+) -> list[tuple[str, ...]]:
+    """Find cycles from ``seed`` to ``seed`` with positive weight.
+
+    Walk to a token is extended only if it's heavier than every shorter
+    walk to the same token, since shorter walk can be extended by more pools.
+
+    Args:
+        graph (dict[str, dict[str, list[str]]]): Graph datastructure.
+        edge_weights (EdgeWeights): Edge weights.
+        seed (str): Start and end token.
+        length (int): Maximum number of pools in cycle.
+        ignore_tokens (set[str]): Tokens to ignore.
+
+    Returns:
+        list[tuple[str, ...]]: Cycles starting at ``seed``.
+    """
+    seed_neighbors = graph.get(seed, {})
+    best_weights = {seed: 0.0}
+    frontier = {seed: (0.0, (seed,))}
+    cycles = []
+
+    for hop in range(1, length + 1):
+        next_frontier: dict[str, tuple[float, tuple[str, ...]]] = {}  # type: ignore
+        remaining = length - hop
+
+        for token, (weight, walk) in frontier.items():
+            # closing cycle
+            for pool in seed_neighbors.get(token, ()):
+                if pool in walk:
+                    continue
+
+                if weight + edge_weights[pool][token] > 0:
+                    cycles.append(walk + (pool, seed))
+
+            if not remaining:
+                continue
+
+            # with one pool left only neighbors of seed can close cycle
+            if remaining == 1:
+                neighbors = [
+                    (neighbor, graph[token][neighbor])
+                    for neighbor in seed_neighbors
+                    if neighbor in graph[token]
+                ]
+            else:
+                neighbors = graph[token].items()
+
+            for neighbor, pools in neighbors:
+                if neighbor == seed or neighbor in ignore_tokens:
+                    continue
+
+                for pool in pools:
+                    if pool in walk:
+                        continue
+
+                    new_weight = weight + edge_weights[pool][token]
+                    if new_weight <= best_weights.get(neighbor, -inf):
+                        continue
+
+                    best_weights[neighbor] = new_weight
+                    next_frontier[neighbor] = (new_weight, walk + (pool, neighbor))
+
+        frontier = next_frontier
+
+    return cycles
+
+
+def _rotate_cycle(
+    cycle: tuple[str, ...], start_tokens: set[str]
+) -> tuple[str, ...] | None:
+    """Rotate ``cycle`` to start with first token in ``start_tokens``.
+
+    Example::
+        >>> _rotate_cycle(("A", "AB", "B", "BC", "C", "CA", "A"), {"B"})
+        ('B', 'BC', 'C', 'CA', 'A', 'AB', 'B')
+
+    Args:
+        cycle (tuple[str, ...]): Cycle.
+        start_tokens (set[str]): Tokens that paths can start with.
+
+    Returns:
+        tuple[str, ...] | None: Rotated cycle or `None` if there is no
+            token from ``start_tokens`` in ``cycle``.
+    """
+    for i in range(0, len(cycle) - 1, 2):
+        if cycle[i] in start_tokens:
+            return cycle[i:] + cycle[1 : i + 1]
+
+    return None
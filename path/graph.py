@@ -45,3 +45,52 @@ def build_graph(pools: Pools) -> dict[str, dict[str, list[str]]]:
             adj_list[token1_address] = {token0_address: [pool_address]}
 
     return adj_list
+
+
+def add_to_graph(graph: dict[str, dict[str, list[str]]], pools: Pools) -> None:
+    """Add ``pools`` to ``graph``.
+
+    Args:
+        graph (dict[str, dict[str, list[str]]]): Adjacency list.
+        pools (Pools): New pools.
+    """
+    for pool_address, pool in pools.items():
+        token0_address, token1_address = [
+            address for address, _ in zip(pool.keys(), range(2))
+        ]
+
+        graph.setdefault(token0_address, {}).setdefault(token1_address, []).append(
+            pool_address
+        )
+        graph.setdefault(token1_address, {}).setdefault(token0_address, []).append(
+            pool_address
+        )
+
+
+def remove_from_graph(graph: dict[str, dict[str, list[str]]], pools: Pools) -> None:
+    """Remove ``pools`` from ``graph``.
+
+    Args:
+        graph (dict[str, dict[str, list[str]]]): Adjacency list.
+        pools (Pools): Removed pools.
+    """
+    for pool_address, pool in pools.items():
+        token0_address, token1_address = [
+            address for address, _ in zip(pool.keys(), range(2))
+        ]
+
+        for token_in, token_out in (
+            (token0_address, token1_address),
+            (token1_address, token0_address),
+        ):
+            try:
+                pool_addresses = graph[token_in][token_out]
+                pool_addresses.remove(pool_address)
+            except (KeyError, ValueError):
+                continue
+
+            # removing empty entries
+            if not pool_addresses:
+                del graph[token_in][token_out]
+                if not graph[token_in]:
+                    del graph[token_in]
@@ -0,0 +1,406 @@
+from typing import Any, Iterable
+
+import numpy as np
+
+from utils._types import Pools
+
+
+class PathStore:
+    """Compact store of paths with pools and tokens interned to integer ids.
+
+    Every path is a row of precompiled descriptor: pool ids (also fee
+    slots) and is token0 in flags of every hop. Tokens are not stored per
+    hop, since token out of a hop is the other token of its pool. Paths
+    that go through pool are found with CSR index `pool_offsets` /
+    `pool_path_ids`, which is rebuilt after unpickling instead of being
+    sent to workers.
+
+    Removed paths are only flagged as dead (tombstoned), so removal touches
+    nothing but the pools of the path. Dead paths are dropped by `compact`,
+    which renumbers path ids, so every copy of the store has to be compacted
+    at the same point to keep path ids same as other copies.
+
+    Every store also keeps history of how often path was a candidate and
+    how often it passed the checker, and warm starts of optimal amount in
+    of paths. History is local to the process, so it's not pickled.
+
+    Args:
+        pools (Pools): Pools datastructure.
+        paths (Iterable[tuple[str, ...]], optional): Paths. Defaults to ().
+
+    Attributes:
+        tokens (list[str]): Token id to token address.
+        token_ids (dict[str, int]): Token address to token id.
+        pools (list[str]): Pool id to pool address.
+        pool_ids (dict[str, int]): Pool address to pool id.
+        pool_tokens (np.ndarray): Token0 and token1 ids (`pools x 2`).
+        start_tokens (np.ndarray): Token id of first token (`paths`).
+        hop_pools (np.ndarray): Pool ids (`paths x hops`), `-1` if there
+            is no hop.
+        hop_is_0_ins (np.ndarray): Is token0 in flags (`paths x hops`).
+        lengths (np.ndarray): Number of hops (`paths`).
+        alive (np.ndarray): Flags of paths that were not removed (`paths`).
+        candidates (np.ndarray): Times path was a candidate (`paths`).
+        passes (np.ndarray): Times path passed the checker (`paths`).
+        warm_starts (np.ndarray): Ratio of last optimal amount in and closed
+            form amount in, `1` if there is none (`paths`, `float32`).
+        pool_offsets (np.ndarray): Start of paths of pool id in
+            `pool_path_ids` (`pools + 1`).
+        pool_path_ids (np.ndarray): Path ids grouped by pool id.
+    """
+
+    __slots__ = (
+        "tokens",
+        "token_ids",
+        "pools",
+        "pool_ids",
+        "pool_tokens",
+        "start_tokens",
+        "hop_pools",
+        "hop_is_0_ins",
+        "lengths",
+        "alive",
+        "candidates",
+        "passes",
+        "warm_starts",
+        "pool_offsets",
+        "pool_path_ids",
+    )
+
+    _STATE = __slots__[:-5]
+
+    def __init__(self, pools: Pools, paths: Iterable[tuple[str, ...]] = ()) -> None:
+        self.tokens: list[str] = []  # type: ignore
+        self.token_ids: dict[str, int] = {}  # type: ignore
+        self.pools: list[str] = []  # type: ignore
+        self.pool_ids: dict[str, int] = {}  # type: ignore
+
+        self.pool_tokens = np.zeros((0, 2), dtype=np.int32)
+        self.start_tokens = np.zeros(0, dtype=np.int32)
+        self.hop_pools = np.zeros((0, 0), dtype=np.int32)
+        self.hop_is_0_ins = np.zeros((0, 0), dtype=np.bool_)
+        self.lengths = np.zeros(0, dtype=np.int8)
+        self.alive = np.zeros(0, dtype=np.bool_)
+        self.candidates = np.zeros(0, dtype=np.uint16)
+        self.passes = np.zeros(0, dtype=np.uint16)
+        self.warm_starts = np.ones(0, dtype=np.float32)
+
+        self.add_paths(pools, paths)
+
+    def __len__(self) -> int:
+        return int(self.alive.sum())
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self._STATE}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.candidates = np.zeros(len(self.lengths), dtype=np.uint16)
+        self.passes = np.zeros(len(self.lengths), dtype=np.uint16)
+        self.warm_starts = np.ones(len(self.lengths), dtype=np.float32)
+        self._index()
+
+    def _intern_token(self, token: str) -> int:
+        try:
+            return self.token_ids[token]
+        except KeyError:
+            self.token_ids[token] = len(self.tokens)
+            self.tokens.append(token)
+            return len(self.tokens) - 1
+
+    def _get_is_0_ins(
+        self, start_tokens: np.ndarray, hop_pools: np.ndarray
+    ) -> np.ndarray:
+        """Follow tokens through hops to get is token0 in flags."""
+        is_0_ins = np.zeros(hop_pools.shape, dtype=np.bool_)
+        token_in = start_tokens
+
+        for hop in range(hop_pools.shape[1]):
+            pool_tokens = self.pool_tokens[hop_pools[:, hop]]
+            is_0_ins[:, hop] = pool_tokens[:, 0] == token_in
+            token_in = np.where(is_0_ins[:, hop], pool_tokens[:, 1], pool_tokens[:, 0])
+
+        return is_0_ins & (hop_pools >= 0)
+
+    def _index(self) -> None:
+        """Build CSR pool to path ids index."""
+        path_ids = np.repeat(
+            np.arange(len(self.lengths), dtype=np.int32), self.hop_pools.shape[1]
+        )
+        pool_ids = self.hop_pools.ravel()
+
+        has_hop = pool_ids >= 0
+        path_ids, pool_ids = path_ids[has_hop], pool_ids[has_hop]
+
+        order = np.argsort(pool_ids, kind="stable")
+        counts = np.bincount(pool_ids, minlength=len(self.pools))
+
+        self.pool_path_ids = path_ids[order]
+        self.pool_offsets = np.zeros(len(self.pools) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.pool_offsets[1:])
+
+    def add_paths(self, pools: Pools, paths: Iterable[tuple[str, ...]]) -> int:
+        """Add ``paths`` to store.
+
+        Args:
+            pools (Pools): Pools datastructure.
+            paths (Iterable[tuple[str, ...]]): Paths.
+
+        Returns:
+            int: Number of added paths.
+        """
+        pool_tokens: list[tuple[int, int]] = []  # type: ignore
+        start_tokens: list[int] = []  # type: ignore
+        rows: list[list[int]] = []  # type: ignore
+
+        for path in paths:
+            start_tokens.append(self._intern_token(path[0]))
+
+            row = []
+            for i in range(1, len(path), 2):
+                try:
+                    row.append(self.pool_ids[path[i]])
+                except KeyError:
+                    token0, token1 = [
+                        token for token, _ in zip(pools[path[i]].keys(), range(2))
+                    ]
+                    pool_tokens.append(
+                        (self._intern_token(token0), self._intern_token(token1))
+                    )
+                    self.pool_ids[path[i]] = len(self.pools)
+                    self.pools.append(path[i])
+                    row.append(len(self.pools) - 1)
+
+            rows.append(row)
+
+        if pool_tokens:
+            self.pool_tokens = np.concatenate(
+                (self.pool_tokens, np.array(pool_tokens, dtype=np.int32))
+            )
+
+        # widening hops if new paths are longer
+        max_hops = max([len(row) for row in rows] + [self.hop_pools.shape[1]])
+        if max_hops > self.hop_pools.shape[1]:
+            padding = max_hops - self.hop_pools.shape[1]
+            self.hop_pools = np.pad(
+                self.hop_pools, ((0, 0), (0, padding)), constant_values=-1
+            )
+            self.hop_is_0_ins = np.pad(self.hop_is_0_ins, ((0, 0), (0, padding)))
+
+        hop_pools = np.full((len(rows), max_hops), -1, dtype=np.int32)
+        for i, row in enumerate(rows):
+            hop_pools[i, : len(row)] = row
+
+        new_start_tokens = np.array(start_tokens, dtype=np.int32)
+        hop_is_0_ins = self._get_is_0_ins(new_start_tokens, hop_pools)
+
+        self.start_tokens = np.concatenate((self.start_tokens, new_start_tokens))
+        self.hop_pools = np.concatenate((self.hop_pools, hop_pools))
+        self.hop_is_0_ins = np.concatenate((self.hop_is_0_ins, hop_is_0_ins))
+        self.lengths = np.concatenate(
+            (self.lengths, (hop_pools >= 0).sum(axis=1, dtype=np.int8))
+        )
+        self.alive = np.concatenate((self.alive, np.ones(len(rows), dtype=np.bool_)))
+        self.candidates = np.concatenate(
+            (self.candidates, np.zeros(len(rows), dtype=np.uint16))
+        )
+        self.passes = np.concatenate(
+            (self.passes, np.zeros(len(rows), dtype=np.uint16))
+        )
+        self.warm_starts = np.concatenate(
+            (self.warm_starts, np.ones(len(rows), dtype=np.float32))
+        )
+        self._index()
+
+        return len(rows)
+
+    def compact(self) -> int:
+        """Drop dead paths. Path ids of alive paths change.
+
+        Returns:
+            int: Number of dropped paths.
+        """
+        dead_count = len(self.alive) - len(self)
+        if not dead_count:
+            return 0
+
+        alive = self.alive
+        self.start_tokens = self.start_tokens[alive]
+        self.hop_pools = self.hop_pools[alive]
+        self.hop_is_0_ins = self.hop_is_0_ins[alive]
+        self.lengths = self.lengths[alive]
+        self.candidates = self.candidates[alive]
+        self.passes = self.passes[alive]
+        self.warm_starts = self.warm_starts[alive]
+        self.alive = alive[alive]
+        self._index()
+
+        return dead_count
+
+    def remove_pools(self, pools: Iterable[str]) -> int:
+        """Remove paths that go through ``pools``.
+
+        Args:
+            pools (Iterable[str]): Pool addresses.
+
+        Returns:
+            int: Number of removed paths.
+        """
+        return len(self.remove_path_ids(self.get_path_ids(pools)))
+
+    def get_path_ids(self, pools: Iterable[str]) -> np.ndarray:
+        """Get sorted unique ids of alive paths that go through ``pools``.
+
+        Args:
+            pools (Iterable[str]): Pool addresses.
+
+        Returns:
+            np.ndarray: Path ids.
+        """
+        slices = []
+        for pool in pools:
+            try:
+                pool_id = self.pool_ids[pool]
+            except KeyError:
+                continue
+
+            start, end = self.pool_offsets[pool_id], self.pool_offsets[pool_id + 1]
+            slices.append(self.pool_path_ids[start:end])
+
+        if not slices:
+            return np.zeros(0, dtype=np.int32)
+
+        path_ids = np.unique(np.concatenate(slices))
+        return path_ids[self.alive[path_ids]]
+
+    def get_paths(self, path_ids: np.ndarray) -> list[tuple[str, ...]]:
+        """Decode ``path_ids`` to paths.
+
+        Args:
+            path_ids (np.ndarray): Path ids.
+
+        Returns:
+            list[tuple[str, ...]]: Paths.
+        """
+        tokens, pools = self.tokens, self.pools
+
+        hop_pools = self.hop_pools[path_ids]
+        token_outs = self.pool_tokens[hop_pools, self.hop_is_0_ins[path_ids] * 1]
+
+        paths = []
+        for start_token, pool_ids, token_ids, hops in zip(
+            self.start_tokens[path_ids].tolist(),
+            hop_pools.tolist(),
+            token_outs.tolist(),
+            self.lengths[path_ids].tolist(),
+        ):
+            path = [tokens[start_token]]
+            for hop in range(hops):
+                path.append(pools[pool_ids[hop]])
+                path.append(tokens[token_ids[hop]])
+
+            paths.append(tuple(path))
+
+        return paths
+
+    def find_path_id(self, path: tuple[str, ...]) -> int | None:
+        """Find id of alive ``path`` among paths of its pool with the least
+        paths. Path is identified by first token and pools.
+
+        Args:
+            path (tuple[str, ...]): Path.
+
+        Returns:
+            int | None: Path id or `None` if it's not in store.
+        """
+        try:
+            start_token = self.token_ids[path[0]]
+            pool_ids = [self.pool_ids[path[i]] for i in range(1, len(path), 2)]
+        except KeyError:
+            return None
+
+        hops = len(pool_ids)
+        if hops > self.hop_pools.shape[1]:
+            return None
+
+        pool_id = min(
+            pool_ids,
+            key=lambda pool_id: self.pool_offsets[pool_id + 1]
+            - self.pool_offsets[pool_id],
+        )
+        start, end = self.pool_offsets[pool_id], self.pool_offsets[pool_id + 1]
+        candidates = self.pool_path_ids[start:end]
+
+        matches = (
+            self.alive[candidates]
+            & (self.start_tokens[candidates] == start_token)
+            & (self.lengths[candidates] == hops)
+            & (self.hop_pools[candidates, :hops] == pool_ids).all(axis=1)
+        )
+        found = candidates[matches]
+
+        return int(found[0]) if len(found) else None
+
+    def remove_paths(self, paths: Iterable[tuple[str, ...]]) -> list[int]:
+        """Remove ``paths`` from store.
+
+        Args:
+            paths (Iterable[tuple[str, ...]]): Paths to remove.
+
+        Returns:
+            list[int]: Ids of removed paths.
+        """
+        path_ids = [self.find_path_id(path) for path in paths]
+        return self.remove_path_ids(
+            [path_id for path_id in path_ids if path_id is not None]
+        )
+
+    def remove_path_ids(self, path_ids: Iterable[int]) -> list[int]:
+        """Remove paths by flagging them as dead.
+
+        Args:
+            path_ids (Iterable[int]): Path ids.
+
+        Returns:
+            list[int]: Ids of removed paths.
+        """
+        removed = []
+        for path_id in path_ids:
+            if self.alive[path_id]:
+                self.alive[path_id] = False
+                removed.append(int(path_id))
+
+        return removed
+
+    def record(self, path_ids: np.ndarray, passed: bool = False) -> None:
+        """Count ``path_ids`` as candidates or as paths that passed the
+        checker. Counts saturate at maximum `uint16`.
+
+        Args:
+            path_ids (np.ndarray): Path ids.
+            passed (bool, optional): Paths passed the checker. Defaults to
+                `False`.
+        """
+        counts = self.passes if passed else self.candidates
+        path_ids = np.unique(path_ids)
+        counts[path_ids[counts[path_ids] < np.iinfo(np.uint16).max]] += 1
+
+    def order_by_history(self, path_ids: np.ndarray) -> np.ndarray:
+        """Order ``path_ids`` hot tier first: by passes and then candidates,
+        both descending. Paths without history keep their order.
+
+        Args:
+            path_ids (np.ndarray): Path ids.
+
+        Returns:
+            np.ndarray: Ordered path ids.
+        """
+        passes = self.passes[path_ids]
+        candidates = self.candidates[path_ids]
+
+        if not passes.any() and not candidates.any():
+            return path_ids
+
+        order = np.lexsort((-candidates.astype(np.int32), -passes.astype(np.int32)))
+        return path_ids[order]
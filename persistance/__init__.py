@@ -3,8 +3,10 @@ from pathlib import Path
 from .abi import *
 from .burner import *
 from .bytecode import *
+from .calibration import *
 from .last_block import *
 from .other import *
+from .path_index import *
 from .paths import *
 from .pools import *
 from .stats import *
@@ -0,0 +1,32 @@
+import json
+
+from utils._types import Calibration
+
+
+def save_calibration(calibration: Calibration) -> None:
+    """Save calibrated worker count and chunk size to storage.
+
+    Args:
+        calibration (Calibration): Calibration.
+    """
+    try:
+        with open("data/calibration.json", "w") as file:
+            json.dump(calibration, file)
+    except KeyboardInterrupt as error:
+        with open("data/calibration.json", "w") as file:
+            json.dump(calibration, file)
+        raise error from None
+
+
+def load_calibration() -> Calibration | None:
+    """Load calibration from storage.
+
+    Returns:
+        Calibration | None: Calibration or `None` if there is no
+            `calibration.json`.
+    """
+    try:
+        with open("data/calibration.json") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,81 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from path import PathStore
+
+PATH_INDEX_DIR = Path("data/path_index")
+
+# lists and dicts are saved in json, rest of state as mmap-able arrays
+_JSON_STATE = ("tokens", "pools")
+_ID_STATE = {"token_ids": "tokens", "pool_ids": "pools"}
+
+
+def save_path_index(key: str, path_store: PathStore) -> None:
+    """Save ``path_store`` to storage under ``key``.
+
+    Note:
+        Index file with ``key`` is removed first and written last, so
+        partially saved arrays are never loaded. Arrays are written to
+        temporary files and renamed over old ones, so files that are still
+        memory mapped by loaded stores are never rewritten.
+
+    Args:
+        key (str): Hash of pools, paths config and blacklisted paths.
+        path_store (PathStore): Paths.
+    """
+    PATH_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    index_file = PATH_INDEX_DIR / "index.json"
+    state = path_store.__getstate__()
+
+    try:
+        index_file.unlink(missing_ok=True)
+        for name, value in state.items():
+            if isinstance(value, np.ndarray):
+                array_file = PATH_INDEX_DIR / f"{name}.npy"
+                temp_file = PATH_INDEX_DIR / f"{name}.npy.tmp"
+                with open(temp_file, "wb") as file:
+                    np.save(file, value)
+                os.replace(temp_file, array_file)
+
+        with open(index_file, "w") as file:
+            json.dump({"key": key} | {name: state[name] for name in _JSON_STATE}, file)
+    except KeyboardInterrupt as error:
+        index_file.unlink(missing_ok=True)
+        raise error from None
+
+
+def load_path_index(key: str) -> PathStore | None:
+    """Load paths from storage if they were saved under ``key``. Arrays are
+    memory mapped copy on write, so they are read only when accessed.
+
+    Args:
+        key (str): Hash of pools, paths config and blacklisted paths.
+
+    Returns:
+        PathStore | None: Paths or `None` if there are no paths with ``key``.
+    """
+    try:
+        with open(PATH_INDEX_DIR / "index.json") as file:
+            index = json.load(file)
+    except FileNotFoundError:
+        return None
+
+    if index["key"] != key:
+        return None
+
+    state = {}
+    for name in PathStore._STATE:
+        if name in _JSON_STATE:
+            state[name] = index[name]
+        elif name in _ID_STATE:
+            state[name] = {value: i for i, value in enumerate(index[_ID_STATE[name]])}
+        else:
+            state[name] = np.load(PATH_INDEX_DIR / f"{name}.npy", mmap_mode="c")
+
+    path_store = PathStore.__new__(PathStore)
+    path_store.__setstate__(state)
+
+    return path_store
@@ -1 +1,2 @@
 from .process_management import ProcessManager
+from .work import get_state
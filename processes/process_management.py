@@ -1,57 +1,71 @@
+from itertools import islice
 from multiprocessing import Pipe, Process
-from multiprocessing.connection import Connection
-from typing import Callable
+from multiprocessing.connection import Connection, wait
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, Iterable, Iterator
 
 from utils import CONFIG, Logger
 from utils.decorators import singleton, singleton_instances
 
 from .exceptions import InjectionError
 from .task_management import TaskManager
-from .work import worker
+from .work import call_chunk, set_state, worker
 
 log = Logger(__name__)
 
 
 @singleton
 class ProcessManager:
-    """Process Manager singleton.
+    """Process Manager singleton. Every worker process has its own pipe, so
+    every task is one message to one process and no barrier is needed.
+
     Args:
         process_num (int, optional): Number of worer processes to spawn.
             Defaults to `CONFIG['multiprocessing']['workers']`.
+        initializer (Callable[[int], None] | None, optional): Function called
+            in every process with its identification number (starting with
+            `1`). Defaults to None.
         no_singleton (bool, optional): Don't create singleton. Defaults to False.
         new_singleton (bool, optional): Create new singleton instance.
             Defaults to False.
 
     Attributes:
         count (int): Total number of spawned proccesses.
-        result_receiver (Connection): Result receiving socket.
-        task_senders (list[Connection]): Task sending socket for each worker.
+        connections (list[Connection]): Task sending and result receiving
+            socket for each worker.
         processes (list[Process]): All worker processes.
+        busy_times (list[float]): Time each worker spent executing tasks
+            since last `pop_busy_times`.
     """
 
-    __slots__ = ("count", "processes", "result_receiver", "task_senders")
+    __slots__ = ("count", "processes", "connections", "busy_times")
 
-    def __init__(self, process_num: int = CONFIG["multiprocessing"]["workers"]) -> None:
+    def __init__(
+        self,
+        process_num: int = CONFIG["multiprocessing"]["workers"],
+        initializer: Callable[[int], None] | None = None,
+    ) -> None:
         self.count = process_num
         """Total number of spawned proccesses."""
-        self.result_receiver, result_sender = Pipe()
         self.processes: list[Process] = []  # type: ignore
+        self.connections: list[Connection] = []  # type: ignore
+        self.busy_times = [0.0] * process_num
 
-        self.task_senders: list[Connection] = []  # type: ignore
         for i in range(process_num):
-            # pipe for receiving and sending task
-            task_receiver, task_sender = Pipe()
-            self.task_senders.append(task_sender)
+            # pipe for sending task and receiving result
+            connection, worker_connection = Pipe()
+            self.connections.append(connection)
 
-            # starting process and assigning task sockets
+            # starting process and assigning task socket
             process = Process(
-                name=f"Process-{i + 1}",
+                name=f"Worker-{i + 1}",
                 target=worker,
-                args=(task_receiver, result_sender, i),
+                args=(worker_connection, i + 1, initializer),
                 daemon=True,
             )
             self.processes.append(process)
             process.start()
+            worker_connection.close()
 
     def inject_function(self, func: Callable) -> None:
         """Inject function to all processes.
@@ -59,14 +73,141 @@ class ProcessManager:
         Args:
             func (Callable): Function.
         """
-        for taks_sender in self.task_senders:
-            taks_sender.send(("inject_function", [func], {}, False))
+        try:
+            self.broadcast("inject_function", func)
+        except BaseException as error:
+            raise InjectionError(error) from None
+
+    def register_state(self, name: str, value: Any) -> None:
+        """Register worker local state in all processes, which tasks get
+        with `processes.get_state`. Value is pickled only once.
+
+        Args:
+            name (str): State name.
+            value (Any): State.
+        """
+        self.broadcast(set_state, name, value)
+
+    def broadcast(self, func: str | Callable, *args, **kwargs) -> list[Any]:
+        """Execute function in every process exactly once. Task is pickled
+        only once.
+
+        Args:
+            func (str | Callable): Function or function name.
+            *args: Function arguments.
+            **kwargs: Function keyword arguments.
+
+        Raises:
+            exception: If task raised exception.
+
+        Returns:
+            list[Any]: Result of every process.
+        """
+        task = bytes(ForkingPickler.dumps((func, args, kwargs, False)))
+        for connection in self.connections:
+            connection.send_bytes(task)
+
+        task_manager = self.task_manager()
+        task_manager.processes_used = self.count
+
+        return task_manager.gather()
+
+    def scatter(
+        self,
+        func: str | Callable,
+        args_list: Iterable[list | tuple],
+        ordered: bool = True,
+    ) -> list[Any]:
+        """Execute function with every arguments in ``args_list`` in its own
+        process.
 
-        # checking if injection is ok
-        for _ in range(self.count):
-            result = self.result_receiver.recv()
-            if result[0] is not None:
-                raise InjectionError(result[0])
+        Args:
+            func (str | Callable): Function or function name.
+            args_list (Iterable[list | tuple]): Arguments for every process.
+            ordered (bool, optional): Results in order of ``args_list``,
+                otherwise in order they were finished. Defaults to True.
+
+        Raises:
+            MaxTasksError: If there is more arguments than processes.
+            exception: If task raised exception.
+
+        Returns:
+            list[Any]: Results.
+        """
+        task_manager = self.task_manager()
+        for args in args_list:
+            task_manager.submit(func, args)
+
+        return task_manager.gather(ordered)
+
+    def imap_unordered(
+        self,
+        func: Callable,
+        iterable: Iterable,
+        chunksize: int = 1,
+        processes: int | None = None,
+    ) -> Iterator:
+        """Call ``func`` with every item of ``iterable`` in chunks. Process
+        gets next chunk as soon as it returns previous one.
+
+        Args:
+            func (Callable): Function with one argument.
+            iterable (Iterable): Items.
+            chunksize (int, optional): Number of items in chunk. Defaults to 1.
+            processes (int | None, optional): Number of first processes to use,
+                all if None. Defaults to None.
+
+        Raises:
+            exception: If task raised exception.
+
+        Yields:
+            Any: Results in order they are finished.
+        """
+        iterator = iter(iterable)
+        busy: list[Connection] = []  # type: ignore
+        exception = None
+
+        def submit(connection: Connection) -> None:
+            chunk = list(islice(iterator, chunksize))
+            if chunk and exception is None:
+                connection.send((call_chunk, (func, chunk), {}, False))
+                busy.append(connection)
+
+        for connection in self.connections[:processes]:
+            submit(connection)
+
+        # receiving all results, so processes are ready for next tasks
+        try:
+            while busy:
+                for connection in wait(busy):
+                    busy.remove(connection)  # type: ignore
+                    results, id, _, elapsed = connection.recv()  # type: ignore
+                    self.busy_times[id - 1] += elapsed
+
+                    if isinstance(results, BaseException):
+                        exception = exception or results
+                        continue
+
+                    submit(connection)  # type: ignore
+                    if exception is None:
+                        yield from results
+        finally:
+            for connection in busy:
+                _, id, _, elapsed = connection.recv()
+                self.busy_times[id - 1] += elapsed
+
+        if exception:
+            raise exception
+
+    def pop_busy_times(self) -> list[float]:
+        """Get time each worker spent executing tasks and reset it.
+
+        Returns:
+            list[float]: Busy time of each worker in seconds.
+        """
+        busy_times = self.busy_times
+        self.busy_times = [0.0] * self.count
+        return busy_times
 
     def kill(self) -> None:
         """Kill all worker processes. Also deletes instance from singleton."""
@@ -89,7 +230,7 @@ class ProcessManager:
         Retrurns:
             TaskManager: Task manager object.
         """
-        return TaskManager(self.task_senders, self.result_receiver)
+        return TaskManager(self.connections, self.busy_times)
 
     def __repr__(self) -> str:
         if type(self) in singleton_instances:
@@ -1,5 +1,5 @@
-from multiprocessing.connection import Connection
-from typing import Iterator
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Iterator
 
 from .exceptions import MaxTasksError
 
@@ -10,39 +10,41 @@ class TaskManager:
     processes and than `TaskManager` should be discarded.
 
     Args:
-        task_senders (list[Connection]): Task sending socket for each process.
-        result_receiver (Connection): Result receiving socket.
+        connections (list[Connection]): Task sending and result receiving
+            socket for each process.
+        busy_times (list[float] | None, optional): Busy time of each process,
+            durations of received tasks are added to it. Defaults to None.
 
     Attributes:
-        task_senders (list[Connection]): Task sending socket for each process.
-        result_receiver (Connection): Result receiving socket.
+        connections (list[Connection]): Task sending and result receiving
+            socket for each process.
+        busy_times (list[float]): Busy time of each process.
         max_tasks (int): Maximum tasks that can be assigned.
         processes_used (int): Worker processes already used.
     """
 
-    __slots__ = ("max_tasks", "processes_used", "result_receiver", "task_senders")
+    __slots__ = ("connections", "busy_times", "max_tasks", "processes_used")
 
     def __init__(
-        self,
-        task_senders: list[Connection],
-        result_receiver: Connection,
+        self, connections: list[Connection], busy_times: list[float] | None = None
     ) -> None:
-        self.task_senders = task_senders
-        self.result_receiver = result_receiver
-        self.max_tasks = len(task_senders)
+        self.connections = connections
+        self.busy_times = busy_times or [0.0] * len(connections)
+        self.max_tasks = len(connections)
         self.processes_used = 0
 
     def submit(
         self,
-        func_name: str,
+        func: str | Callable,
         args: list | tuple = [],
         kwargs: dict = {},
         no_return: bool = False,
     ) -> None:
-        """Submit function with provided name for execution in other process.
+        """Submit function or function with provided name of injected
+        function for execution in other process.
 
         Args:
-            func_name (str): Function name.
+            func (str | Callable): Function or function name.
             args (list | tuple, optional): Function arguments. Defaults to [].
             kwargs (dict, optional): Function keyword arguments. Defaults to {}.
             no_return (bool, optional): Do not return result. Defaults to False.
@@ -53,13 +55,12 @@ class TaskManager:
         if self.processes_used == self.max_tasks:
             raise MaxTasksError(f"Maximum tasks ({self.max_tasks} assigned")
 
-        self.task_senders[self.processes_used].send(
-            (func_name, args, kwargs, no_return)
-        )
+        self.connections[self.processes_used].send((func, args, kwargs, no_return))
         self.processes_used += 1
 
     def results(self, ordered: bool = True, raise_error: bool = True) -> Iterator:
-        """Iterate over task results.
+        """Iterate over task results. All results are received even if task
+        raised error, so processes are ready for next tasks.
 
         Args:
             ordered (bool, optional): Iterate in order task was submitted.
@@ -73,50 +74,49 @@ class TaskManager:
         Yields:
             Any: result from submitted task.
         """
-        _results = [None] * self.processes_used
-        yielded = -1
-        unyielded = []
+        pending = self.connections[: self.processes_used]
         exception = None
 
-        for _ in range(self.processes_used):
-            result, idx, no_return = self.result_receiver.recv()
+        while pending:
+            if ordered:
+                ready, pending = pending[:1], pending[1:]
+            else:
+                ready = wait(pending)
+                pending = [
+                    connection for connection in pending if connection not in ready
+                ]
 
-            # if exception is raised
-            if exception:
-                continue
+            for connection in ready:
+                result, id, no_return, elapsed = connection.recv()  # type: ignore
+                self.busy_times[id - 1] += elapsed
 
-            # if result is excpetion
-            if raise_error and isinstance(result, BaseException):
-                exception = result
-                continue
+                # if exception is raised
+                if exception:
+                    continue
 
-            # if yield in order as submitted
-            if ordered:
+                # if result is excpetion
+                if raise_error and isinstance(result, BaseException):
+                    exception = result
+                    continue
 
-                # if result is next in order
-                if idx - 1 == yielded:
-                    yielded = idx
-                    if not no_return:
-                        yield result
-
-                    # search if there are next in order results already received
-                    while unyielded and unyielded[-1] - 1 == yielded:
-                        yielded = unyielded.pop()
-                        result, no_return = _results[yielded]
-                        if not no_return:
-                            yield result
-
-                # result is not next in order
-                else:
-                    unyielded.append(idx)
-                    unyielded.sort(reverse=True)
-                    _results[idx] = (result, no_return)
-
-            # if results are not ordered
-            else:
                 if not no_return:
                     yield result
 
         # if exception should be raised
         if exception:
             raise exception
+
+    def gather(self, ordered: bool = True) -> list[Any]:
+        """Get results of all tasks.
+
+        Args:
+            ordered (bool, optional): In order tasks were submitted, otherwise
+                in order they were finished. Defaults to True.
+
+        Raises:
+            exception: If task raised exception.
+
+        Returns:
+            list[Any]: Results.
+        """
+        return list(self.results(ordered))
@@ -1,6 +1,8 @@
+from logging import DEBUG
 from multiprocessing import current_process
 from multiprocessing.connection import Connection
-from typing import Callable
+from time import perf_counter
+from typing import Any, Callable, Iterable
 
 from utils import Logger
 
@@ -8,15 +10,23 @@ from .exceptions import UnknownFunctionError
 
 log = Logger(__name__)
 
+STATE: dict[str, Any] = {}  # type: ignore
+"""Worker local state registered by `ProcessManager.register_state`."""
 
-def worker(receiver: Connection, sender: Connection, id: int) -> None:
+
+def worker(
+    connection: Connection, id: int, initializer: Callable[[int], None] | None
+) -> None:
     """Infinite function that runs on seperate process. Collects and
     executes task given by another process and optionaly returns task results.
+    Result is sent with process identification number and task duration.
+    Stops when `None` is received.
 
     Args:
-        receiver (Connection): Task receiving socket.
-        sender (Connection): Result sending socket.
+        connection (Connection): Task receiving and result sending socket.
         id (int): Process identification number.
+        initializer (Callable[[int], None] | None): Function called with
+            ``id`` before receiving tasks.
     """
 
     def inject_function(function: Callable) -> None:
@@ -41,64 +51,116 @@ def worker(receiver: Connection, sender: Connection, id: int) -> None:
         """
         raise UnknownFunctionError(f"Unknown function: {function_name!r}")
 
-    def receive_task() -> tuple[Callable, list, dict, bool]:
-        """Receive task through `receiver` socket.
+    def receive_task() -> tuple[Callable, list, dict, bool] | None:
+        """Receive task through `connection` socket.
 
         Returns:
-            tuple[Callable, list, dict, bool]: Function to be executed,
-                arguments, keyword arguments and do not return result flag.
+            tuple[Callable, list, dict, bool] | None: Function to be executed,
+                arguments, keyword arguments and do not return result flag
+                or `None` if worker should stop.
         """
-        received = receiver.recv()
+        received = connection.recv()
+        if received is None:
+            return None
+
         func, args, kwargs, no_return = received
+        if callable(func):
+            return func, args, kwargs, no_return
 
         try:
             return functions[func], args, kwargs, no_return
         except KeyError as error:
             return raise_unknown_function, [error.args[0]], {}, False
 
+    if initializer is not None:
+        initializer(id)
+
     log.debug(f"Started [bold default]{current_process().name}[/].")
 
     functions = {"inject_function": inject_function}
 
+    # task representations are built only for debug logs
+    debug = log.isEnabledFor(DEBUG)
+
     while True:
-        func, args, kwargs, no_return = receive_task()
-
-        # logging variables
-        args_repr = []
-        for arg in args:
-            try:
-                if len(arg) > 10 and not isinstance(arg, str):
-                    args_repr.append(str(type(arg)))
-                else:
-                    args_repr.append(repr(arg))
-            except TypeError:
-                args_repr.append(repr(arg))
-
-        kwargs_repr = []
-        for key, value in kwargs.items():
-            try:
-                if len(value) > 10 and not isinstance(value, str):
-                    kwargs_repr.append(f"{key}={type(value)}")
-                else:
-                    kwargs_repr.append(f"{key}={value!r}")
-            except TypeError:
-                kwargs_repr.append(f"{key}={value!r}")
-
-        kwargs_repr = [f"{key}={value!r}" for key, value in kwargs.items()]
-        args_kwargs = ", ".join(args_repr + kwargs_repr)
+        task = receive_task()
+        if task is None:
+            break
 
+        func, args, kwargs, no_return = task
+
+        start = perf_counter()
         try:
             result = func(*args, **kwargs)
-            try:
-                if len(result) > 10 and not isinstance(result, str):
-                    result_repr = str(type(result))
-                else:
-                    result_repr = repr(result)
-            except TypeError:
-                result_repr = repr(result)
-            log.debug(f"{func.__name__}({args_kwargs}) [bold green]->[/] {result_repr}")
+            elapsed = perf_counter() - start
+            if debug:
+                log.debug(
+                    f"{func.__name__}({_args_repr(args, kwargs)}) [bold green]->[/] "
+                    f"{_short_repr(result)} in {elapsed:.6f}s"
+                )
         except BaseException as error:
             result = error
-            log.debug(f"{func.__name__}({args_kwargs}) [bold red]->[/] {result!r}")
+            elapsed = perf_counter() - start
+            if debug:
+                log.debug(
+                    f"{func.__name__}({_args_repr(args, kwargs)}) "
+                    f"[bold red]->[/] {result!r}"
+                )
+
+        connection.send((result, id, no_return, elapsed))
+
+
+def _short_repr(value: Any) -> str:
+    """Representation of ``value`` or only its type if it's long collection."""
+    try:
+        if len(value) > 10 and not isinstance(value, str):
+            return str(type(value))
+    except TypeError:
+        pass
+
+    return repr(value)
+
+
+def _args_repr(args: Iterable, kwargs: dict[str, Any]) -> str:
+    return ", ".join(
+        [_short_repr(arg) for arg in args]
+        + [f"{key}={_short_repr(value)}" for key, value in kwargs.items()]
+    )
+
+
+def call_chunk(func: Callable, chunk: Iterable) -> list:
+    """Call ``func`` with every item of ``chunk``.
+
+    Args:
+        func (Callable): Function.
+        chunk (Iterable): Items.
+
+    Returns:
+        list: Results.
+    """
+    return [func(item) for item in chunk]
+
+
+def set_state(name: str, value: Any) -> None:
+    """Register worker local state under ``name``.
+
+    Args:
+        name (str): State name.
+        value (Any): State.
+    """
+    STATE[name] = value
+
 
-        sender.send((result, id, no_return))
+def get_state(name: str) -> Any:
+    """Get worker local state registered under ``name``.
+
+    Args:
+        name (str): State name.
+
+    Raises:
+        KeyError: If state isn't registered.
+
+    Returns:
+        Any: State.
+    """
+    return STATE[name]
@@ -0,0 +1,358 @@
+from decimal import Decimal
+from fractions import Fraction
+from math import isqrt
+from random import Random
+from time import perf_counter
+from typing import Any, Callable
+
+from rich import print
+from rich.table import Table
+from rich.traceback import install
+
+from arbitrage import calculator, exact
+from arbitrage.exceptions import BigNumberError
+from utils import CONFIG, MIN_GAS_LIMITS
+from utils._types import Pools
+
+install(extra_lines=6, show_locals=True)
+
+SEED = 0
+TOKENS = 30
+POOLS = 600
+AMOUNTS = 5
+FEE_NUMERATORS = (9970, 9975, 9980, 9990, 9999)
+MAX_UINT112 = 2**112 - 1
+
+GAS_PRICE = Decimal(3_000_000_000)
+
+
+def main():
+    rnd = Random(SEED)
+    pools, tokens = create_pools(rnd)
+    paths = create_paths(pools, tokens[:3])
+    print(f"Generated {len(pools):,} pools and {len(paths):,} paths.")
+
+    table = Table("Function", "Backend", "Checks", "Mismatches", "Paths/s")
+
+    for backend, module in (("decimal", calculator), ("int", exact)):
+        table.add_row(
+            "get_virtual_reserves",
+            backend,
+            *check_virtual_reserves(pools, paths, module),
+        )
+        table.add_row(
+            "optimal_amount_in", backend, *check_optimal_amount_in(pools, paths, module)
+        )
+        table.add_row(
+            "get_path_amount_out",
+            backend,
+            *check_path_amount_out(pools, paths, module, rnd),
+        )
+
+    for backend in calculator.BRUTO_PROFIT_BACKENDS:
+        table.add_row(
+            "calculate_profitability",
+            backend,
+            *check_profitability(pools, paths, tokens, backend),
+        )
+
+    print(table)
+
+
+def create_pools(rnd: Random) -> tuple[Pools, list[str]]:
+    """Create random pools with prices close to arbitrage free. Reserves and
+    fee numerators are `int`, same as in pools of workers."""
+    tokens = [f"0x{i:040x}" for i in range(1, TOKENS + 1)]
+    prices = {token: 10 ** rnd.uniform(-3, 3) for token in tokens}
+
+    pools: Pools = {}
+    for i in range(POOLS):
+        token0, token1 = rnd.sample(tokens, 2)
+        reserve0 = int(10 ** rnd.uniform(15, 27))
+        reserve1 = int(
+            reserve0 * prices[token0] / prices[token1] * rnd.uniform(0.99, 1.01)
+        )
+        if reserve1 <= 0 or reserve1 > MAX_UINT112:
+            continue
+
+        pools[f"0x{i + 1:040x}"[::-1]] = {
+            token0: reserve0,
+            token1: reserve1,
+            "fee_type": "fixed",
+            "fee_numerator": rnd.choice(FEE_NUMERATORS),
+        }
+
+    return pools, tokens
+
+
+def create_paths(pools: Pools, start_tokens: list[str]) -> list[tuple[str, ...]]:
+    """Create all 2 and 3 pool paths starting with ``start_tokens``."""
+    graph: dict[str, dict[str, list[str]]] = {}  # type: ignore
+    for address, pool in pools.items():
+        token0, token1 = [token for token, _ in zip(pool, range(2))]
+        graph.setdefault(token0, {}).setdefault(token1, []).append(address)
+        graph.setdefault(token1, {}).setdefault(token0, []).append(address)
+
+    paths = []
+    for token in start_tokens:
+        for token1, pools1 in graph.get(token, {}).items():
+            for pool1 in pools1:
+                for pool2 in graph[token1].get(token, []):
+                    if pool2 != pool1:
+                        paths.append((token, pool1, token1, pool2, token))
+
+                for token2, pools2 in graph[token1].items():
+                    if token2 == token:
+                        continue
+
+                    for pool2 in pools2:
+                        for pool3 in graph[token2].get(token, []):
+                            if len({pool1, pool2, pool3}) == 3:
+                                paths.append(
+                                    (token, pool1, token1, pool2, token2, pool3, token)
+                                )
+
+    return [path for path in paths if len(path) < len(MIN_GAS_LIMITS)]
+
+
+# reference pair implementation
+
+
+def pair_swap(amount_in: int, reserve_in: int, reserve_out: int, fee: int) -> int:
+    """`UniswapV2Pair.swap` with amount out from `UniswapV2Library.getAmountOut`.
+
+    Raises:
+        BigNumberError: If pair would revert.
+    """
+    if amount_in <= 0 or reserve_in + amount_in > MAX_UINT112:
+        raise BigNumberError()
+
+    amount_in_with_fee = amount_in * fee
+    amount_out = (
+        amount_in_with_fee * reserve_out // (reserve_in * 10_000 + amount_in_with_fee)
+    )
+    if amount_out >= reserve_out:
+        raise BigNumberError()
+
+    # K invariant check of the pair
+    balance_in = reserve_in + amount_in
+    balance_out = reserve_out - amount_out
+    adjusted_in = balance_in * 10_000 - amount_in * (10_000 - fee)
+    adjusted_out = balance_out * 10_000
+    assert adjusted_in * adjusted_out >= reserve_in * reserve_out * 10_000**2
+
+    return amount_out
+
+
+def ref_path_amount_out(amount_in: int, pools: Pools, path: tuple[str, ...]) -> int:
+    for i in range(1, len(path), 2):
+        pool = pools[path[i]]
+        amount_in = pair_swap(
+            amount_in,
+            int(pool[path[i - 1]]),
+            int(pool[path[i + 1]]),
+            int(pool["fee_numerator"]),
+        )
+
+    return amount_in
+
+
+def ref_virtual_reserves(
+    pools: Pools, path: tuple[str, ...]
+) -> tuple[Fraction, Fraction, Fraction]:
+    """Exact virtual reserves and bound of relative error of floored folds.
+
+    Flooring fold by 1 wei changes its result by ``1 / result`` relatively
+    and every next fold keeps relative error, so errors of folds add up.
+    """
+    pool = pools[path[1]]
+    virtual_in, virtual_out = Fraction(int(pool[path[0]])), Fraction(int(pool[path[2]]))
+    error = Fraction(0)
+
+    for i in range(3, len(path), 2):
+        pool = pools[path[i]]
+        fee = int(pool["fee_numerator"])
+        reserve_in, reserve_out = int(pool[path[i - 1]]), int(pool[path[i + 1]])
+
+        denominator = 10_000 * reserve_in + fee * virtual_out
+        virtual_in = 10_000 * virtual_in * reserve_in / denominator
+        virtual_out = fee * virtual_out * reserve_out / denominator
+
+        # floored virtual out also changes denominator of next fold
+        error += 2 / max(virtual_in, 1) + 2 / max(virtual_out, 1)
+
+    return virtual_in, virtual_out, error
+
+
+def ref_optimal_amount_in(reserve_in: int, reserve_out: int, fee: int) -> int:
+    """Integer maximising `fee * x * reserve_out / (reserve_in * 10_000 + fee * x) - x`."""
+    amount_in = (
+        isqrt(reserve_in * reserve_out * fee * 10_000) - reserve_in * 10_000
+    ) // fee
+
+    def profit(x: int) -> Fraction:
+        return Fraction(fee * x * reserve_out, reserve_in * 10_000 + fee * x) - x
+
+    return max((amount_in, amount_in + 1), key=profit)
+
+
+def ref_best_profit(pools: Pools, path: tuple[str, ...], amount_in: int) -> int:
+    """Best exact profit in neighbourhood of ``amount_in`` (golden section search)."""
+
+    def profit(x: int) -> int:
+        try:
+            return ref_path_amount_out(x, pools, path) - x
+        except BigNumberError:
+            return -x
+
+    low, high = 1, max(amount_in * 2, 3)
+    while high - low > 64:
+        third = (high - low) // 3
+        if profit(low + third) < profit(high - third):
+            low += third
+        else:
+            high -= third
+
+    return max(profit(x) for x in range(low, high + 1))
+
+
+# checks
+
+
+def run(
+    paths: list[tuple[str, ...]], function: Callable[[tuple[str, ...]], Any]
+) -> tuple[list[Any], float]:
+    """Run ``function`` for every path and get results and paths per second."""
+    start = perf_counter()
+    results = [function(path) for path in paths]
+
+    return results, len(paths) / (perf_counter() - start)
+
+
+def report(checks: int, mismatches: int, speed: float) -> tuple[str, str, str]:
+    return f"{checks:,}", f"{mismatches:,}", f"{speed:,.0f}"
+
+
+def check_virtual_reserves(pools: Pools, paths: list[tuple[str, ...]], module):
+    results, speed = run(paths, lambda path: module.get_virtual_reserves(pools, path))
+
+    # every fold can be rounded by 1 wei, which is scaled by next folds
+    mismatches = 0
+    for path, reserves in zip(paths, results):
+        *references, error = ref_virtual_reserves(pools, path)
+        for reserve, reference in zip(reserves, references):
+            if abs(int(reserve) - reference) > 1 + reference * error:
+                mismatches += 1
+                break
+
+    return report(len(paths), mismatches, speed)
+
+
+def check_optimal_amount_in(pools: Pools, paths: list[tuple[str, ...]], module):
+    args = []
+    for path in paths:
+        reserve_in, reserve_out = exact.get_virtual_reserves(pools, path)
+        if reserve_in < reserve_out:
+            args.append((reserve_in, reserve_out, int(pools[path[1]]["fee_numerator"])))
+
+    results, speed = run(
+        args,
+        lambda arg: module.optimal_amount_in(
+            *[module_number(module, value) for value in arg]
+        ),
+    )
+
+    mismatches = sum(
+        abs(int(amount_in) - ref_optimal_amount_in(*arg)) > 1
+        for arg, amount_in in zip(args, results)
+    )
+
+    return report(len(args), mismatches, speed)
+
+
+def check_path_amount_out(
+    pools: Pools, paths: list[tuple[str, ...]], module, rnd: Random
+):
+    amounts = {
+        path: [
+            rnd.randint(1, int(pools[path[1]][path[0]]) // 10) for _ in range(AMOUNTS)
+        ]
+        for path in paths
+    }
+
+    def get_amounts_out(path: tuple[str, ...]) -> list[int | None]:
+        amounts_out = []
+        for amount_in in amounts[path]:
+            try:
+                amounts_out.append(
+                    int(
+                        module.get_path_amount_out(
+                            module_number(module, amount_in), pools, path
+                        )
+                    )
+                )
+            except BigNumberError:
+                amounts_out.append(None)
+
+        return amounts_out
+
+    results, speed = run(paths, get_amounts_out)
+
+    # amounts rejected by backend are not compared
+    checks = mismatches = 0
+    for path, amounts_out in zip(paths, results):
+        for amount_in, amount_out in zip(amounts[path], amounts_out):
+            if amount_out is None:
+                continue
+
+            checks += 1
+            try:
+                mismatches += amount_out != ref_path_amount_out(amount_in, pools, path)
+            except BigNumberError:
+                mismatches += 1
+
+    return report(checks, mismatches, speed * AMOUNTS)
+
+
+def check_profitability(
+    pools: Pools, paths: list[tuple[str, ...]], tokens: list[str], backend: str
+):
+    """Bruto profit of every arbitrage has to be reproduced by the pair and
+    has to be the best profit in its neighbourhood."""
+    CONFIG["calculator"]["backend"] = backend
+    weth_prices = {token: Decimal(1) for token in tokens}
+
+    start = perf_counter()
+    arbs = calculator.calculate_profitability(
+        pools,
+        paths,
+        GAS_PRICE,
+        GAS_PRICE * 2,
+        GAS_PRICE * 3,
+        GAS_PRICE * 10,
+        weth_prices,
+    )
+    speed = len(paths) / (perf_counter() - start)
+
+    mismatches = 0
+    for arb in arbs:
+        amount_in = int(arb.amount_in)
+        profit = ref_path_amount_out(amount_in, pools, arb.path) - amount_in
+
+        if profit != arb.bruto_profit:
+            mismatches += 1
+        elif ref_best_profit(pools, arb.path, amount_in) > profit * (1 + 1e-9):
+            mismatches += 1
+
+    return report(len(arbs), mismatches, speed)
+
+
+def module_number(module, value: int) -> int | Decimal:
+    return Decimal(value) if module is calculator else value
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (SystemExit, KeyboardInterrupt):
+        print()
@@ -0,0 +1,217 @@
+from array import array
+from decimal import Decimal
+from multiprocessing import Manager
+from multiprocessing.managers import SyncManager, ValueProxy
+from multiprocessing.pool import Pool
+from multiprocessing.synchronize import Lock
+from random import Random
+from time import perf_counter
+from typing import Callable
+
+from rich import print
+from rich.table import Table
+from rich.traceback import install
+
+from processes import ProcessManager
+from utils._types import Pools
+
+install(extra_lines=6, show_locals=True)
+
+SEED = 0
+WORKERS = 4
+TOKENS = 50
+POOLS = 20_000
+PATHS = 40_000
+CHANGED = 200
+ROUNDS = 10
+
+ID: int = 0
+WORKER_POOLS: Pools = {}
+
+
+def main():
+    rnd = Random(SEED)
+    pools = create_pools(rnd)
+    paths = create_paths(pools, rnd)
+    print(
+        f"Generated {len(pools):,} pools and {len(paths):,} paths "
+        f"for {WORKERS} workers."
+    )
+
+    updates = [
+        {address: pools[address] for address in rnd.sample(list(pools), CHANGED)}
+        for _ in range(ROUNDS)
+    ]
+    chunks = [paths[i::WORKERS] for i in range(WORKERS)]
+
+    manager, pool = create_manager_pool()
+    try:
+        manager_times = run_rounds(
+            lambda: manager_share_pools(manager, pool, pools),
+            lambda changed: manager_update_pools(manager, pool, changed),
+            lambda: pool.starmap(search_chunk, [(chunk,) for chunk in chunks]),
+            updates,
+        )
+    finally:
+        pool.terminate()
+        manager.shutdown()
+
+    process_pool = ProcessManager(WORKERS, init_worker, no_singleton=True)
+    try:
+        process_pool.pop_busy_times()
+        engine_times = run_rounds(
+            lambda: process_pool.broadcast(share_pools, pools),
+            lambda changed: process_pool.broadcast(update_pools, changed),
+            lambda: process_pool.scatter(search_chunk, [(chunk,) for chunk in chunks]),
+            updates,
+        )
+        busy_times = process_pool.pop_busy_times()
+    finally:
+        process_pool.kill()
+
+    table = Table("Call", "manager.Pool (ms)", "ProcessManager (ms)", "Speedup")
+    for call, manager_time in manager_times.items():
+        engine_time = engine_times[call]
+        table.add_row(
+            call,
+            f"{manager_time * 1000:,.2f}",
+            f"{engine_time * 1000:,.2f}",
+            f"{manager_time / engine_time:,.1f}x",
+        )
+    print(table)
+
+    print(
+        "ProcessManager worker busy time: "
+        + ", ".join(f"{id}: {busy:.3f}s" for id, busy in enumerate(busy_times, 1))
+    )
+
+
+def run_rounds(
+    share: Callable[[], object],
+    update: Callable[[Pools], object],
+    search: Callable[[], list],
+    updates: list[Pools],
+) -> dict[str, float]:
+    """Run call pattern of main loop and get mean duration of every call."""
+    start = perf_counter()
+    share()
+    times = {"share_pools": perf_counter() - start}
+
+    update_time = search_time = 0.0
+    for changed in updates:
+        start = perf_counter()
+        update(changed)
+        update_time += perf_counter() - start
+
+        start = perf_counter()
+        search()
+        search_time += perf_counter() - start
+
+    times["update_pools"] = update_time / len(updates)
+    times["search_arbs"] = search_time / len(updates)
+
+    return times
+
+
+def create_pools(rnd: Random) -> Pools:
+    tokens = [f"0x{i:040x}" for i in range(1, TOKENS + 1)]
+
+    pools: Pools = {}
+    for i in range(POOLS):
+        token0, token1 = rnd.sample(tokens, 2)
+        pools[f"0x{i + 1:040x}"[::-1]] = {
+            token0: Decimal(int(10 ** rnd.uniform(15, 27))),
+            token1: Decimal(int(10 ** rnd.uniform(15, 27))),
+            "fee_type": "fixed",
+            "fee_numerator": Decimal(9975),
+        }
+
+    return pools
+
+
+def create_paths(pools: Pools, rnd: Random) -> list[tuple[str, ...]]:
+    """Create random 3 pool paths, tokens aren't connected."""
+    addresses = list(pools)
+    return [tuple(rnd.sample(addresses, 3)) for _ in range(PATHS)]
+
+
+# worker functions
+
+
+def init_worker(id: int) -> None:
+    global ID
+    ID = id
+
+
+def share_pools(pools: Pools) -> None:
+    global WORKER_POOLS
+    WORKER_POOLS = pools
+
+
+def update_pools(pools: Pools) -> None:
+    WORKER_POOLS.update(pools)
+
+
+def search_chunk(paths: list[tuple[str, ...]]) -> int:
+    """Stand-in for path calculation: product of fee numerators of path."""
+    found = 0
+    for path in paths:
+        product = Decimal(1)
+        for address in path:
+            product *= WORKER_POOLS[address]["fee_numerator"] / 10_000
+        found += product > Decimal("0.9")
+
+    return found
+
+
+# previous manager pool with busy-wait barriers
+
+
+def create_manager_pool() -> tuple[SyncManager, Pool]:
+    manager: SyncManager = Manager()
+    counter = manager.Value("i", 1)
+    lock = manager.Lock()
+
+    pool = manager.Pool(WORKERS, init_manager_worker, [counter, lock])
+
+    return manager, pool
+
+
+def init_manager_worker(counter: ValueProxy, lock: Lock) -> None:
+    global ID
+    with lock:
+        ID = counter.value
+        counter.value += 1
+
+
+def manager_share_pools(manager: SyncManager, pool: Pool, pools: Pools) -> None:
+    finish_arr = manager.Array("i", [0] * WORKERS)
+    for _ in pool.starmap(
+        wait_for_all, [(share_pools, pools, finish_arr) for _ in range(WORKERS)]
+    ):
+        pass
+
+
+def manager_update_pools(manager: SyncManager, pool: Pool, pools: Pools) -> None:
+    finish_arr = manager.Array("i", [0] * WORKERS)
+    for _ in pool.starmap(
+        wait_for_all, [(update_pools, pools, finish_arr) for _ in range(WORKERS)]
+    ):
+        pass
+
+
+def wait_for_all(func: Callable[[Pools], None], pools: Pools, finish_arr: array):
+    """Call ``func`` and wait until every worker called it, so every worker
+    gets exactly one task."""
+    func(pools)
+
+    finish_arr[ID - 1] = 1
+    while not all(finish_arr):
+        continue
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (SystemExit, KeyboardInterrupt):
+        print()
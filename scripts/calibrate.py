@@ -0,0 +1,59 @@
+from rich import print
+from rich.table import Table
+from rich.traceback import install
+
+import blockchain
+import persistance
+from core import PricePollInterval, calibration, loader, processes
+from utils import CONFIG
+
+install(extra_lines=6, show_locals=True)
+
+
+def main():
+    network = CONFIG["blockchain"]["name"]
+    price = PricePollInterval(start=True)
+
+    pools, _, _, blacklist_paths, _, _ = loader.load_data()
+    _, path_store = loader.build_paths(pools, blacklist_paths, None)
+
+    # calibrating needs all workers it can choose from
+    process_pool = processes.fork_process_pool(network, pools, path_store)
+    try:
+        new_calibration = calibration.calibrate(
+            process_pool,
+            network,
+            path_store,
+            price.wait_gas_prices(),
+            blockchain.get_weth_prices(),
+        )
+    finally:
+        process_pool.kill()
+        processes.close_reserves()
+        price.kill()
+
+    persistance.save_calibration(new_calibration)
+
+    table = Table("Workers", "Chunk size", "Time (ms)")
+    for workers, chunk_size, seconds in new_calibration["timings"]:
+        picked = (workers, chunk_size) == (
+            new_calibration["workers"],
+            new_calibration["chunk_size"],
+        )
+        style = "b green" if picked else None
+        table.add_row(
+            str(workers), str(chunk_size), f"{seconds * 1000:,.2f}", style=style
+        )
+    print(table)
+
+    print(
+        f"Picked {new_calibration['workers']} workers and chunks of "
+        f"{new_calibration['chunk_size']} paths for {len(path_store):,} paths."
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (SystemExit, KeyboardInterrupt):
+        print()
@@ -0,0 +1,224 @@
+import pickle
+from decimal import Decimal
+from random import Random
+
+from rich import print
+from rich.table import Table
+from rich.traceback import install
+
+import path
+from core import loader, processes
+from core.reserves import ReservesTable
+from path.builder import find_paths
+from utils import CONFIG, PoolTable
+from utils._types import Pools
+
+install(extra_lines=6, show_locals=True)
+
+SEED = 0
+WORKERS = 2
+TOKENS = 12
+POOLS = 120
+WETHS = 2
+LENGTH = 3
+ROUNDS = 50
+SPARSE_POOLS = 16
+NEW_POOLS = 2
+REPLACED_POOLS = 10
+NETWORK = "consistency"
+
+
+def main():
+    rnd = Random(SEED)
+    tokens = [f"0x{i:040x}" for i in range(1, TOKENS + 1)]
+
+    # paths of two weths, so paths can end with other weth
+    CONFIG["weths"] = tokens[:WETHS]
+    CONFIG["paths"]["tokens"] = tokens[:WETHS]
+    CONFIG["paths"]["length"] = LENGTH
+    CONFIG["paths"]["ignored"] = []
+    CONFIG["paths"]["mode"] = "paths"
+    CONFIG["paths"]["persist"] = False
+
+    table = Table("Check", "Checks", "Mismatches")
+    table.add_row("worker path ids", *report(*check_worker_path_ids(rnd, tokens)))
+    table.add_row("incremental paths", *report(*check_incremental_paths(rnd, tokens)))
+    table.add_row("reserves rows reuse", *report(*check_reserves_rows(rnd, tokens)))
+
+    print(table)
+
+
+def create_pools(rnd: Random, tokens: list[str], count: int, start: int = 0) -> Pools:
+    """Create random pools between ``tokens``."""
+    pools: Pools = {}
+    for i in range(start, start + count):
+        token0, token1 = rnd.sample(tokens, 2)
+        pools[f"0x{i + 1:040x}"[::-1]] = {
+            token0: Decimal(rnd.randint(10**18, 10**24)),
+            token1: Decimal(rnd.randint(10**18, 10**24)),
+            "fee_type": "fixed",
+            "fee_numerator": Decimal(9975),
+        }
+
+    return pools
+
+
+def report(checks: int, mismatches: int) -> tuple[str, str]:
+    mismatches_s = f"[b red]{mismatches:,}[/]" if mismatches else "0"
+    return f"{checks:,}", mismatches_s
+
+
+def check_worker_path_ids(rnd: Random, tokens: list[str]) -> tuple[int, int]:
+    """Blacklist paths and remove pools without adding any, then compare path
+    ids of main process and worker."""
+    pools = PoolTable(create_pools(rnd, tokens, POOLS))
+    blacklist_paths: set[tuple[str, ...]] = set()  # type: ignore
+
+    process_pool = processes.create_process_pool(WORKERS)
+    try:
+        graph, path_store = loader.build_paths(pools, blacklist_paths, process_pool)
+        processes.share_pools(process_pool, NETWORK, pools)
+        processes.share_paths(process_pool, NETWORK, path_store)
+        paths = path_store.get_paths(path_store.alive.nonzero()[0])
+
+        blacklist_paths.update(rnd.sample(paths, len(paths) // 10))
+        processes.remove_blacklisted(process_pool, path_store, blacklist_paths, NETWORK)
+
+        removed_pools = {
+            address: dict(pools[address]) for address in rnd.sample(list(pools), 5)
+        }
+        for address in removed_pools:
+            del pools[address]
+        new_paths = loader.update_paths(
+            pools, graph, path_store, {}, removed_pools, blacklist_paths
+        )
+        processes.update_paths(
+            process_pool, NETWORK, {}, list(removed_pools), new_paths
+        )
+
+        main_ids = get_path_ids(path_store, paths)
+        worker_ids = process_pool.broadcast(_get_worker_path_ids, paths)
+    finally:
+        process_pool.kill()
+        processes.close_reserves()
+
+    mismatches = sum(ids != main_ids for ids in worker_ids)
+    return len(worker_ids), mismatches
+
+
+def check_incremental_paths(rnd: Random, tokens: list[str]) -> tuple[int, int]:
+    """Compare paths built through new pools with all paths through them on
+    sparse graphs, where start tokens are far from new pools."""
+    weths = tokens[:WETHS]
+    weth1, weth2, token_a, token_b = tokens[:2] + tokens[WETHS : WETHS + 2]
+
+    # last hop of path is new pool into other weth
+    samples = [
+        (
+            create_pool(weth1, token_a, 1) | create_pool(token_a, token_b, 2),
+            create_pool(token_b, weth2, 3),
+        )
+    ]
+    for _ in range(ROUNDS):
+        samples.append(
+            (
+                create_pools(rnd, tokens, SPARSE_POOLS),
+                create_pools(rnd, tokens, NEW_POOLS, SPARSE_POOLS),
+            )
+        )
+
+    mismatches = 0
+    for pools, new_pools in samples:
+        graph = path.build_graph(pools | new_pools)
+
+        all_paths = set()
+        for token in set(weths) & set(graph):
+            all_paths.update(
+                find_paths(graph, token, set(weths), LENGTH * 2 - 1, set(), set())
+            )
+        expected = {
+            full_path
+            for full_path in all_paths
+            if any(full_path[i] in new_pools for i in range(1, len(full_path), 2))
+        }
+
+        new_paths = path.build_new_paths(graph, weths, LENGTH, set(), set(), new_pools)
+        mismatches += len(new_paths) != len(expected) or set(new_paths) != expected
+
+    return len(samples), mismatches
+
+
+def check_reserves_rows(rnd: Random, tokens: list[str]) -> tuple[int, int]:
+    """Remove and add same number of pools to full reserves table in rounds,
+    then check that table wasn't resized, added pools got freed rows and
+    reader gets their reserves."""
+    pools = create_pools(rnd, tokens, POOLS)
+    table = ReservesTable(pools, capacity=len(pools))
+
+    checks = mismatches = 0
+    try:
+        for start in range(POOLS, POOLS + ROUNDS * REPLACED_POOLS, REPLACED_POOLS):
+            removed = rnd.sample(list(pools), REPLACED_POOLS)
+            freed_rows = {table.rows[address] for address in removed}
+            for address in removed:
+                del pools[address]
+            added_pools = create_pools(rnd, tokens, REPLACED_POOLS, start)
+            pools.update(added_pools)
+
+            table.remove_pools(removed)
+            resized = table.add_pools(added_pools)
+            added_rows = {table.rows[address] for address in added_pools}
+
+            # reader gets table same as worker
+            reader = pickle.loads(pickle.dumps(table))
+            reader_pools = {
+                address: dict(pool) for address, pool in added_pools.items()
+            }
+            changed_pools, _ = reader.read(reader_pools, table.version - 1)
+            reader.close()
+
+            checks += 1
+            mismatches += (
+                resized
+                or added_rows != freed_rows
+                or changed_pools.keys() != added_pools.keys()
+                or any(
+                    int(reserve) != int(added_pools[address][key])
+                    for address, pool in changed_pools.items()
+                    for key, reserve in pool.items()
+                    if key != "fee_type"
+                )
+            )
+    finally:
+        table.close()
+
+    return checks, mismatches
+
+
+def create_pool(token0: str, token1: str, number: int) -> Pools:
+    return {
+        f"0x{number:040x}": {
+            token0: Decimal(10**21),
+            token1: Decimal(10**21),
+            "fee_type": "fixed",
+            "fee_numerator": Decimal(9975),
+        }
+    }
+
+
+def get_path_ids(
+    path_store: path.PathStore, paths: list[tuple[str, ...]]
+) -> tuple[int, list[int | None]]:
+    """Number of rows of ``path_store`` and ids of ``paths``."""
+    return len(path_store.lengths), [path_store.find_path_id(p) for p in paths]
+
+
+def _get_worker_path_ids(paths: list[tuple[str, ...]]) -> tuple[int, list[int | None]]:
+    return get_path_ids(processes.PATHS[NETWORK], paths)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (SystemExit, KeyboardInterrupt):
+        print()
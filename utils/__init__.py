@@ -5,4 +5,5 @@ from .gasrange import GasPriceRange
 from .logger import LEVELNUMBER_TO_COLORED_NAME, Logger, str_num, str_obj
 from .min_gas_limit import MIN_GAS_LIMITS
 from .min_liquidity import MIN_LIQUIDITY, PRICES
+from .pool_table import PoolTable
 from .timer import BlockTime, TimePassed, WaitPrevious, execution_time, measure_time
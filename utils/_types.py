@@ -6,9 +6,35 @@ from eth_typing import ChecksumAddress
 from .datastructures import SecretStr
 
 
+class Dispatch(TypedDict):
+    adaptive: bool
+    path_cost: float
+    worker_cost: float
+    smoothing: float
+
+
+class CalibrationConf(TypedDict):
+    at_startup: bool
+    sample: int
+    repeats: int
+    chunk_sizes: list[int]
+    tolerance: float
+    max_path_ratio: int | float
+
+
 class Multiprocessing(TypedDict):
     workers: int
     min_chunk: int
+    chunk_size: int
+    fork_after_load: bool
+    deadline: int | float
+    dispatch: Dispatch
+    calibration: CalibrationConf
+
+
+class CalculatorConf(TypedDict):
+    backend: str
+    screen: bool
 
 
 class TransactionConf(TypedDict):
@@ -88,9 +114,16 @@ class EventLog(TypedDict):
     block_time: int
 
 
+class MulticallConcurrency(TypedDict):
+    sync: int
+    main: int
+    other: int
+
+
 class Multicall(TypedDict):
     address: ChecksumAddress
     size: int
+    concurrency: MulticallConcurrency
 
 
 class Filter(TypedDict):
@@ -99,6 +132,9 @@ class Filter(TypedDict):
 
 
 class Paths(TypedDict):
+    mode: str
+    incremental: bool
+    persist: bool
     length: int
     tokens: list[ChecksumAddress]
     ignored: list[ChecksumAddress]
@@ -146,6 +182,7 @@ class ConfigDict(TypedDict):
     """
     download_pools: bool
     multiprocessing: Multiprocessing
+    calculator: CalculatorConf
     max_retries: int
     timeout: int | float
     transaction: TransactionConf
@@ -241,6 +278,19 @@ Pools = dict[str, Pool]
 """
 
 
+EdgeWeights = dict[str, dict[str, float]]
+"""Mapping of pool address to token in address to log edge weight
+`log(reserve_out * fee / reserve_in)`.
+
+    Example::
+        >>> edge_weights["0x804678fa97d91B974ec2af3c843270886528a9E6"]
+        {
+            '0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c': 5.4473,
+            '0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56': -5.4577
+        }
+"""
+
+
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 """EVM address with all zeroes."""
 
@@ -399,3 +449,14 @@ class BalanceStats(TypedDict):
     router: list[TokenBalance]
     bnb_price: float
     burners: int
+
+
+class Calibration(TypedDict):
+    key: dict[str, int]
+    path_count: int
+    workers: int
+    chunk_size: int
+    path_cost: float
+    worker_cost: float
+    # worker count, chunk size and seconds of every measured configuration
+    timings: list[tuple[int, int, float]]
@@ -0,0 +1,280 @@
+from collections.abc import MutableMapping
+from decimal import Decimal
+from typing import Any, Iterator
+
+import numpy as np
+
+from ._types import Pool, Pools
+
+MASK_64 = 2**64 - 1
+
+
+class PoolTable(MutableMapping[str, "PoolView"]):
+    """Pools in parallel arrays indexed by pool row. It's mapping of pool
+    address to `PoolView`, so it can be used everywhere `Pools` is used.
+
+    Note:
+        Rows of removed pools are kept until `compact`, so their views can
+        still be read same as removed pool dictionaries.
+
+    Args:
+        pools (Pools | None, optional): Pools datastructure. Defaults to None.
+
+    Attributes:
+        addresses (list[str]): Row to pool address.
+        rows (dict[str, int]): Pool address to row, in insertion order.
+        tokens (list[str]): Token id to token address.
+        token_ids (dict[str, int]): Token address to token id.
+        fee_types (list[str]): Fee type id to fee type.
+        fee_type_ids (dict[str, int]): Fee type to fee type id.
+        token0 (np.ndarray): Token id of token0 of row (`int32`).
+        token1 (np.ndarray): Token id of token1 of row (`int32`).
+        reserves (np.ndarray): Reserve0 low, reserve0 high, reserve1 low and
+            reserve1 high of row (`capacity x 4`, `uint64`).
+        fee_type (np.ndarray): Fee type id of row (`uint16`).
+        fee_numerator (np.ndarray): Fee numerator of row (`uint32`).
+    """
+
+    __slots__ = (
+        "addresses",
+        "rows",
+        "tokens",
+        "token_ids",
+        "fee_types",
+        "fee_type_ids",
+        "token0",
+        "token1",
+        "reserves",
+        "fee_type",
+        "fee_numerator",
+    )
+
+    _COLUMNS = ("token0", "token1", "reserves", "fee_type", "fee_numerator")
+
+    def __init__(self, pools: Pools | None = None) -> None:
+        self.addresses: list[str] = []  # type: ignore
+        self.rows: dict[str, int] = {}  # type: ignore
+        self.tokens: list[str] = []  # type: ignore
+        self.token_ids: dict[str, int] = {}  # type: ignore
+        self.fee_types: list[str] = []  # type: ignore
+        self.fee_type_ids: dict[str, int] = {}  # type: ignore
+
+        capacity = max(len(pools) if pools else 0, 1)
+        self.token0 = np.zeros(capacity, dtype=np.int32)
+        self.token1 = np.zeros(capacity, dtype=np.int32)
+        self.reserves = np.zeros((capacity, 4), dtype=np.uint64)
+        self.fee_type = np.zeros(capacity, dtype=np.uint16)
+        self.fee_numerator = np.zeros(capacity, dtype=np.uint32)
+
+        if pools:
+            self.update(pools)
+
+    def __getstate__(self) -> dict[str, Any]:
+        table = self.copy()
+        return {
+            "addresses": table.addresses,
+            "tokens": table.tokens,
+            "fee_types": table.fee_types,
+        } | {column: getattr(table, column) for column in self._COLUMNS}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+        self.rows = {address: row for row, address in enumerate(self.addresses)}
+        self.token_ids = {token: i for i, token in enumerate(self.tokens)}
+        self.fee_type_ids = {fee_type: i for i, fee_type in enumerate(self.fee_types)}
+
+    def __getitem__(self, address: str) -> "PoolView":
+        return PoolView(self, self.rows[address])
+
+    def __setitem__(self, address: str, pool: Pool) -> None:
+        try:
+            row = self.rows[address]
+        except KeyError:
+            row = len(self.addresses)
+            if row == len(self.token0):
+                self._grow(row * 2)
+
+            self.addresses.append(address)
+            self.rows[address] = row
+
+        # first two keys are tokens
+        (token0, reserve0), (token1, reserve1) = [
+            item for item, _ in zip(pool.items(), range(2))
+        ]
+        self.token0[row] = self._token_id(token0)
+        self.token1[row] = self._token_id(token1)
+        self._set_reserve(row, 0, reserve0)
+        self._set_reserve(row, 2, reserve1)
+        self.fee_type[row] = self._fee_type_id(pool["fee_type"])
+        self.fee_numerator[row] = int(pool["fee_numerator"])
+
+    def __delitem__(self, address: str) -> None:
+        del self.rows[address]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, address: object) -> bool:
+        return address in self.rows
+
+    def __repr__(self) -> str:
+        return f"PoolTable({len(self):,} pools, {len(self.tokens):,} tokens)"
+
+    def copy(self) -> "PoolTable":
+        """Snapshot of pools without rows of removed pools.
+
+        Returns:
+            PoolTable: Copied pools.
+        """
+        table = PoolTable.__new__(PoolTable)
+        table.addresses = list(self.rows)
+        table.rows = {address: row for row, address in enumerate(table.addresses)}
+        table.tokens = list(self.tokens)
+        table.token_ids = dict(self.token_ids)
+        table.fee_types = list(self.fee_types)
+        table.fee_type_ids = dict(self.fee_type_ids)
+
+        rows = np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))
+        for column in self._COLUMNS:
+            setattr(table, column, getattr(self, column)[rows])
+
+        return table
+
+    def compact(self) -> None:
+        """Remove rows of removed pools. Existing views become invalid."""
+        table = self.copy()
+        for name in self.__slots__:
+            setattr(self, name, getattr(table, name))
+
+    def to_pools(self) -> Pools:
+        """Convert to `Pools` datastructure with `int` reserves and fee
+        numerators, which are faster to calculate with than `Decimal`.
+
+        Returns:
+            Pools: Pools datastructure.
+        """
+        rows = np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))
+
+        pools = {}
+        for address, token0, token1, (low0, high0, low1, high1), fee_type, fee in zip(
+            self.rows,
+            self.token0[rows].tolist(),
+            self.token1[rows].tolist(),
+            self.reserves[rows].tolist(),
+            self.fee_type[rows].tolist(),
+            self.fee_numerator[rows].tolist(),
+        ):
+            pools[address] = {
+                self.tokens[token0]: low0 | high0 << 64,
+                self.tokens[token1]: low1 | high1 << 64,
+                "fee_type": self.fee_types[fee_type],
+                "fee_numerator": fee,
+            }
+
+        return pools
+
+    def _grow(self, capacity: int) -> None:
+        for column in self._COLUMNS:
+            array = getattr(self, column)
+            grown = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, column, grown)
+
+    def _token_id(self, token: str) -> int:
+        try:
+            return self.token_ids[token]
+        except KeyError:
+            self.token_ids[token] = len(self.tokens)
+            self.tokens.append(token)
+            return self.token_ids[token]
+
+    def _fee_type_id(self, fee_type: str) -> int:
+        try:
+            return self.fee_type_ids[fee_type]
+        except KeyError:
+            self.fee_type_ids[fee_type] = len(self.fee_types)
+            self.fee_types.append(fee_type)
+            return self.fee_type_ids[fee_type]
+
+    def _reserve_column(self, row: int, token: str) -> int:
+        """Get first reserves column of ``token`` in ``row``.
+
+        Raises:
+            KeyError: If ``token`` isn't in pool.
+        """
+        token_id = self.token_ids.get(token)
+        if token_id is not None:
+            if token_id == self.token0[row]:
+                return 0
+            if token_id == self.token1[row]:
+                return 2
+
+        raise KeyError(token)
+
+    def _get_reserve(self, row: int, column: int) -> Decimal:
+        low, high = self.reserves[row, column : column + 2].tolist()
+        return Decimal(low | high << 64)
+
+    def _set_reserve(self, row: int, column: int, reserve: Decimal | int) -> None:
+        reserve = int(reserve)
+        self.reserves[row, column] = reserve & MASK_64
+        self.reserves[row, column + 1] = reserve >> 64
+
+
+class PoolView(MutableMapping[str, Any]):
+    """Mapping view of one `PoolTable` row with same keys and order as
+    `Pool`: token0, token1, `fee_type` and `fee_numerator`. Pickled and
+    copied as `Pool` dictionary.
+
+    Args:
+        table (PoolTable): Pools.
+        row (int): Row of pool.
+    """
+
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: PoolTable, row: int) -> None:
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, key: str) -> Decimal | str:
+        table, row = self.table, self.row
+        if key == "fee_numerator":
+            return Decimal(int(table.fee_numerator[row]))
+        if key == "fee_type":
+            return table.fee_types[table.fee_type[row]]
+
+        return table._get_reserve(row, table._reserve_column(row, key))
+
+    def __setitem__(self, key: str, value: Decimal | str) -> None:
+        table, row = self.table, self.row
+        if key == "fee_numerator":
+            table.fee_numerator[row] = int(value)
+        elif key == "fee_type":
+            table.fee_type[row] = table._fee_type_id(str(value))
+        else:
+            table._set_reserve(row, table._reserve_column(row, key), value)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("Pool keys can't be removed")
+
+    def __iter__(self) -> Iterator[str]:
+        table, row = self.table, self.row
+        yield table.tokens[table.token0[row]]
+        yield table.tokens[table.token1[row]]
+        yield "fee_type"
+        yield "fee_numerator"
+
+    def __len__(self) -> int:
+        return 4
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def __reduce__(self) -> tuple:
+        return dict, (list(self.items()),)